@@ -2,18 +2,29 @@
 
 from time import perf_counter
 from utils.log import log
+from utils.calc_cost import count_tokens
+from LLM.llm_ledger import get_ledger
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else value
 
 def llm_track(func):
     """
     LLMManager.call() 또는 기타 LLM 호출 함수에 데코레이터 적용
     호출 시간 측정 + 로그 기록 자동화
+    + LLM 원장(llm_ledger)에 토큰/지연/비용 기록 (버퍼 append만, I/O 없음)
+    - func는 answered dict를 받아 실제 응답한 provuuider/model을 채움 → fallback 후에도 정확한 모델로 기록
+      (실패 시에는 config의 첫 후보로 기록)
     """
     def wrapper(self, prompt: str, tag: str):
         start = perf_counter()
+        result, error = None, None
+        answered: dict = {}
         try:
-            result = func(self, prompt, tag)
+            result = func(self, prompt, tag, answered=answered)
             return result
         except Exception as e:
+            error = e
             log(
                 message=f"[{self.stage}] 호출 실패 [{tag}] → {e}",
                 level="ERROR",
@@ -27,4 +38,17 @@ def llm_track(func):
                 level="INFO",
                 source="llm_manager"
             )
+            get_ledger().record(
+                stage=self.stage,
+                tag=tag,
+                model=answered.get("model") or _first(self.config.get("model", "")),
+                provuuider=answered.get("provuuider") or _first(self.config.get("provuuider", "")),
+                tokens_in=count_tokens(prompt),
+                tokens_out=count_tokens(result or ""),
+                duration_ms=int(elapsed * 1000),
+                run_id=getattr(self, "run_id", None),
+                user_uuid=getattr(self, "user_uuid", None),
+                success=error is None,
+                error_message=str(error) if error else None,
+            )
     return wrapper
@@ -0,0 +1,299 @@
+# LLM/llm_ledger.py
+
+import io
+import csv
+import json
+import uuid
+import atexit
+import sqlite3
+import datetime
+import threading
+from pathlib import Path
+from contextlib import closing
+from statistics import quantiles
+
+from utils.config import get_app_config, thaw
+from utils.log import log
+from utils.calc_cost import calc_cost, cost_per_million, normalize_model
+
+DEFAULT_JSONL_PATH = Path("log/llm_ledger.jsonl")
+DEFAULT_SQLITE_PATH = Path("DB/cache/llm_ledger.db")
+
+LEDGER_COLUMNS = [
+    "created_at", "run_id", "user_uuid", "stage", "tag", "provuuider", "model",
+    "tokens_in", "tokens_out", "duration_ms", "cache_hit", "success",
+    "error_message", "cost_usd",
+]
+
+# llm_request_log COPY 대상 컬럼 (DB/schema/02_llm/02_request_log.sql)
+PG_COLUMNS = [
+    "created_at", "id", "request_correlation_uuid", "tag", "stage", "provuuider", "model",
+    "params", "tokens", "cost_per_million_tokens", "cost_usd",
+    "success", "error_message", "duration_ms",
+]
+
+def _load_ledger_conf() -> dict:
+    return thaw(get_app_config().section("LLM ledger"))
+
+def _as_uuid(value: str | None) -> str:
+    """uuid 형식이 아니면 빈 문자열(NULL) → id 컬럼 COPY 오류 방지"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except (ValueError, TypeError):
+        return ""
+
+def _pg_array(values: list) -> str:
+    return "{" + ",".join(str(v) for v in values) + "}"
+
+def partition_name(created_at: str, table: str = "llm_request_log") -> str:
+    """created_at(ISO) → 월 단위 파티션 테이블명 (예: llm_request_log_y2025m05)"""
+    ts = datetime.datetime.fromisoformat(created_at)
+    return f"{table}_y{ts.year}m{ts.month:02d}"
+
+class LLMLedger:
+    """
+    LLM 호출 원장 (모델, 토큰, 지연, 캐시 적중, 비용)
+    - record(): 메모리 버퍼에 append만 수행 → 호출 경로에서 I/O 없음
+    - batch size 도달 또는 flush interval 경과 시 백그라운드 스레드가 일괄 flush
+    - flush 대상: JSONL + SQLite (+ 선택: PostgreSQL llm_request_log 파티션 COPY)
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Path | None = None,
+        sqlite_path: Path | None = None,
+        pg_dsn: str | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+    ):
+        conf = _load_ledger_conf()
+        self.jsonl_path = Path(jsonl_path or conf.get("jsonl", DEFAULT_JSONL_PATH))
+        self.sqlite_path = Path(sqlite_path or conf.get("sqlite", DEFAULT_SQLITE_PATH))
+        self.pg_dsn = pg_dsn or conf.get("postgres dsn") or None
+        self.batch_size = int(batch_size or conf.get("batch size", 50))
+        self.flush_interval = float(flush_interval or conf.get("flush interval", 5))
+
+        self._buffer: list[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._init_sqlite()
+        self._worker = threading.Thread(target=self._run, name="llm-ledger", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    # 🔹 기록 (hot path)
+    def record(
+        self,
+        stage: str,
+        tag: str,
+        model: str,
+        tokens_in: int,
+        tokens_out: int,
+        duration_ms: int,
+        provuuider: str = "",
+        run_id: str | None = None,
+        user_uuid: str | None = None,
+        cache_hit: bool = False,
+        success: bool = True,
+        error_message: str | None = None,
+        params: dict | None = None,
+    ) -> dict:
+        model = normalize_model(model)
+        rec = {
+            "created_at": datetime.datetime.now().isoformat(),
+            "run_id": run_id,
+            "user_uuid": user_uuid,
+            "stage": stage,
+            "tag": tag,
+            "provuuider": provuuider,
+            "model": model,
+            "tokens_in": int(tokens_in),
+            "tokens_out": int(tokens_out),
+            "duration_ms": int(duration_ms),
+            "cache_hit": bool(cache_hit),
+            "success": bool(success),
+            "error_message": error_message,
+            # 캐시 적중 호출은 API 과금 없음
+            "cost_usd": 0.0 if cache_hit else calc_cost(model, tokens_in, tokens_out),
+            "params": params or {},
+        }
+        with self._lock:
+            self._buffer.append(rec)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+        return rec
+
+    # 🔹 flush
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """버퍼를 비우고 모든 sink에 일괄 기록, 기록 건수 반환"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+
+            for name, sink in (("jsonl", self._write_jsonl), ("sqlite", self._write_sqlite)):
+                try:
+                    sink(batch)
+                except Exception as e:
+                    log(f"[LEDGER] {name} flush 실패 ({len(batch)}건): {e}", level="ERROR", source="llm_ledger")
+
+            if self.pg_dsn:
+                try:
+                    copy_to_postgres(batch, self.pg_dsn)
+                except Exception as e:
+                    log(f"[LEDGER] PostgreSQL COPY 실패 ({len(batch)}건): {e}", level="ERROR", source="llm_ledger")
+            return len(batch)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
+
+    def _write_jsonl(self, batch: list[dict]):
+        self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch)
+        with self.jsonl_path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=10)
+
+    def _init_sqlite(self):
+        self.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_ledger (
+                    created_at TEXT, run_id TEXT, user_uuid TEXT, stage TEXT, tag TEXT,
+                    provuuider TEXT, model TEXT, tokens_in INTEGER, tokens_out INTEGER,
+                    duration_ms INTEGER, cache_hit INTEGER, success INTEGER,
+                    error_message TEXT, cost_usd REAL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS uuidx_llm_ledger_run ON llm_ledger(run_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS uuidx_llm_ledger_user ON llm_ledger(user_uuid)")
+
+    def _write_sqlite(self, batch: list[dict]):
+        placeholders = ", ".join("?" for _ in LEDGER_COLUMNS)
+        rows = [tuple(r[c] for c in LEDGER_COLUMNS) for r in batch]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT INTO llm_ledger ({', '.join(LEDGER_COLUMNS)}) VALUES ({placeholders})", rows
+            )
+
+    # 🔹 집계 API
+    def summary(self, run_id: str | None = None, user_uuid: str | None = None, group_by: str | None = None) -> dict:
+        """
+        비용/지연 집계
+        - run_id / user_uuid 로 필터
+        - group_by: None | "run_id" | "user_uuid" | "model" | "stage"
+        - 반환: {그룹키: {calls, cache_hits, errors, tokens_in, tokens_out, cost_usd, latency_p50/p90/p99}}
+        """
+        if group_by not in (None, "run_id", "user_uuid", "model", "stage"):
+            raise ValueError(f"지원하지 않는 group_by: {group_by}")
+        self.flush()
+
+        where, args = [], []
+        if run_id is not None:
+            where.append("run_id = ?")
+            args.append(run_id)
+        if user_uuid is not None:
+            where.append("user_uuid = ?")
+            args.append(user_uuid)
+        key_col = group_by or "'all'"
+        sql = (
+            f"SELECT {key_col}, duration_ms, tokens_in, tokens_out, cost_usd, cache_hit, success FROM llm_ledger"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+        )
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(sql, args).fetchall()
+
+        groups: dict[str, list[tuple]] = {}
+        for row in rows:
+            groups.setdefault(row[0], []).append(row[1:])
+        return {key: _aggregate(items) for key, items in groups.items()}
+
+def _percentile_table(latencies: list[int]) -> dict[str, float]:
+    if len(latencies) == 1:
+        only = float(latencies[0])
+        return {"latency_p50": only, "latency_p90": only, "latency_p99": only}
+    cuts = quantiles(latencies, n=100, method="inclusive")
+    return {"latency_p50": cuts[49], "latency_p90": cuts[89], "latency_p99": cuts[98]}
+
+def _aggregate(items: list[tuple]) -> dict:
+    # 캐시 적중(재사용) 행은 지연 0 → 분위수에서 제외 (전부 적중이면 그대로)
+    latencies = [i[0] for i in items if not i[4]] or [i[0] for i in items]
+    return {
+        "calls": len(items),
+        "cache_hits": sum(1 for i in items if i[4]),
+        "errors": sum(1 for i in items if not i[5]),
+        "tokens_in": sum(i[1] for i in items),
+        "tokens_out": sum(i[2] for i in items),
+        "cost_usd": round(sum(i[3] for i in items), 8),
+        **_percentile_table(latencies),
+    }
+
+def copy_to_postgres(batch: list[dict], dsn: str, table: str = "llm_request_log"):
+    """
+    llm_request_log 월 파티션으로 bulk COPY (psycopg2 필요)
+    - 레코드를 created_at 월별로 묶어 파티션당 COPY 1회
+    """
+    import psycopg2
+
+    by_partition: dict[str, list[dict]] = {}
+    for rec in batch:
+        by_partition.setdefault(partition_name(rec["created_at"], table), []).append(rec)
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn, conn.cursor() as cur:
+            for part, recs in by_partition.items():
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                for r in recs:
+                    tokens_in, tokens_out = r["tokens_in"], r["tokens_out"]
+                    writer.writerow([
+                        r["created_at"],
+                        _as_uuid(r["user_uuid"]),
+                        _as_uuid(r["run_id"]),
+                        r["tag"],
+                        r["stage"],
+                        r["provuuider"] or "unknown",
+                        r["model"],
+                        json.dumps(r.get("params", {}), ensure_ascii=False),
+                        _pg_array([tokens_in, tokens_out, tokens_in + tokens_out]),
+                        _pg_array(cost_per_million(r["model"])),
+                        r["cost_usd"],
+                        r["success"],
+                        r["error_message"] or "",
+                        r["duration_ms"],
+                    ])
+                buf.seek(0)
+                cur.copy_expert(
+                    f"COPY {part} ({', '.join(PG_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '')",
+                    buf,
+                )
+    finally:
+        conn.close()
+
+_default_ledger: LLMLedger | None = None
+_default_lock = threading.Lock()
+
+def get_ledger() -> LLMLedger:
+    """프로세스 공용 원장 (최초 호출 시 생성)"""
+    global _default_ledger
+    with _default_lock:
+        if _default_ledger is None:
+            _default_ledger = LLMLedger()
+        return _default_ledger
@@ -1,12 +1,13 @@
 # llm_manager.py
 
-from pathlib import Path
-import json
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from LLM.llm_router import call_llm
 from LLM.llm_decorator import llm_track
+from LLM.llm_ledger import get_ledger
+from utils.calc_cost import count_tokens
+from utils.config import get_app_config
 from utils.log import log
 from utils.path import get_timestamp
 def choose_llm(user_uuid, requested_model):
@@ -16,10 +17,11 @@ def choose_llm(user_uuid, requested_model):
         return call_llm_with_openrouter(model="gpt-4o-mini")
 
 class LLMManager:
-    def __init__(self, stage: str, df_for_call: pd.DataFrame):
+    def __init__(self, stage: str, df_for_call: pd.DataFrame, run_id: str | None = None, user_uuid: str | None = None):
         """
         stage: 'describe' or 'mk_msg'
-        df_for_call: temp/{stage}.pkl에서 로드한 DataFrame
+        df_for_call: 산출물 저장소(utils.artifacts)의 {stage} 단계 DataFrame
+        run_id / user_uuid: LLM 원장 집계 키 (run_id 미지정 시 timestamp 사용)
         """
         self.stage = stage
         self.df_for_call = df_for_call
@@ -27,20 +29,43 @@ class LLMManager:
         self.model = self.config["model"][0]
         self.provuuider = self.config["provuuider"][0]
         self.timestamp = get_timestamp()
-        self.max_workers = self.config.get("parallel calls", 3)  # 기본 3개
+        self.run_id = run_id or self.timestamp
+        self.user_uuid = user_uuid
+        self.max_workers = get_app_config().parallel_calls  # conf.json 최상위 "parallel calls"
+
+    @classmethod
+    def from_artifacts(cls, stage: str, run_id: str | None = None, user_uuid: str | None = None) -> "LLMManager":
+        """temp/runs/{run_id}/{stage}.arrow 산출물로 생성 (run_id 미지정 시 마지막 실행)"""
+        from utils.artifacts import get_store
+
+        store = get_store(run_id)
+        return cls(stage, store.get_df(stage), run_id=store.run_id, user_uuid=user_uuid)
 
     def _get_config(self) -> dict:
-        config_path = Path("config/conf.json")
-        with config_path.open(encoding="utf-8") as f:
-            conf = json.load(f)
-        return conf[self.stage]
+        """utils.config 캐시 (conf.json 재파싱 없음), provuuider/model은 fallback 목록으로 정규화됨"""
+        return get_app_config().stage(self.stage).as_dict()
 
     def call(self, prompt: str, tag: str) -> str:
         return self._call_model(prompt, tag)
 
     @llm_track
-    def _call_model(self, prompt: str, tag: str) -> str:
-        return call_llm(prompt, self.config)
+    def _call_model(self, prompt: str, tag: str, answered: dict | None = None) -> str:
+        return call_llm(prompt, self.config, answered)
+
+    def record_reuse(self, prompt: str, tag: str, answer: str):
+        """프롬프트 해시가 같은 이전 결과를 재사용 (LLM 호출 없음) → 원장에 cache_hit=True, 비용 0으로 기록"""
+        get_ledger().record(
+            stage=self.stage,
+            tag=tag,
+            model=self.model,
+            provuuider=self.provuuider,
+            tokens_in=count_tokens(prompt),
+            tokens_out=count_tokens(answer),
+            duration_ms=0,
+            run_id=self.run_id,
+            user_uuid=self.user_uuid,
+            cache_hit=True,
+        )
 
     def call_all(self, prompts: list[str], tags: list[str]) -> list[str]:
         """
@@ -3,7 +3,11 @@
 import importlib
 from utils.log import log  # log.py 통합 사용
 
-def call_llm(prompt: str, llm_cfg: dict) -> str:
+def call_llm(prompt: str, llm_cfg: dict, answered: dict | None = None) -> str:
+    """
+    provuuider/model 목록 순서대로 호출, 실패하면 다음 후보로 fallback
+    - answered: 넘기면 실제로 응답한 {"provuuider", "model"}을 채움 (원장 기록용)
+    """
     provuuiders = llm_cfg["provuuider"]
     models = llm_cfg["model"]
     llm_param = {
@@ -23,7 +27,10 @@ def call_llm(prompt: str, llm_cfg: dict) -> str:
                 raise AttributeError(f"'call' 함수 없음 in llm.{model}")
 
             llm_param["model"] = f"accounts/fireworks/models/{model}"  # Fireworks 경로용 (호환성)
-            return module.call(prompt, llm_param)
+            result = module.call(prompt, llm_param)
+            if answered is not None:
+                answered.update(provuuider=provuuider, model=model)
+            return result
 
         except Exception as e:
             log(
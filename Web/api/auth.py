@@ -1,30 +1,42 @@
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
 from fastapi.responses import RedirectResponse, HTMLResponse
-from Web.db import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from Web.db import get_async_db
+from Web.services.security import get_hasher
+from Web.services.session_cache import get_session_cache, token_hash
+from Web.exceptions.auth_exceptions import HasherBusyError
 from id import id4
-import bcrypt
 from models import UserInfo, UserSecret, UserSession
+from sqlalchemy import update
+from datetime import datetime, timedelta
 
 router = APIRouter()
 
+def busy_response() -> HTTPException:
+    # 해시 풀 포화 → 재시도 유도 (다른 라우트는 영향 없음)
+    return HTTPException(429, "요청이 많아 잠시 후 다시 시도해주세요", headers={"Retry-After": "1"})
+
 @router.get("/signup", response_class=HTMLResponse)
 def signup_page(request: Request):
     return templates.TemplateResponse("signup.html", {"request": request})
 
 @router.post("/signup")
-def signup(email: str = Form(...), password: str = Form(...), username: str = Form(...), db: Session = Depends(get_db)):
+async def signup(email: str = Form(...), password: str = Form(...), username: str = Form(...), db: AsyncSession = Depends(get_async_db)):
     id = id4()
-    if db.query(UserInfo).filter(UserInfo.email == email).first():
+    if (await db.execute(select(UserInfo.id).where(UserInfo.email == email).limit(1))).first():
         raise HTTPException(400, "이미 존재하는 이메일입니다")
 
-    hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    # bcrypt는 CPU 작업 → 전용 프로세스 풀에서 실행
+    try:
+        hashed_pw = await get_hasher().hash(password)
+    except HasherBusyError:
+        raise busy_response()
     user = UserInfo(id=id, email=email, username=username)
     secret = UserSecret(id=id, password_hash=hashed_pw)
 
-    db.add(user)
-    db.add(secret)
-    db.commit()
+    db.add_all([user, secret])
+    await db.commit()
 
     return RedirectResponse(url="/login", status_code=302)
 
@@ -33,23 +45,49 @@ def login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 @router.post("/login")
-def login(email: str = Form(...), password: str = Form(...), request: Request = None, db: Session = Depends(get_db)):
-    user = db.query(UserInfo).filter(UserInfo.email == email).first()
+async def login(email: str = Form(...), password: str = Form(...), request: Request = None, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(UserInfo).where(UserInfo.email == email).limit(1))).scalar_one_or_none()
     if not user:
         raise HTTPException(401, "계정을 찾을 수 없습니다")
 
-    secret = db.query(UserSecret).filter(UserSecret.id == user.id).first()
-    if not bcrypt.checkpw(password.encode(), secret.password_hash.encode()):
+    secret = (await db.execute(select(UserSecret).where(UserSecret.id == user.id).limit(1))).scalar_one_or_none()
+    if not secret:
+        raise HTTPException(401, "비밀번호가 일치하지 않습니다")
+    try:
+        ok, new_hash = await get_hasher().verify_and_update(password, secret.password_hash)
+    except HasherBusyError:
+        raise busy_response()
+    if not ok:
         raise HTTPException(401, "비밀번호가 일치하지 않습니다")
+    if new_hash:
+        secret.password_hash = new_hash  # cost 변경 → 재해시 저장 (아래 commit에 포함)
 
+    # 토큰 원본은 쿠키로만 전달, DB에는 해시(access_token_ref)만 저장
+    access_token = id4().hex
     session = UserSession(
         user_uuid=user.uuid,
         session_uuid=id4(),
-        access_token=id4().hex,
-        refresh_token=id4().hex
+        access_token_ref=token_hash(access_token),
+        refresh_token_ref=token_hash(id4().hex),
+        expires_at=datetime.utcnow() + timedelta(hours=1)
     )
     db.add(session)
-    db.commit()
+    await db.commit()
     resp = RedirectResponse(url="/dashboard", status_code=302)
-    resp.set_cookie("access_token", session.access_token)
+    resp.set_cookie("access_token", access_token, httponly=True)
+    return resp
+
+@router.post("/logout")
+async def logout(request: Request, db: AsyncSession = Depends(get_async_db)):
+    token = request.cookies.get("access_token")
+    if token:
+        await db.execute(
+            update(UserSession)
+            .where(UserSession.access_token_ref == token_hash(token))
+            .values(expires_at=datetime.utcnow())
+        )
+        await db.commit()
+        await get_session_cache().invalidate(token)  # 캐시에 남은 세션 즉시 무효화
+    resp = RedirectResponse(url="/login", status_code=302)
+    resp.delete_cookie("access_token")
     return resp
@@ -1,24 +1,28 @@
-from fastapi import APIRouter, Request, Depends, Form
-from Web.db import get_db
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request, Depends, Form, HTTPException
+from Web.db import get_async_db
+from Web.services.session_cache import require_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import CommitMessageInfo, CommitReviewLog, UserInfo
 from fastapi.responses import HTMLResponse, RedirectResponse
 
 router = APIRouter()
 
 @router.get("/dashboard", response_class=HTMLResponse)
-def dashboard(request: Request, db: Session = Depends(get_db)):
-    commits = db.query(CommitMessageInfo).filter(CommitMessageInfo.status == "pending").all()
+async def dashboard(request: Request, db: AsyncSession = Depends(get_async_db), session: dict = Depends(require_session)):
+    commits = (await db.execute(select(CommitMessageInfo).where(CommitMessageInfo.status == "pending"))).scalars().all()
     return templates.TemplateResponse("index.html", {"request": request, "commits": commits})
 
 @router.get("/review/{commit_uuid}", response_class=HTMLResponse)
-def review_page(commit_uuid: int, request: Request, db: Session = Depends(get_db)):
-    commit = db.query(CommitMessageInfo).get(commit_uuid)
+async def review_page(commit_uuid: int, request: Request, db: AsyncSession = Depends(get_async_db), session: dict = Depends(require_session)):
+    commit = await db.get(CommitMessageInfo, commit_uuid)
     return templates.TemplateResponse("review_commit.html", {"request": request, "commit": commit})
 
 @router.post("/review/{commit_uuid}/submit")
-def finalize_commit(commit_uuid: int, final_msg: str = Form(...), request: Request = None, db: Session = Depends(get_db)):
-    commit = db.query(CommitMessageInfo).get(commit_uuid)
+async def finalize_commit(commit_uuid: int, final_msg: str = Form(...), request: Request = None, db: AsyncSession = Depends(get_async_db), session: dict = Depends(require_session)):
+    commit = await db.get(CommitMessageInfo, commit_uuid, with_for_update=True)
+    if commit is None:
+        raise HTTPException(404, "커밋을 찾을 수 없습니다")
     commit.commit_msg = final_msg
     commit.status = "committed"
     commit.editable = False
@@ -31,5 +35,5 @@ def finalize_commit(commit_uuid: int, final_msg: str = Form(...), request: Reque
     )
 
     db.add(log)
-    db.commit()
+    await db.commit()
     return RedirectResponse(url="/dashboard", status_code=302)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Form, Depends
-from sqlalchemy.orm import Session
-from Web.db import get_db
+from fastapi import APIRouter, Form, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from Web.db import get_async_db
 from models import UserPlan, UserPlanHistory
 from id import id4
 from datetime import datetime, timedelta
@@ -8,8 +9,10 @@ from datetime import datetime, timedelta
 router = APIRouter()
 
 @router.post("/upgrade_plan")
-def upgrade_plan(id: str = Form(...), plan_key: str = Form(...), db: Session = Depends(get_db)):
-    plan = db.query(UserPlan).filter(UserPlan.id == id).first()
+async def upgrade_plan(id: str = Form(...), plan_key: str = Form(...), db: AsyncSession = Depends(get_async_db)):
+    plan = (await db.execute(select(UserPlan).where(UserPlan.id == id).with_for_update())).scalar_one_or_none()
+    if plan is None:
+        raise HTTPException(404, "요금제 정보를 찾을 수 없습니다")
     old_key = plan.plan_key
     plan.plan_key = plan_key
     plan.updated_at = datetime.utcnow()
@@ -24,5 +27,5 @@ def upgrade_plan(id: str = Form(...), plan_key: str = Form(...), db: Session = D
     )
 
     db.add(hist)
-    db.commit()
+    await db.commit()
     return {"result": "success"}
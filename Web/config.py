@@ -1 +1,21 @@
+import os
+
 PASSWORD_HASH_ROUNDS = 12  # bcrypt cost factor (높을수록 안전하지만 느려짐)
+
+# 🔹 비동기 DB 커넥션 풀 (Web/db.py async_engine)
+DB_POOL_SIZE = int(os.getenv("COMFORT_DB_POOL_SIZE", "20"))             # 상시 유지 커넥션 수
+DB_MAX_OVERFLOW = int(os.getenv("COMFORT_DB_MAX_OVERFLOW", "30"))       # 순간 폭주 시 추가 허용 커넥션 수
+DB_POOL_TIMEOUT = float(os.getenv("COMFORT_DB_POOL_TIMEOUT", "10"))     # 커넥션 대기 한도 (초)
+DB_POOL_RECYCLE = int(os.getenv("COMFORT_DB_POOL_RECYCLE", "1800"))     # 커넥션 재생성 주기 (초)
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("COMFORT_DB_STATEMENT_CACHE_SIZE", "500"))  # pgbouncer transaction 모드면 0
+
+# 🔹 비밀번호 해시 프로세스 풀 (Web/services/security.py)
+PASSWORD_POOL_WORKERS = int(os.getenv("COMFORT_PASSWORD_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("COMFORT_PASSWORD_MAX_PENDING", "64"))  # 초과 시 429
+
+# 🔹 세션 검증 캐시 (Web/services/session_cache.py)
+SESSION_CACHE_BACKEND = os.getenv("COMFORT_SESSION_CACHE", "memory")          # memory | redis (멀티 레플리카)
+SESSION_CACHE_REDIS_URL = os.getenv("COMFORT_REDIS_URL", "redis://localhost:6379/0")
+SESSION_CACHE_TTL = float(os.getenv("COMFORT_SESSION_CACHE_TTL", "60"))       # 초, 세션 만료 시각을 넘지 않음
+SESSION_CACHE_MAX_ENTRIES = int(os.getenv("COMFORT_SESSION_CACHE_MAX", "50000"))
+SESSION_LAST_SEEN_FLUSH_INTERVAL = float(os.getenv("COMFORT_LAST_SEEN_FLUSH", "30"))  # last_seen_at 일괄 기록 주기 (초)
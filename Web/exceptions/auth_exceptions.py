@@ -4,3 +4,4 @@ class DuplicateEmailError(Exception): pass
 class DuplicateUsernameError(Exception): pass
 class InvaluuidPasswordError(Exception): pass
 class UserNotFoundError(Exception): pass
+class HasherBusyError(Exception): pass  # 비밀번호 해시 풀 포화 → 429
@@ -3,6 +3,9 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.muuiddleware.cors import CORSMuuiddleware
 
 from Web.api import auth, commit, user
+from Web.db import dispose_async_engine
+from Web.services.security import get_hasher
+from Web.services.session_cache import get_session_cache
 
 app = FastAPI(title="Comfort Commit Web Server")
 
@@ -22,3 +25,25 @@ app.add_muuiddleware(
 app.include_router(auth.router)
 app.include_router(commit.router)
 app.include_router(user.router)
+
+# 시작 시 last_seen_at 일괄 기록 루프 시작
+@app.on_event("startup")
+async def startup():
+    get_session_cache().start()
+
+# 종료 시 남은 last_seen_at 기록 + 비동기 커넥션 풀 정리
+@app.on_event("shutdown")
+async def shutdown():
+    await get_session_cache().stop()
+    await dispose_async_engine()
+    get_hasher().shutdown()
+
+# 비밀번호 해시 풀 상태 (queue depth / 거절 수)
+@app.get("/metrics/password_hasher")
+def password_hasher_metrics():
+    return get_hasher().metrics()
+
+# 세션 검증 캐시 상태 (적중/미적중, 대기 중인 last_seen_at 수)
+@app.get("/metrics/session_cache")
+def session_cache_metrics():
+    return get_session_cache().metrics()
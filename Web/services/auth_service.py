@@ -4,7 +4,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from id import id4
 from datetime import datetime, timedelta
-import bcrypt
 
 from webs.models.auth_model import UserInfo, UserSecret, UserSession
 from webs.models.activity_model import UserActionLog
@@ -15,15 +14,16 @@ from webs.exceptions.auth_exceptions import (
     InvaluuidPasswordError,
     UserNotFoundError,
 )
-from webs.config import PASSWORD_HASH_ROUNDS  # 👈 config에서 라운드 수 관리
+from webs.services.security import get_hasher, needs_rehash  # 👈 해시 cost/풀 크기는 config에서 관리
+from webs.services.session_cache import get_session_cache, token_hash  # 👈 토큰은 해시(ref)로만 저장/조회
 
 # ✅ 회원가입 처리
 def create_user(data: SignupRequest, db: Session, user_agent: str = "", ip_address: str = "") -> UserInfo:
     user_id = id4()
     now = datetime.utcnow()
 
-    # bcrypt 해시 생성 (config 기준 rounds 사용)
-    hashed_pw = bcrypt.hashpw(data.password.encode("utf-8"), bcrypt.gensalt(PASSWORD_HASH_ROUNDS)).decode("utf-8")
+    # bcrypt 해시 생성 (config 기준 rounds, 전용 프로세스 풀에서 실행)
+    hashed_pw = get_hasher().hash_sync(data.password)
 
     user = UserInfo(
         id=user_id,
@@ -74,25 +74,31 @@ def authenticate_user(data: LoginRequest, db: Session, user_agent: str = "", ip_
     if not user:
         raise UserNotFoundError("존재하지 않는 이메일입니다.")
 
+    hasher = get_hasher()
     secret = db.query(UserSecret).filter(UserSecret.id == user.id).first()
-    if not secret or not bcrypt.checkpw(data.password.encode(), secret.password_hash.encode()):
+    if not secret or not hasher.verify_sync(data.password, secret.password_hash):
         raise InvaluuidPasswordError("비밀번호가 일치하지 않습니다.")
 
-    # ✅ 이전 세션 만료 처리 (optional)
-    db.query(UserSession).filter(
+    # ✅ cost 설정이 바뀌었으면 로그인 성공 시점에 재해시
+    if needs_rehash(secret.password_hash, hasher.rounds):
+        secret.password_hash = hasher.hash_sync(data.password)
+
+    # ✅ 이전 세션 만료 처리 (optional) → 커밋 후 세션 캐시에서도 제거
+    active = db.query(UserSession).filter(
         UserSession.user_uuid == user.uuid,
         UserSession.expires_at > now
-    ).update({UserSession.expires_at: now})
+    )
+    expired_refs = [ref for (ref,) in active.with_entities(UserSession.access_token_ref).all() if ref]
+    active.update({UserSession.expires_at: now}, synchronize_session=False)
 
-    # 새로운 세션 발급
+    # 새로운 세션 발급 (토큰 원본은 반환값으로만 전달, DB에는 해시만 저장 → /login과 동일)
     access_token = id4().hex
-    refresh_token = id4().hex
 
     session = UserSession(
         user_uuid=user.uuid,
         session_uuid=id4(),
-        access_token=access_token,
-        refresh_token=refresh_token,
+        access_token_ref=token_hash(access_token),
+        refresh_token_ref=token_hash(id4().hex),
         expires_at=now + timedelta(hours=1),
         last_seen=now,
         ip_address=ip_address,
@@ -112,4 +118,6 @@ def authenticate_user(data: LoginRequest, db: Session, user_agent: str = "", ip_
     db.add(log)
 
     db.commit()
+    # 캐시에 남은 이전 세션은 TTL 동안 계속 통과하므로 DB 커밋 직후 무효화
+    get_session_cache().invalidate_refs_sync(expired_refs)
     return access_token
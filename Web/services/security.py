@@ -0,0 +1,189 @@
+# 📁 Web/services/security.py
+
+import os
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+from Web.config import PASSWORD_HASH_ROUNDS, PASSWORD_POOL_WORKERS, PASSWORD_POOL_MAX_PENDING
+from Web.exceptions.auth_exceptions import HasherBusyError
+
+# 🔹 워커 프로세스에서 실행되는 함수 (pickle 가능해야 하므로 모듈 최상위)
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+def _verify(password: bytes, hashed: bytes) -> bool:
+    try:
+        return bcrypt.checkpw(password, hashed)
+    except ValueError:  # 형식이 잘못된 해시
+        return False
+
+def hash_rounds(hashed: str) -> int | None:
+    """$2b$12$... → 12"""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed: str, rounds: int = PASSWORD_HASH_ROUNDS) -> bool:
+    """저장된 해시의 cost가 현재 설정과 다르면 True (로그인 성공 시 재해시 대상)"""
+    return hash_rounds(hashed) != rounds
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증 전용 프로세스 풀
+    - 요청 경로(이벤트 루프/threadpool)에서 CPU를 쓰지 않음 → 로그인 폭주가 다른 라우트를 막지 않음
+    - 대기+실행 중 작업 수(queue depth)가 max_pending 이상이면 HasherBusyError → 라우터에서 429
+    - 프로세스 풀은 첫 사용 시 생성 (import만으로 프로세스를 띄우지 않음)
+    """
+
+    def __init__(self, workers: int = PASSWORD_POOL_WORKERS, max_pending: int = PASSWORD_POOL_MAX_PENDING,
+                 rounds: int = PASSWORD_HASH_ROUNDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.stats = {"hashed": 0, "verified": 0, "rejected": 0, "rehashed": 0, "peak_depth": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def metrics(self) -> dict:
+        return {**self.stats, "queue_depth": self._pending, "max_pending": self.max_pending,
+                "workers": self.workers, "rounds": self.rounds}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise HasherBusyError("비밀번호 처리 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+            self._pending += 1
+            self.stats["peak_depth"] = max(self.stats["peak_depth"], self._pending)
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn, *args):
+        self._acquire()
+        try:
+            future = self._executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    # 🔹 async (FastAPI 라우터)
+    async def hash(self, password: str) -> str:
+        hashed = await asyncio.wrap_future(self._submit(_hash, password.encode("utf-8"), self.rounds))
+        self.stats["hashed"] += 1
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        ok = await asyncio.wrap_future(self._submit(_verify, password.encode("utf-8"), hashed.encode("utf-8")))
+        self.stats["verified"] += 1
+        return ok
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """검증 성공 + cost 변경 시 새 해시 반환 (호출 측에서 저장)"""
+        if not await self.verify(password, hashed):
+            return False, None
+        if not needs_rehash(hashed, self.rounds):
+            return True, None
+        try:
+            new_hash = await self.hash(password)
+        except HasherBusyError:
+            return True, None  # 재해시는 다음 로그인으로 미룸
+        self.stats["rehashed"] += 1
+        return True, new_hash
+
+    # 🔹 sync (Session 기반 서비스 함수)
+    def hash_sync(self, password: str) -> str:
+        hashed = self._submit(_hash, password.encode("utf-8"), self.rounds).result()
+        self.stats["hashed"] += 1
+        return hashed.decode("utf-8")
+
+    def verify_sync(self, password: str, hashed: str) -> bool:
+        ok = self._submit(_verify, password.encode("utf-8"), hashed.encode("utf-8")).result()
+        self.stats["verified"] += 1
+        return ok
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+_hasher: PasswordHasher | None = None
+_hasher_lock = threading.Lock()
+
+def get_hasher() -> PasswordHasher:
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+        return _hasher
+
+# 🔹 벤치마크: 코어당 초당 로그인(검증) 수
+async def _bench(hasher: PasswordHasher, hashed: str, n: int, concurrency: int) -> dict:
+    sem = asyncio.Semaphore(concurrency)
+    busy = 0
+
+    async def one():
+        nonlocal busy
+        async with sem:
+            try:
+                await hasher.verify("correct horse battery staple", hashed)
+            except HasherBusyError:
+                busy += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return {"elapsed_s": time.perf_counter() - started, "rejected": busy}
+
+def benchmark(n: int = 64, workers: int | None = None, rounds: int = PASSWORD_HASH_ROUNDS, concurrency: int | None = None) -> dict:
+    workers = workers or os.cpu_count() or 1
+    hasher = PasswordHasher(workers=workers, max_pending=n, rounds=rounds)
+    try:
+        hashed = hasher.hash_sync("correct horse battery staple")  # 워커 기동 + 샘플 해시
+        result = asyncio.run(_bench(hasher, hashed, n, concurrency or workers * 2))
+    finally:
+        hasher.shutdown()
+    per_sec = (n - result["rejected"]) / result["elapsed_s"] if result["elapsed_s"] > 0 else 0.0
+    return {
+        "rounds": rounds,
+        "workers": workers,
+        "logins": n,
+        "rejected": result["rejected"],
+        "elapsed_s": round(result["elapsed_s"], 3),
+        "logins_per_sec": round(per_sec, 2),
+        "logins_per_sec_per_core": round(per_sec / workers, 2),
+        "ms_per_login_per_core": round(1000 * workers / per_sec, 1) if per_sec else None,
+    }
+
+if __name__ == "__main__":
+    # 예: python -m Web.services.security --rounds 10 12 13 --n 64
+    parser = argparse.ArgumentParser(description="bcrypt 프로세스 풀 로그인 처리량 측정")
+    parser.add_argument("--n", type=int, default=64, help="측정할 로그인 수")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[PASSWORD_HASH_ROUNDS])
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'workers':>7} {'logins/s':>10} {'/core':>8} {'ms/login/core':>14}")
+    for r in args.rounds:
+        b = benchmark(args.n, args.workers, r)
+        print(f"{b['rounds']:>6} {b['workers']:>7} {b['logins_per_sec']:>10} {b['logins_per_sec_per_core']:>8} {b['ms_per_login_per_core']:>14}")
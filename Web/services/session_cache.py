@@ -0,0 +1,226 @@
+# 📁 Web/services/session_cache.py
+
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import text
+
+from Web.db import AsyncSessionLocal
+from Web.config import (
+    SESSION_CACHE_BACKEND,
+    SESSION_CACHE_REDIS_URL,
+    SESSION_CACHE_TTL,
+    SESSION_CACHE_MAX_ENTRIES,
+    SESSION_LAST_SEEN_FLUSH_INTERVAL,
+)
+
+def token_hash(token: str) -> str:
+    """access_token → user_session.access_token_ref (원본 토큰은 DB/캐시에 저장하지 않음)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+# 🔹 캐시 백엔드: get/set/delete만 구현 (값은 JSON 직렬화 가능한 dict)
+class MemoryBackend:
+    """프로세스 내 TTL + LRU (max_entries 초과 시 가장 오래 안 쓴 항목부터 제거)"""
+
+    def __init__(self, max_entries: int = SESSION_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            deadline, value = item
+            if deadline <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: dict, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+class RedisBackend:
+    """
+    여러 레플리카가 공유하는 캐시 (Redis 호환 서버)
+    - 로그아웃 무효화가 모든 레플리카에 즉시 반영됨
+    - LRU는 서버 maxmemory-policy(allkeys-lru)에 맡김
+    """
+
+    prefix = "cc:session:"
+
+    def __init__(self, url: str = SESSION_CACHE_REDIS_URL):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> dict | None:
+        raw = await self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: dict, ttl: float):
+        await self._redis.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    async def delete(self, key: str):
+        await self._redis.delete(self.prefix + key)
+
+class SessionCache:
+    """
+    access_token 쿠키 → 세션 검증 캐시
+    - 적중 시 DB 조회 없음, 미적중 시 user_session 1회 조회 후 min(TTL, 남은 만료 시간) 동안 캐시
+    - last_seen_at은 메모리에 모았다가 flush_interval마다 UPDATE 1회 (세션당 최신 시각만)
+    - 로그아웃/세션 만료 처리 시 invalidate()
+    """
+
+    def __init__(self, backend=None, ttl: float = SESSION_CACHE_TTL, flush_interval: float = SESSION_LAST_SEEN_FLUSH_INTERVAL,
+                 session_factory=AsyncSessionLocal):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._last_seen: dict[str, datetime] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None  # start() 시점의 앱 이벤트 루프 (동기 코드 → 무효화 전달용)
+        self.stats = {"hits": 0, "misses": 0, "invalid": 0, "flushed": 0}
+
+    # 🔹 조회
+    async def _load(self, ref: str) -> dict | None:
+        async with self.session_factory() as db:
+            row = (await db.execute(
+                text(
+                    "SELECT session_uuid::text, user_id::text, expires_at FROM user_session "
+                    "WHERE access_token_ref = :ref AND expires_at > now() LIMIT 1"
+                ),
+                {"ref": ref},
+            )).first()
+        if row is None:
+            return None
+        expires_at = row[2] if row[2].tzinfo else row[2].replace(tzinfo=timezone.utc)  # 세션 시각은 UTC 기준 저장
+        return {"session_uuid": row[0], "user_id": row[1], "expires_at": expires_at.timestamp()}
+
+    async def validate(self, token: str) -> dict | None:
+        """유효한 세션이면 {"session_uuid", "user_id", "expires_at"(epoch)}, 아니면 None"""
+        ref = token_hash(token)
+        session = await self.backend.get(ref)
+        if session is None:
+            self.stats["misses"] += 1
+            session = await self._load(ref)
+            if session is None:
+                self.stats["invalid"] += 1
+                return None
+            remaining = session["expires_at"] - time.time()
+            if remaining > 0:
+                await self.backend.set(ref, session, min(self.ttl, remaining))
+        else:
+            self.stats["hits"] += 1
+        if session["expires_at"] <= time.time():
+            await self.backend.delete(ref)
+            return None
+        self._last_seen[session["session_uuid"]] = datetime.utcnow()
+        return session
+
+    async def invalidate(self, token: str):
+        await self.backend.delete(token_hash(token))
+
+    async def invalidate_refs(self, refs: list[str]):
+        """access_token_ref 기준 무효화 (원본 토큰 없이 만료 처리한 세션, 예: 재로그인 시 이전 세션)"""
+        for ref in refs:
+            await self.backend.delete(ref)
+
+    def invalidate_refs_sync(self, refs: list[str], timeout: float = 5.0):
+        """
+        동기 서비스 함수(스레드풀 실행)용 무효화
+        - 앱 루프가 돌고 있으면 그 루프에서 실행 후 대기 (Redis 연결이 루프에 묶여 있음)
+        - 루프 스레드 안에서 호출되면 대기하지 않고 태스크로 예약, 루프가 없으면 즉석 실행
+        """
+        if not refs:
+            return
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            asyncio.run(self.invalidate_refs(refs))
+        elif asyncio._get_running_loop() is loop:
+            loop.create_task(self.invalidate_refs(refs))
+        else:
+            asyncio.run_coroutine_threadsafe(self.invalidate_refs(refs), loop).result(timeout)
+
+    # 🔹 last_seen_at 일괄 기록
+    async def flush_last_seen(self) -> int:
+        if not self._last_seen:
+            return 0
+        pending, self._last_seen = self._last_seen, {}
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    text(
+                        "UPDATE user_session SET last_seen_at = :seen "
+                        "WHERE session_uuid = CAST(:sid AS uuid) AND (last_seen_at IS NULL OR last_seen_at < :seen)"
+                    ),
+                    [{"sid": sid, "seen": seen} for sid, seen in pending.items()],
+                )
+                await db.commit()
+        except Exception:
+            # 실패분은 다음 주기에 재시도 (그 사이 더 최신 값이 있으면 유지)
+            for sid, seen in pending.items():
+                self._last_seen.setdefault(sid, seen)
+            raise
+        self.stats["flushed"] += len(pending)
+        return len(pending)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_last_seen()
+            except Exception as e:
+                print(f"⚠️ last_seen_at 일괄 기록 실패 → 다음 주기에 재시도: {e}")
+
+    def start(self):
+        if self._flush_task is None:
+            self._loop = asyncio.get_running_loop()
+            self._flush_task = self._loop.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush_last_seen()
+
+    def metrics(self) -> dict:
+        return {**self.stats, "pending_last_seen": len(self._last_seen), "backend": type(self.backend).__name__}
+
+_cache: SessionCache | None = None
+_cache_lock = threading.Lock()
+
+def get_session_cache() -> SessionCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            backend = RedisBackend() if SESSION_CACHE_BACKEND == "redis" else MemoryBackend()
+            _cache = SessionCache(backend)
+        return _cache
+
+# FastAPI 종속형 인증 Dependency
+async def require_session(request: Request, cache: SessionCache = Depends(get_session_cache)) -> dict:
+    token = request.cookies.get("access_token")
+    session = await cache.validate(token) if token else None
+    if session is None:
+        raise HTTPException(401, "로그인이 필요합니다")
+    return session
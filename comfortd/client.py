@@ -0,0 +1,112 @@
+# comfortd/client.py
+# comfortd 얇은 클라이언트 (git hook / IDE 종료 hook에서 호출)
+# - 표준 라이브러리 최소 import만 사용 → 인터프리터 포함 시작 시간 100ms 미만 목표
+
+import os
+import sys
+import json
+import time
+import socket
+
+_T0 = time.perf_counter()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOCKET_PATH = os.environ.get("COMFORT_SOCKET", os.path.join("temp", "comfortd.sock"))
+SPAWN_TIMEOUT = 30.0
+
+MARKS = {"started": "▶️", "ran": "✅", "cached": "♻️", "failed": "❌", "skipped": "⏭️", "described": "📝"}
+
+def _socket_path() -> str:
+    return SOCKET_PATH if os.path.isabs(SOCKET_PATH) else os.path.join(ROOT, SOCKET_PATH)
+
+def _connect() -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # AF_UNIX 경로 길이 제한(108바이트) 회피 → 저장소 루트 기준 상대 경로로 연결
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        sock.connect(SOCKET_PATH)
+    finally:
+        os.chdir(cwd)
+    return sock
+
+def _spawn():
+    import subprocess  # 데몬이 없을 때만 필요
+    log_path = os.path.join(ROOT, "temp", "comfortd.log")
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, "ab") as log:
+        subprocess.Popen([sys.executable, os.path.join(ROOT, "comfortd", "server.py")], cwd=ROOT,
+                         stdout=log, stderr=log, stdin=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            return _connect()
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"comfortd 시작 대기 시간 초과 ({log_path} 확인)")
+
+def request(cmd: str, args: list[str] | None = None, spawn: bool = False):
+    """요청 전송 후 이벤트(dict)를 도착하는 대로 yield"""
+    try:
+        sock = _connect()
+    except OSError:
+        if not spawn:
+            raise
+        sock = _spawn()
+    with sock:
+        sock.sendall((json.dumps({"cmd": cmd, "args": args or []}) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                yield json.loads(line)
+
+def _print_event(event: dict):
+    kind = event.get("event")
+    if kind == "stage":
+        sec = event.get("seconds")
+        sec = f" {sec:.3f}s" if isinstance(sec, (int, float)) else ""
+        err = f"  {event['error']}" if event.get("error") else ""
+        print(f"  {MARKS.get(event['status'], '·')} {event['stage']:<16} {event['status']}{sec}{err}", flush=True)
+    elif kind == "file":
+        err = f"  {event['error']}" if event.get("error") else ""
+        print(f"  {MARKS['described']} {event['file']}{err}", flush=True)
+    elif kind == "queued":
+        print("⏳ 다른 실행이 끝나기를 기다리는 중…", flush=True)
+
+def main(argv: list[str]) -> int:
+    spawn = "--spawn" in argv
+    timing = "--timing" in argv
+    argv = [a for a in argv if a not in ("--spawn", "--timing")]
+    cmd, args = (argv[0], argv[1:]) if argv else ("run", [])
+
+    first = None
+    try:
+        for event in request(cmd, args, spawn):
+            if first is None:
+                first = time.perf_counter()
+                if timing:
+                    print(f"⚡ 클라이언트 첫 응답까지 {(first - _T0) * 1000:.1f}ms (import 이후 기준)", flush=True)
+            if event.get("event") == "error":
+                print(f"❌ {event.get('error')}", file=sys.stderr)
+                return 1
+            if event.get("event") != "done":
+                _print_event(event)
+                continue
+            result = event.get("result", {})
+            if cmd == "run":
+                print(result.get("timing", ""))
+                if result.get("message"):
+                    print(f"\n📝 커밋 메시지\n{result['message']}")
+                return 1 if result.get("failed") else 0
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+            return 0
+    except OSError as e:
+        print(f"❌ comfortd에 연결할 수 없음 ({_socket_path()}): {e}\n   python comfortd/server.py 로 시작하거나 --spawn 사용",
+              file=sys.stderr)
+        return 2
+    return 1
+
+if __name__ == "__main__":
+    # 예: python comfortd/client.py run --until mk_msg
+    #     python comfortd/client.py status
+    #     python comfortd/client.py run --stream --spawn   (데몬이 없으면 띄운 뒤 실행)
+    #     python -S comfortd/client.py ping --timing       (-S: site 생략, 약 65ms)
+    sys.exit(main(sys.argv[1:]))
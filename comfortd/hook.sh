@@ -0,0 +1,5 @@
+#!/bin/sh
+# git hook / IDE 종료 hook용 (예: ln -s ../../comfortd/hook.sh .git/hooks/post-commit)
+# -S: site 초기화 생략 → 클라이언트는 표준 라이브러리만 쓰므로 시작 시간만 줄어듦
+ROOT="$(git rev-parse --show-toplevel)" || exit 1
+exec python3 -S "$ROOT/comfortd/client.py" run --stream --spawn "$@"
@@ -0,0 +1,159 @@
+# comfortd/server.py
+
+import os
+import sys
+import json
+import time
+import signal
+import threading
+import socketserver
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+os.chdir(ROOT)  # 설정·캐시 경로가 모두 저장소 루트 기준
+sys.path[:0] = [str(ROOT), str(ROOT / "scoping")]
+
+SOCKET_PATH = Path(os.environ.get("COMFORT_SOCKET", "temp/comfortd.sock"))
+PID_PATH = Path("temp/comfortd.pid")
+IDLE_TIMEOUT = int(os.environ.get("COMFORT_DAEMON_IDLE", "0"))  # 초, 0이면 종료하지 않음
+
+class ComfortDaemon:
+    """
+    상주 프로세스: 무거운 import / 인코더 / 분석기를 유지한 채 실행 요청 처리
+    - 실행은 한 번에 1개 (뒤 요청은 queued 이벤트 후 대기)
+    - 설정은 utils.config가 mtime을 보고 알아서 다시 읽음 (데몬 재시작 불필요)
+    - 파일 목록(repo walker)은 실행마다 다시 나열 (import / 인코더 / 분석기만 실행 간 유지)
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.last_active = time.time()
+        self.runs = 0
+        self.warm_seconds: dict[str, float] = {}
+        self._run_lock = threading.Lock()
+
+    def warm_up(self):
+        """시작 시 1회: import + 토크나이저 + 분석기 + repo walker 캐시"""
+        start = time.perf_counter()
+        import run_all, run_stream  # noqa: F401  pandas / pyarrow / tiktoken / yaml 포함
+        import conv_df, clustering  # noqa: F401
+        from prep.prompt_budget import count_tokens
+        from scoping.repo_walker import get_walker as get_prep_walker
+        from repo_walker import get_walker  # scoping 형제 import 경로 (extract_rel_fx와 같은 모듈)
+        self.warm_seconds["import"] = round(time.perf_counter() - start, 3)
+
+        steps = [
+            ("tokenizer", lambda: count_tokens("warm up")),
+            ("analyzers", conv_df.get_analyzers),
+            ("repo_walker", lambda: (get_walker(Path(".")).files(), get_prep_walker(Path(".")).files())),
+        ]
+        for name, fn in steps:
+            start = time.perf_counter()
+            fn()
+            self.warm_seconds[name] = round(time.perf_counter() - start, 3)
+
+    @staticmethod
+    def _invalidate_walkers():
+        """파일 목록 캐시는 실행 단위로만 유효 (미추적 파일 추가는 무효화 토큰에 잡히지 않음)"""
+        from scoping.repo_walker import invalidate_walkers as invalidate_prep
+        from repo_walker import invalidate_walkers  # scoping 형제 import 경로의 별도 모듈 인스턴스
+        invalidate_prep()
+        invalidate_walkers()
+
+    def status(self) -> dict:
+        from utils.config import config_version
+        return {
+            "pid": os.getpid(),
+            "root": str(ROOT),
+            "uptime": round(time.time() - self.started_at, 1),
+            "runs": self.runs,
+            "busy": self._run_lock.locked(),
+            "warm": self.warm_seconds,
+            "config_version": config_version(),
+        }
+
+    def run(self, argv: list[str], emit) -> dict:
+        import run_all
+
+        args = run_all.build_parser().parse_args(argv)
+        if self._run_lock.locked():
+            emit({"event": "queued"})
+        with self._run_lock:
+            self._invalidate_walkers()
+            self.last_active = time.time()
+            emit({"event": "started", "argv": argv})
+            result = run_all.execute(args, on_event=emit)
+            self.runs += 1
+            self.last_active = time.time()
+        return {"message": result["message"], "seconds": round(result["seconds"], 3), "timing": result["timing"],
+                "request_uuid": result["request_uuid"], "failed": [r["stage"] for r in result["report"] if r["status"] == "failed"]}
+
+class _Handler(socketserver.StreamRequestHandler):
+    """요청 1줄(JSON) → 이벤트 여러 줄(JSON) + 마지막 done/error"""
+
+    def handle(self):
+        daemon: ComfortDaemon = self.server.daemon
+        lock = threading.Lock()
+
+        def emit(event: dict):
+            with lock:
+                self.wfile.write((json.dumps(event, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+            cmd = request.get("cmd", "ping")
+            if cmd == "ping":
+                emit({"event": "done", "ok": True, "result": {"pong": True, "pid": os.getpid()}})
+            elif cmd == "status":
+                emit({"event": "done", "ok": True, "result": daemon.status()})
+            elif cmd == "run":
+                emit({"event": "done", "ok": True, "result": daemon.run(request.get("args", []), emit)})
+            elif cmd == "stop":
+                emit({"event": "done", "ok": True, "result": {"stopping": True}})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                emit({"event": "error", "ok": False, "error": f"알 수 없는 명령: {cmd}"})
+        except SystemExit as e:  # argparse 오류
+            emit({"event": "error", "ok": False, "error": f"잘못된 인자 (exit {e.code})"})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            try:
+                emit({"event": "error", "ok": False, "error": str(e)})
+            except OSError:
+                pass
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def _idle_watch(server: _Server, daemon: ComfortDaemon):
+    while True:
+        time.sleep(30)
+        if not daemon._run_lock.locked() and time.time() - daemon.last_active > IDLE_TIMEOUT:
+            server.shutdown()
+            return
+
+def serve():
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()  # 이전 프로세스가 남긴 소켓
+    daemon = ComfortDaemon()
+    daemon.warm_up()
+    server = _Server(str(SOCKET_PATH), _Handler)
+    server.daemon = daemon
+    PID_PATH.write_text(str(os.getpid()), encoding="utf-8")
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    if IDLE_TIMEOUT:
+        threading.Thread(target=_idle_watch, args=(server, daemon), daemon=True).start()
+    print(f"🟢 comfortd 준비 완료 ({SOCKET_PATH}, warm {daemon.warm_seconds})", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        SOCKET_PATH.unlink(missing_ok=True)
+        PID_PATH.unlink(missing_ok=True)
+
+if __name__ == "__main__":
+    # 예: python comfortd/server.py  (COMFORT_DAEMON_IDLE=1800 → 30분 유휴 시 종료)
+    serve()
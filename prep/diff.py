@@ -0,0 +1,243 @@
+# prep/diff.py
+
+import re
+import json
+import subprocess
+from pathlib import Path
+from typing import Iterator
+
+from snapshot.elements import parse_python_elements, sha256_hex
+from prep.git_objects import get_reader
+
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@(.*)$")
+FUNCTION_TYPES = {"FUNCTION", "METHOD", "CONSTRUCTOR"}
+RAW_DIFF_MAX_CHARS = 8000   # file_diff_fragments.raw_diff_content에 직접 저장할 최대 길이 (프롬프트용 raw는 자르지 않음)
+
+def _new_file_entry() -> dict:
+    return {"path": None, "old_path": None, "change_type": "MODIFIED", "binary": False,
+            "hunks": [], "added": 0, "deleted": 0, "raw": []}
+
+def _strip_prefix(path: str) -> str | None:
+    path = path.strip()
+    if path == "/dev/null":
+        return None
+    return path[2:] if path[:2] in ("a/", "b/") else path
+
+def _finish(entry: dict) -> dict:
+    entry["path"] = entry["path"] or entry["old_path"]
+    entry["raw"] = "".join(entry["raw"])
+    return entry
+
+def iter_diff(base: str = "HEAD", paths: list[str] | None = None, cwd: Path | None = None) -> Iterator[dict]:
+    """
+    git diff -U0 출력을 줄 단위 스트림으로 파싱 → 파일 단위로 yield
+    - 반환: {"path", "old_path", "change_type"(ADDED/MODIFIED/DELETED/RENAMED), "binary",
+             "hunks": [{"old_start", "old_lines", "new_start", "new_lines", "header"}], "added", "deleted", "raw"}
+    - 전체 diff를 메모리에 올리지 않음 (파일 하나씩 처리 후 버림)
+    - raw: 파일 diff 원문 전체 → 프롬프트 예산 초과분은 prompt_budget.pack()이 자름 (저장 시 길이 제한은 fragment_row)
+    """
+    cmd = ["git", "-c", "core.quotePath=false", "diff", "-U0", "--no-color", "--no-ext-diff", "-M", base]
+    if paths:
+        cmd += ["--", *paths]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=cwd,
+                            text=True, encoding="utf-8", errors="replace")
+    entry = None
+    in_hunk = False
+    try:
+        for line in proc.stdout:
+            if line.startswith("diff --git "):
+                if entry:
+                    yield _finish(entry)
+                entry, in_hunk = _new_file_entry(), False
+            elif entry is None:
+                continue
+            elif in_hunk and line[:1] in "+-\\":
+                if line[0] == "+":
+                    entry["added"] += 1
+                elif line[0] == "-":
+                    entry["deleted"] += 1
+            elif line.startswith("@@"):
+                m = HUNK_RE.match(line)
+                if m:
+                    in_hunk = True
+                    entry["hunks"].append({
+                        "old_start": int(m.group(1)), "old_lines": int(m.group(2) or 1),
+                        "new_start": int(m.group(3)), "new_lines": int(m.group(4) or 1),
+                        "header": line.rstrip("\n"),
+                    })
+            elif line.startswith("new file mode"):
+                entry["change_type"] = "ADDED"
+            elif line.startswith("deleted file mode"):
+                entry["change_type"] = "DELETED"
+            elif line.startswith("rename from "):
+                entry["change_type"], entry["old_path"] = "RENAMED", line[12:].rstrip("\n")
+            elif line.startswith("rename to "):
+                entry["path"] = line[10:].rstrip("\n")
+            elif line.startswith("Binary files"):
+                entry["binary"] = True
+            elif line.startswith("--- "):
+                entry["old_path"] = entry["old_path"] or _strip_prefix(line[4:])
+            elif line.startswith("+++ "):
+                entry["path"] = entry["path"] or _strip_prefix(line[4:])
+
+            entry["raw"].append(line)
+        if entry:
+            yield _finish(entry)
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+# 🔹 hunk → 함수 범위 매핑
+def changed_ranges(hunks: list[dict]) -> list[tuple[int, int]]:
+    """
+    새 파일 기준 변경 라인 범위 (1-based, 양끝 포함)
+    - 삭제만 있는 hunk(new_lines=0)는 삭제 위치 앞뒤 라인(new_start, new_start+1)으로 취급
+    """
+    ranges = []
+    for h in hunks:
+        if h["new_lines"] == 0:
+            ranges.append((max(h["new_start"], 1), h["new_start"] + 1))
+        else:
+            ranges.append((h["new_start"], h["new_start"] + h["new_lines"] - 1))
+    return ranges
+
+def function_spans(file: Path, text: str | None = None) -> list[dict] | None:
+    """
+    파일의 함수 범위 [{"name", "qualname", "start_line", "end_line"}]
+    - 파싱 불가 언어 / 문법 오류(편집 중인 파일)는 None → 호출 측에서 파일 전체 함수로 처리
+    """
+    if file.suffix != ".py":
+        return None
+    if text is None:
+        try:
+            text = file.read_text(encoding="utf-8", errors="ignore")
+        except Exception:
+            return None
+    try:
+        elements = parse_python_elements(text, strict=True)
+    except SyntaxError:
+        return None
+    return [e for e in elements if e["element_type"] in FUNCTION_TYPES]
+
+def touched_functions(file: Path, hunks: list[dict], text: str | None = None) -> list[dict] | None:
+    """
+    변경 라인과 겹치는 함수 목록 (중첩 함수면 바깥 함수도 포함)
+    - None: 함수 범위를 알 수 없음 → 호출 측에서 파일 전체 함수로 처리
+    """
+    spans = function_spans(file, text)
+    if spans is None:
+        return None
+    ranges = changed_ranges(hunks)
+    return [
+        s for s in spans
+        if any(start <= s["end_line"] and s["start_line"] <= end for start, end in ranges)
+    ]
+
+def removed_functions(d: dict, old_text: str | None) -> list[str]:
+    """이전 버전 기준 삭제 라인과 겹치는 함수 중 새 버전에 없는 것 (qualname)"""
+    if not old_text or not Path(d["old_path"] or d["path"]).suffix == ".py":
+        return []
+    old_spans = [e for e in parse_python_elements(old_text) if e["element_type"] in FUNCTION_TYPES]
+    ranges = [(h["old_start"], h["old_start"] + h["old_lines"] - 1) for h in d["hunks"] if h["old_lines"]]
+    spans = d.get("spans")
+    if spans is None:
+        spans = function_spans(Path(d["path"]))
+        if spans is None:  # 새 버전을 파싱할 수 없음 → 삭제 여부 판단 불가
+            return []
+    current = {s["qualname"] for s in spans}
+    return [
+        s["qualname"] for s in old_spans
+        if s["qualname"] not in current and any(a <= s["end_line"] and s["start_line"] <= b for a, b in ranges)
+    ]
+
+def attribute_changes(base: str = "HEAD", paths: list[str] | None = None) -> dict[str, dict]:
+    """
+    path → {"change_type", "hunks", "added", "deleted", "raw", "functions": [이름] | None, "spans": [...] | None,
+            "removed": [qualname]}
+    - ADDED 파일은 전체 함수 대상 (functions=None)
+    - DELETED / binary 파일은 함수 없음 (functions=[])
+    - removed: base 시점 내용(cat-file 일괄 조회)에서 사라진 함수
+    """
+    result = {}
+    for d in iter_diff(base, paths):
+        if d["change_type"] == "DELETED" or d["binary"]:
+            spans = []
+        elif d["change_type"] == "ADDED":
+            spans = None
+        else:
+            spans = touched_functions(Path(d["path"]), d["hunks"])
+        d["spans"] = spans
+        d["functions"] = None if spans is None else list(dict.fromkeys(s["name"] for s in spans))
+        result[d["path"]] = d
+
+    # 이전 버전은 cat-file --batch 1회 파이프라인으로 읽음 (파일마다 git show 안 띄움)
+    targets = {p: d["old_path"] or p for p, d in result.items()
+               if d["change_type"] != "ADDED" and not d["binary"] and (d["old_path"] or p).endswith(".py")}
+    old_texts = get_reader().show_many(list(targets.values()), base) if targets else {}
+    for p, d in result.items():
+        d["removed"] = removed_functions(d, old_texts.get(targets.get(p, ""))) if p in targets else []
+    return result
+
+# 🔹 file_diff_fragments 적재
+def fragment_row(d: dict, snapshot_file_uuid: str) -> tuple:
+    """
+    file_diff_fragments 1행
+    - changed_lines_summary: [{"start_line", "end_line", "functions"}] JSON
+    - raw_diff_content: RAW_DIFF_MAX_CHARS 이하일 때만, 체크섬은 항상 전체 diff 기준으로 기록
+    """
+    spans = d.get("spans") or []
+    summary = []
+    for start, end in changed_ranges(d["hunks"]):
+        names = [s["qualname"] for s in spans if start <= s["end_line"] and s["start_line"] <= end]
+        summary.append({"start_line": start, "end_line": end, "functions": names})
+    if d.get("removed"):
+        summary.append({"removed_functions": d["removed"]})
+    raw = d["raw"]
+    truncated = len(raw) > RAW_DIFF_MAX_CHARS
+    notes = []
+    if d["binary"]:
+        notes.append("바이너리 파일")
+    if truncated:
+        notes.append("매우 큰 변경 (원본 diff는 체크섬만 보관)")
+    if d.get("spans") == [] and d["hunks"] and not d["binary"] and d["change_type"] != "DELETED":
+        notes.append("함수 밖(모듈 수준) 변경만 있음")
+    return (
+        snapshot_file_uuid, d["change_type"], d["added"], d["deleted"],
+        json.dumps(summary, ensure_ascii=False),
+        None if truncated else raw,
+        sha256_hex(raw),
+        not d["binary"],
+        ", ".join(notes) or None,
+    )
+
+def save_fragments(diffs: dict[str, dict], file_uuids: dict[str, str], dsn: str | None = None) -> int:
+    """
+    attribute_changes 결과 → file_diff_fragments (execute_values 1회)
+    - file_uuids: path → snapshot_file_uuid (스냅샷 적재 결과), 없는 파일은 건너뜀
+    """
+    import psycopg2
+    from psycopg2.extras import execute_values
+    from snapshot.ingest import get_dsn
+
+    rows = [fragment_row(d, file_uuids[p]) for p, d in diffs.items() if p in file_uuids]
+    if not rows:
+        return 0
+    conn = psycopg2.connect(dsn or get_dsn())
+    try:
+        with conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                "INSERT INTO file_diff_fragments (snapshot_file_uuid, change_type, lines_added, lines_deleted, "
+                "changed_lines_summary, raw_diff_content, external_diff_checksum, is_llm_input_canduuidate, "
+                "llm_processing_notes) VALUES %s",
+                rows,
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+if __name__ == "__main__":
+    # 예: python -m prep.diff  → 현재 작업 트리 vs HEAD 변경 함수 요약
+    for path, d in attribute_changes().items():
+        fx = "전체" if d["functions"] is None else (", ".join(d["functions"]) or "(함수 밖 변경)")
+        print(f"{d['change_type']:<8} +{d['added']:<4} -{d['deleted']:<4} {path} → {fx}")
@@ -0,0 +1,177 @@
+# prep/dir_structure.py
+
+import json
+import uuid
+import sqlite3
+import hashlib
+from pathlib import Path
+from contextlib import closing
+
+from scoping.repo_walker import get_walker
+
+CACHE_DB_PATH = Path("DB/cache/context_cache.db")
+MAX_DEPTH = 3            # 이보다 깊은 디렉터리는 "(하위 n개 파일)"로 접음
+MAX_FILES_SHOWN = 8      # 디렉터리당 표시할 최대 파일 수, 나머지는 확장자별 개수로 요약
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dir_summaries (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            signature TEXT NOT NULL,
+            rendered TEXT NOT NULL,
+            PRIMARY KEY (root, path)
+        )""")
+    return conn
+
+# 🔹 파일 목록 → 디렉터리 트리
+def build_tree(files: list[str]) -> dict:
+    """["a/b.py", "c.py"] → {"files": [...], "dirs": {name: 하위 트리}}"""
+    root = {"files": [], "dirs": {}}
+    for f in files:
+        node = root
+        *dirs, name = f.split("/")
+        for d in dirs:
+            node = node["dirs"].setdefault(d, {"files": [], "dirs": {}})
+        node["files"].append(name)
+    return root
+
+def sign(node: dict) -> str:
+    """하위 파일·디렉터리 목록의 Merkle 해시 (node["sig"]에 하위 노드까지 기록)"""
+    h = hashlib.sha256()
+    for name in sorted(node["files"]):
+        h.update(b"f\0" + name.encode() + b"\0")
+    for name in sorted(node["dirs"]):
+        h.update(b"d\0" + name.encode() + b"\0" + sign(node["dirs"][name]).encode())
+    node["sig"] = h.hexdigest()
+    return node["sig"]
+
+def _dir_paths(node: dict, path: str = "") -> set[str]:
+    return {path} | {p for name, child in node["dirs"].items() for p in _dir_paths(child, f"{path}{name}/")}
+
+def _count_files(node: dict) -> int:
+    return len(node["files"]) + sum(_count_files(c) for c in node["dirs"].values())
+
+def _ext_summary(names: list[str]) -> str:
+    counts: dict[str, int] = {}
+    for n in names:
+        ext = Path(n).suffix or n
+        counts[ext] = counts.get(ext, 0) + 1
+    return ", ".join(f"{ext}×{c}" for ext, c in sorted(counts.items(), key=lambda x: -x[1]))
+
+def render(node: dict, path: str, depth: int, cache: dict[str, tuple[str, str]], fresh: dict[str, tuple[str, str]],
+           max_depth: int = MAX_DEPTH, max_files: int = MAX_FILES_SHOWN) -> str:
+    """
+    디렉터리 1개 하위 트리 텍스트
+    - cache[path] 서명이 같으면 저장된 텍스트 재사용 (하위 트리 재구성 생략)
+    - 새로 만든 결과는 fresh에 기록 → 호출 측에서 캐시 갱신
+    """
+    key = f"{node['sig']}:{max_depth}:{max_files}"  # 렌더링 옵션이 바뀌어도 재구성
+    cached = cache.get(path)
+    if cached and cached[0] == key:
+        fresh[path] = cached
+        return cached[1]
+
+    indent = "  " * depth
+    lines = []
+    for name in sorted(node["dirs"]):
+        child = node["dirs"][name]
+        child_path = f"{path}{name}/"
+        if depth + 1 >= max_depth:
+            lines.append(f"{indent}{name}/ (하위 {_count_files(child)}개 파일)")
+        else:
+            lines.append(f"{indent}{name}/")
+            sub = render(child, child_path, depth + 1, cache, fresh, max_depth, max_files)
+            if sub:
+                lines.append(sub)
+    files = sorted(node["files"])
+    lines += [f"{indent}{f}" for f in files[:max_files]]
+    if len(files) > max_files:
+        lines.append(f"{indent}… 외 {len(files) - max_files}개 ({_ext_summary(files[max_files:])})")
+    text = "\n".join(lines)
+    fresh[path] = (key, text)
+    return text
+
+def get_dir_summary(root: Path = Path("."), db_path: Path = CACHE_DB_PATH, max_depth: int = MAX_DEPTH) -> dict:
+    """
+    저장소 디렉터리 구조 요약 (프롬프트 맥락용)
+    - 파일 목록은 repo_walker 캐시 사용, 서명이 바뀐 하위 트리만 다시 렌더링
+    - 반환: {"text", "signature", "rebuilt"(다시 만든 디렉터리 수), "reused"}
+    """
+    files = [p.relative_to(root).as_posix() for p in get_walker(root).files()]
+    tree = build_tree(files)
+    sign(tree)
+    key = str(Path(root).resolve())
+
+    with closing(_connect(db_path)) as conn:
+        cache = {p: (s, r) for p, s, r in conn.execute(
+            "SELECT path, signature, rendered FROM dir_summaries WHERE root = ?", (key,))}
+        fresh: dict[str, tuple[str, str]] = {}
+        text = render(tree, "", 0, cache, fresh, max_depth)
+        rebuilt = {p: v for p, v in fresh.items() if cache.get(p) != v}
+        with conn:
+            # 사라진 디렉터리 정리 + 바뀐 것만 upsert
+            alive = _dir_paths(tree)
+            stale = [p for p in cache if p not in alive]
+            conn.executemany("DELETE FROM dir_summaries WHERE root = ? AND path = ?", [(key, p) for p in stale])
+            conn.executemany(
+                "INSERT OR REPLACE INTO dir_summaries (root, path, signature, rendered) VALUES (?, ?, ?, ?)",
+                [(key, p, s, r) for p, (s, r) in rebuilt.items()],
+            )
+    return {"text": text, "signature": tree["sig"], "rebuilt": len(rebuilt), "reused": len(fresh) - len(rebuilt),
+            "tree": tree}
+
+# 🔹 directory_structures 적재
+def directory_rows(tree: dict) -> list[dict]:
+    """
+    트리 → directory_structures 행 (부모 먼저)
+    - tree_structure_json: {"files": [...], "dirs": [...]} (바로 아래 항목만)
+    """
+    rows = []
+
+    def walk(node: dict, path: str, name: str, level: int, parent: str | None):
+        directory_uuid = str(uuid.uuid4())
+        rows.append({
+            "directory_uuid": directory_uuid,
+            "parent_directory_uuid": parent,
+            "directory_path_text": path or ".",
+            "directory_name": name,
+            "nesting_level": level,
+            "tree_structure_json": {"files": sorted(node["files"]), "dirs": sorted(node["dirs"])},
+        })
+        for child in sorted(node["dirs"]):
+            walk(node["dirs"][child], f"{path}/{child}" if path else child, child, level + 1, directory_uuid)
+
+    walk(tree, "", ".", 0, None)
+    return rows
+
+def save_directory_structures(snapshot_id: str, tree: dict, dsn: str | None = None) -> int:
+    """스냅샷 1개의 디렉터리 계층 → directory_structures (uuid를 미리 만들어 부모 참조까지 execute_values 1회)"""
+    import psycopg2
+    from psycopg2.extras import execute_values
+    from snapshot.ingest import get_dsn
+
+    rows = directory_rows(tree)
+    conn = psycopg2.connect(dsn or get_dsn())
+    try:
+        with conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                "INSERT INTO directory_structures (directory_uuid, snapshot_id, parent_directory_uuid, directory_path_text, "
+                "directory_name, nesting_level, tree_structure_json) VALUES %s "
+                "ON CONFLICT (snapshot_id, directory_path_text) DO NOTHING",
+                [(r["directory_uuid"], snapshot_id, r["parent_directory_uuid"], r["directory_path_text"],
+                  r["directory_name"], r["nesting_level"], json.dumps(r["tree_structure_json"], ensure_ascii=False))
+                 for r in rows],
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+if __name__ == "__main__":
+    # 예: python -m prep.dir_structure
+    summary = get_dir_summary()
+    print(summary["text"])
+    print(f"\n♻️ 재사용 {summary['reused']} / 재구성 {summary['rebuilt']} 디렉터리")
@@ -0,0 +1,171 @@
+# prep/git_objects.py
+
+import threading
+import subprocess
+from pathlib import Path
+from typing import Iterator
+
+LOG_FIELDS = ["hash", "author", "email", "timestamp", "subject", "body"]
+_FIELD_SEP, _RECORD_SEP = "\x1f", "\x1e"
+
+class GitObjectReader:
+    """
+    git cat-file --batch 프로세스 1개를 유지하며 blob/tree 조회
+    - 요청: "<rev>:<path>" 또는 object id 한 줄 → 응답: "<oid> <type> <size>\\n<내용>\\n"
+    - read_many(): 요청을 별도 스레드로 한꺼번에 밀어넣고 응답을 순서대로 읽음 (파이프라인)
+    - 파일마다 git show 프로세스를 띄우지 않음
+    """
+
+    def __init__(self, cwd: Path | str = "."):
+        self.cwd = Path(cwd)
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _ensure(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"], cwd=self.cwd,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            )
+        return self._proc
+
+    def _read_one(self, out) -> tuple[str | None, bytes | None]:
+        header = out.readline()
+        if not header:
+            raise RuntimeError("git cat-file 프로세스가 종료되었습니다")
+        # "<spec> missing" / "<spec> ambiguous" → spec에 공백이 있을 수 있으므로 split 전에 먼저 판별
+        if header.endswith((b" missing\n", b" ambiguous\n")):
+            return None, None
+        parts = header.rsplit(maxsplit=2)
+        if len(parts) != 3 or not parts[2].isdigit():
+            raise RuntimeError(f"git cat-file 응답 형식 오류: {header!r}")
+        size = int(parts[2])
+        data = out.read(size)
+        out.read(1)  # 끝 개행
+        return parts[1].decode(), data
+
+    def read_many(self, specs: list[str]) -> Iterator[tuple[str, str | None, bytes | None]]:
+        """specs 순서대로 (spec, type, 내용) 반환, 없는 객체는 (spec, None, None)"""
+        specs = [s for s in specs if "\n" not in s]
+        if not specs:
+            return
+        with self._lock:
+            proc = self._ensure()
+            payload = "".join(f"{s}\n" for s in specs).encode("utf-8")
+
+            def feed():
+                proc.stdin.write(payload)
+                proc.stdin.flush()
+
+            # 응답을 읽지 않은 채로 요청을 계속 쓰면 stdout 파이프가 차서 교착 → 쓰기는 별도 스레드
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+            done = 0
+            try:
+                for spec in specs:
+                    try:
+                        kind, data = self._read_one(proc.stdout)
+                    finally:
+                        done += 1  # 읽다 실패한 응답도 소비한 것으로 계산
+                    self.requests += 1
+                    yield spec, kind, data
+            finally:
+                # 중간에 소비를 멈춰도 남은 응답은 비워야 다음 요청과 섞이지 않음
+                try:
+                    for _ in range(len(specs) - done):
+                        self._read_one(proc.stdout)
+                except Exception:
+                    self._kill(proc)  # 응답 경계를 잃음 → 다음 요청에서 새 프로세스
+                writer.join(timeout=5)
+
+    def read(self, spec: str) -> bytes | None:
+        for _, _, data in self.read_many([spec]):
+            return data
+        return None
+
+    def show(self, path: str | Path, rev: str = "HEAD") -> str | None:
+        """rev 시점의 파일 내용 (없으면 None)"""
+        data = self.read(f"{rev}:{Path(path).as_posix()}")
+        return None if data is None else data.decode("utf-8", errors="ignore")
+
+    def show_many(self, paths: list[str | Path], rev: str = "HEAD") -> dict[str, str | None]:
+        keys = [Path(p).as_posix() for p in paths]
+        result = {}
+        for (spec, kind, data), key in zip(self.read_many([f"{rev}:{k}" for k in keys]), keys):
+            result[key] = data.decode("utf-8", errors="ignore") if kind == "blob" else None
+        return result
+
+    def tree(self, rev: str = "HEAD", path: str = "") -> list[dict]:
+        """트리 항목 [{"mode", "name", "oid", "type"}] (바이너리 tree 형식 직접 파싱)"""
+        data = self.read(f"{rev}:{path}" if path else f"{rev}^{{tree}}")
+        entries, i = [], 0
+        while data and i < len(data):
+            sp = data.index(b" ", i)
+            nul = data.index(b"\0", sp)
+            mode = data[i:sp].decode()
+            entries.append({
+                "mode": mode,
+                "name": data[sp + 1:nul].decode("utf-8", errors="replace"),
+                "oid": data[nul + 1:nul + 21].hex(),
+                "type": "tree" if mode == "40000" else ("commit" if mode == "160000" else "blob"),
+            })
+            i = nul + 21
+        return entries
+
+    def _kill(self, proc: subprocess.Popen):
+        proc.kill()
+        proc.wait()
+        self._proc = None
+
+    def close(self):
+        with self._lock:
+            if self._proc and self._proc.poll() is None:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            self._proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_log(max_count: int = 20, rev: str = "HEAD", paths: list[str] | None = None,
+             cwd: Path | str = ".") -> Iterator[dict]:
+    """
+    git log 메타데이터를 --format 1회 호출로 스트리밍 파싱
+    - 반환: {"hash", "author", "email", "timestamp"(epoch int), "subject", "body"}
+    """
+    fmt = _FIELD_SEP.join(["%H", "%an", "%ae", "%at", "%s", "%b"]) + _RECORD_SEP
+    cmd = ["git", "log", f"--max-count={max_count}", f"--format={fmt}", rev]
+    if paths:
+        cmd += ["--", *paths]
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, encoding="utf-8", errors="replace")
+    buf = ""
+    try:
+        for chunk in iter(lambda: proc.stdout.read(8192), ""):
+            buf += chunk
+            *records, buf = buf.split(_RECORD_SEP)
+            for rec in records:
+                fields = rec.lstrip("\n").split(_FIELD_SEP)
+                if len(fields) != len(LOG_FIELDS):
+                    continue
+                item = dict(zip(LOG_FIELDS, fields))
+                item["timestamp"] = int(item["timestamp"] or 0)
+                item["body"] = item["body"].strip()
+                yield item
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+_readers: dict[str, GitObjectReader] = {}
+_readers_lock = threading.Lock()
+
+def get_reader(cwd: Path | str = ".") -> GitObjectReader:
+    key = str(Path(cwd).resolve())
+    with _readers_lock:
+        if key not in _readers:
+            _readers[key] = GitObjectReader(cwd)
+        return _readers[key]
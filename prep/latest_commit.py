@@ -0,0 +1,28 @@
+# prep/latest_commit.py
+
+import datetime
+from pathlib import Path
+
+from prep.git_objects import get_reader, iter_log
+
+def get_latest_commits(n: int = 5, paths: list[str] | None = None) -> list[dict]:
+    """
+    최근 커밋 n개 (프롬프트의 최근 커밋 맥락용)
+    - paths 지정 시 해당 파일을 건드린 커밋만
+    """
+    commits = []
+    for c in iter_log(n, paths=paths):
+        c["date"] = datetime.datetime.fromtimestamp(c["timestamp"]).strftime("%Y-%m-%d %H:%M")
+        commits.append(c)
+    return commits
+
+def get_previous_versions(paths: list[str | Path], rev: str = "HEAD") -> dict[str, str | None]:
+    """변경 파일들의 rev 시점 내용 (cat-file 프로세스 1개로 일괄 조회, 새 파일은 None)"""
+    return get_reader().show_many(paths, rev)
+
+def format_latest_commits(commits: list[dict]) -> str:
+    return "\n".join(f"- {c['hash'][:7]} {c['date']} {c['subject']}" for c in commits)
+
+if __name__ == "__main__":
+    # 예: python -m prep.latest_commit
+    print(format_latest_commits(get_latest_commits()))
@@ -0,0 +1,71 @@
+# prep/msg_prompt.py
+
+from pathlib import Path
+
+import pandas as pd
+
+from prep.describe_prompt import load_stage_conf
+from prep.latest_commit import format_latest_commits, get_latest_commits
+from prep.prompt_budget import (
+    candidate, count_tokens, format_report, input_budget, pack, render_sections, summarize_report,
+)
+from utils.config import get_user_config
+
+TEMPLATE_DIR = Path("template")
+STAGE = "mk_msg"
+SECTION_TITLES = {"describe": "파일별 변경 설명", "stat": "변경 통계", "history": "최근 커밋"}
+
+def load_template() -> str:
+    """user_config.yml style → template/{언어}/{스타일}.txt"""
+    cfg = get_user_config()
+    path = TEMPLATE_DIR / cfg.commit_language / f"{cfg.commit_style}.txt"
+    return path.read_text(encoding="utf-8") if path.exists() else ""
+
+def build_candidates(descriptions: pd.DataFrame, diffs: dict[str, dict], history: list[dict]) -> list[dict]:
+    """
+    - 파일별 설명: 필수, 변경 라인 수가 많을수록 relevance ↑
+    - 변경 통계 / 최근 커밋(메시지 스타일 참고용): 예산이 남을 때만
+    """
+    cands = []
+    total = sum(d["added"] + d["deleted"] for d in diffs.values()) or 1
+    for i, r in enumerate(descriptions.itertuples(index=False)):
+        d = diffs.get(r.file, {})
+        weight = (d.get("added", 0) + d.get("deleted", 0)) / total
+        cands.append(candidate("describe", r.file, f"- {r.file}\n{r.description}", 0.6 + 0.4 * weight,
+                               required=True, order=i))
+    if diffs:
+        stat = "\n".join(f"{d['change_type']:<8} +{d['added']} -{d['deleted']} {p}" for p, d in sorted(diffs.items()))
+        cands.append(candidate("stat", "diffstat", stat, 0.5))
+    if history:
+        cands.append(candidate("history", "latest commits", format_latest_commits(history), 0.3))
+    return cands
+
+def build_msg_prompt(descriptions: pd.DataFrame, diffs: dict[str, dict], history: list[dict] | None = None,
+                     stage_conf: dict | None = None) -> dict:
+    """
+    describe 결과(file, description) → 커밋 메시지 프롬프트 1개
+    - 반환: {"prompt", "tokens", "report"}
+    """
+    stage_conf = stage_conf or load_stage_conf("mk_msg")
+    template = load_template()
+    history = get_latest_commits() if history is None else history
+    budget = input_budget("mk_msg", stage_conf, count_tokens(template))
+    chosen, report = pack(build_candidates(descriptions, diffs, history), budget)
+    prompt = f"{template}\n\n{render_sections(chosen, SECTION_TITLES)}".strip()
+    return {"prompt": prompt, "tokens": count_tokens(prompt), "report": summarize_report(report, budget)}
+
+if __name__ == "__main__":
+    # 예: python -m prep.msg_prompt  (같은 run의 describe_result 산출물: file, description 컬럼)
+    from prep.diff import attribute_changes
+    from utils.artifacts import get_store, input_key
+
+    store = get_store()
+    described = store.get_df("describe_result")
+    diffs = attribute_changes(paths=list(described["file"]))
+    history = get_latest_commits()
+    key = input_key(described[["file", "description"]].to_dict("records"), {f: d["raw"] for f, d in diffs.items()},
+                    history, load_template(), load_stage_conf(STAGE))
+    if not store.reuse(STAGE, key):
+        result = build_msg_prompt(described, diffs, history)
+        print(format_report(result["report"]))
+        store.put(STAGE, pd.DataFrame([result]), key)
@@ -0,0 +1,180 @@
+# prep/prompt_budget.py
+
+import re
+from functools import lru_cache
+
+import tiktoken
+
+from utils.config import get_app_config, thaw
+
+DEFAULT_BUDGET_CONF = {
+    "encoding": "o200k_base",
+    "context window": {},
+    "input tokens": {"describe": 6000, "mk_msg": 3000},
+    "safety margin": 256,
+}
+IMPORT_RE = re.compile(r"^\s*(?:from\s+\S+\s+import\s+.+|import\s+\S.*)$")
+DIFF_HEADERS = ("diff --git", "index ", "similarity index", "new file mode", "deleted file mode", "--- ", "+++ ")
+
+def load_budget_conf() -> dict:
+    return {**DEFAULT_BUDGET_CONF, **thaw(get_app_config().section("prompt budget"))}
+
+APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+@lru_cache(maxsize=8)
+def _encoder(name: str):
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None  # 인코딩 파일을 받을 수 없는 환경 → 근사치
+
+def count_tokens(text: str) -> int:
+    """
+    conf.json "prompt budget" encoding 기준 토큰 수 (모델 토크나이저와 가장 가까운 tiktoken 인코딩)
+    - 인코딩을 불러올 수 없으면 단어/기호 단위 근사치
+    """
+    if not text:
+        return 0
+    enc = _encoder(load_budget_conf()["encoding"])
+    if enc is None:
+        return len(APPROX_TOKEN_RE.findall(text))
+    return len(enc.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text: str, limit: int) -> str:
+    enc = _encoder(load_budget_conf()["encoding"])
+    if enc is None:
+        matches = list(APPROX_TOKEN_RE.finditer(text))
+        return text if len(matches) <= limit else text[:matches[max(limit, 1) - 1].end()]
+    tokens = enc.encode(text, disallowed_special=())
+    return text if len(tokens) <= limit else enc.decode(tokens[:max(limit, 0)])
+
+def input_budget(stage: str, stage_conf: dict, template_tokens: int = 0) -> int:
+    """
+    단계별 입력 토큰 예산
+    - min(conf "input tokens"[stage], 모델 context window - max_tokens - safety margin) - 템플릿 토큰
+    """
+    conf = load_budget_conf()
+    model = stage_conf.get("model", "")
+    model = model[0] if isinstance(model, list) else model
+    budget = int(conf["input tokens"].get(stage, 4000))
+    window = conf["context window"].get(model)
+    if window:
+        budget = min(budget, int(window) - int(stage_conf.get("max_tokens", 0)) - int(conf["safety margin"]))
+    return max(budget - template_tokens, 0)
+
+# 🔹 중복/불필요 라인 정리
+def collapse_blank_lines(text: str) -> str:
+    return re.sub(r"\n{3,}", "\n\n", text).strip("\n")
+
+def dedupe_imports(text: str, seen: set[str]) -> str:
+    """이미 프롬프트에 들어간 import 줄 제거 (seen 갱신)"""
+    out = []
+    for line in text.splitlines():
+        key = line.strip()
+        if IMPORT_RE.match(line):
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(line)
+    return "\n".join(out)
+
+def collapse_diff(raw: str) -> str:
+    """
+    diff 본문만 남김 (index/mode 헤더 제거, 추가·삭제 쌍이 줄 끝 공백만 다르면 생략)
+    - -U0 diff라 변경되지 않은 라인은 이미 없음
+    - 헤더는 hunk 밖(diff --git ~ 첫 @@)에서만 제거 → 내용이 "-- " / "++ "로 시작하는 변경 줄은 유지
+    - 들여쓰기 변경은 의미가 있으므로(블록 이동) 유지
+    """
+    out, minus = [], []
+    in_hunk = False
+    for line in raw.splitlines():
+        if line.startswith("diff --git"):
+            in_hunk = False
+        elif line.startswith("@@"):
+            in_hunk = True
+        if not in_hunk and line.startswith(DIFF_HEADERS):
+            continue  # rename from/to, Binary files 같은 나머지 헤더는 유지 (hunk 없는 변경의 유일한 정보)
+        if line.startswith("-"):
+            minus.append(line)
+            continue
+        if line.startswith("+") and minus and minus[0][1:].rstrip() == line[1:].rstrip():
+            minus.pop(0)  # 줄 끝 공백만 바뀐 줄
+            continue
+        out.extend(minus)
+        minus = []
+        out.append(line)
+    out.extend(minus)
+    return "\n".join(out)
+
+# 🔹 패킹
+def candidate(kind: str, key: str, text: str, relevance: float, required: bool = False, order: int = 0) -> dict:
+    """
+    프롬프트 후보 1개
+    - kind: diff / related / dir / readme / ... (섹션 구분)
+    - relevance: 높을수록 먼저 채움, order: 섹션 안 출력 순서 (예: hunk 위치)
+    """
+    return {"kind": kind, "key": key, "text": text, "relevance": float(relevance), "required": required, "order": order}
+
+def pack(candidates: list[dict], budget: int) -> tuple[list[dict], list[dict]]:
+    """
+    relevance 순 greedy 패킹
+    - 중복 import 제거 후 정확한 토큰 수로 예산 확인 (import는 실제로 포함된 후보의 것만 이후 중복으로 취급)
+    - required 후보가 남은 예산보다 크면 잘라서 넣음, 일반 후보는 제외
+    - 반환: (포함 후보 목록, 리포트 행 목록)
+    """
+    seen_imports: set[str] = set()
+    chosen, report = [], []
+    used = 0
+    order = sorted(candidates, key=lambda c: (not c["required"], -c["relevance"]))
+    for c in order:
+        text = collapse_blank_lines(dedupe_imports(c["text"], set(seen_imports)))
+        original = count_tokens(c["text"])
+        tokens = count_tokens(text)
+        row = {"kind": c["kind"], "key": c["key"], "relevance": round(c["relevance"], 4),
+               "tokens": tokens, "original_tokens": original}
+        if not text.strip():
+            report.append({**row, "included": False, "reason": "중복 제거 후 빈 내용"})
+            continue
+        if used + tokens <= budget:
+            chosen.append({**c, "text": text, "tokens": tokens})
+            dedupe_imports(text, seen_imports)
+            used += tokens
+            report.append({**row, "included": True, "reason": "collapsed" if tokens < original else ""})
+        elif c["required"] and budget - used > 32:
+            cut = truncate_to_tokens(text, budget - used)
+            t = count_tokens(cut)
+            chosen.append({**c, "text": cut + "\n…(생략)", "tokens": t})
+            dedupe_imports(cut, seen_imports)
+            used += t
+            report.append({**row, "tokens": t, "included": True, "reason": f"예산 부족 → {tokens}→{t} 토큰으로 절단"})
+        else:
+            report.append({**row, "included": False, "reason": f"예산 초과 (남은 {budget - used})"})
+    return chosen, report
+
+def render_sections(chosen: list[dict], titles: dict[str, str]) -> str:
+    """kind별로 묶어 titles 순서대로 섹션 구성"""
+    parts = []
+    for kind, title in titles.items():
+        items = sorted((c for c in chosen if c["kind"] == kind), key=lambda c: c["order"])
+        if items:
+            parts.append(f"[{title}]\n" + "\n\n".join(c["text"] for c in items))
+    return "\n\n".join(parts)
+
+def summarize_report(report: list[dict], budget: int) -> dict:
+    included = [r for r in report if r["included"]]
+    return {
+        "budget": budget,
+        "used": sum(r["tokens"] for r in included),
+        "original": sum(r["original_tokens"] for r in report),
+        "included": len(included),
+        "dropped": len(report) - len(included),
+        "items": report,
+    }
+
+def format_report(summary: dict) -> str:
+    lines = [f"📦 {summary['used']}/{summary['budget']} 토큰 (후보 원본 {summary['original']}) "
+             f"포함 {summary['included']} / 제외 {summary['dropped']}"]
+    for r in summary["items"]:
+        mark = "✅" if r["included"] else "❌"
+        lines.append(f"  {mark} {r['kind']:<8} {r['key'][:60]:<60} {r['tokens']:>6} rel={r['relevance']:<6} {r['reason']}")
+    return "\n".join(lines)
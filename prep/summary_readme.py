@@ -0,0 +1,100 @@
+# prep/summary_readme.py
+
+import re
+import sqlite3
+import datetime
+from pathlib import Path
+from contextlib import closing
+
+from snapshot.elements import sha256_hex
+from prep.prompt_budget import truncate_to_tokens
+from utils.log import log
+
+CACHE_DB_PATH = Path("DB/cache/context_cache.db")
+README_NAMES = ["README.md", "README.rst", "README.txt", "README", "readme.md"]
+README_INPUT_TOKENS = 3000     # LLM에 넘길 README 최대 토큰
+EXTRACTIVE_MAX_CHARS = 800     # LLM 실패 시 앞부분 발췌 길이
+
+PROMPT = (
+    "다음은 저장소 README입니다. 이 프로젝트가 무엇을 하는지, 주요 구성 요소와 용어를 5줄 이내로 요약해주세요.\n"
+    "커밋 메시지 작성 시 배경 설명으로만 쓰이므로 설치 방법·라이선스는 생략하세요.\n\n"
+)
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS readme_summaries (
+            path TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            source TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )""")
+    return conn
+
+def find_readme(root: Path = Path(".")) -> Path | None:
+    for name in README_NAMES:
+        p = root / name
+        if p.is_file():
+            return p
+    return None
+
+def extractive_summary(text: str) -> str:
+    """LLM 없이: 배지/이미지/코드 블록 제거 후 앞부분 발췌"""
+    text = re.sub(r"```.*?```", "", text, flags=re.S)
+    text = re.sub(r"!\[[^\]]*\]\([^)]*\)|<img[^>]*>", "", text)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return text[:EXTRACTIVE_MAX_CHARS] + ("…" if len(text) > EXTRACTIVE_MAX_CHARS else "")
+
+def llm_summary(text: str) -> str:
+    import pandas as pd
+    from LLM.llm_manager import LLMManager
+
+    manager = LLMManager("describe", pd.DataFrame())
+    return manager.call(PROMPT + truncate_to_tokens(text, README_INPUT_TOKENS), tag="readme_summary").strip()
+
+def get_readme_summary(root: Path = Path("."), db_path: Path = CACHE_DB_PATH, use_llm: bool = True,
+                       force: bool = False) -> dict:
+    """
+    README 요약 (프롬프트 맥락용)
+    - README 내용 해시가 캐시와 같으면 저장된 요약 그대로 반환 (LLM 호출 없음)
+    - 바뀌었을 때만 LLM으로 재생성, 실패 시 앞부분 발췌로 대체
+    - use_llm=True면 캐시된 발췌(LLM 실패 대체분)는 적중으로 보지 않음 → 다음 실행에서 LLM 요약 재시도
+    - 반환: {"text", "path", "content_hash", "source"(llm/extractive/cache), "regenerated"}
+    """
+    readme = find_readme(root)
+    if readme is None:
+        return {"text": "", "path": None, "content_hash": None, "source": "none", "regenerated": False}
+    text = readme.read_text(encoding="utf-8", errors="ignore")
+    content_hash = sha256_hex(text)
+    key = readme.resolve().as_posix()
+
+    with closing(_connect(db_path)) as conn:
+        row = conn.execute("SELECT content_hash, summary, source FROM readme_summaries WHERE path = ?", (key,)).fetchone()
+        retry_llm = use_llm and row is not None and row[2] == "extractive"
+        if row and row[0] == content_hash and not force and not retry_llm:
+            return {"text": row[1], "path": str(readme), "content_hash": content_hash, "source": "cache",
+                    "regenerated": False}
+
+        summary, source = "", "extractive"
+        if use_llm:
+            try:
+                summary, source = llm_summary(text), "llm"
+            except Exception as e:
+                log(f"README 요약 LLM 호출 실패 → 발췌 사용: {e}", level="WARN", source="summary_readme")
+        if not summary:
+            summary, source = extractive_summary(text), "extractive"
+
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO readme_summaries (path, content_hash, summary, source, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content_hash, summary, source, datetime.datetime.now().isoformat(timespec="seconds")),
+            )
+    return {"text": summary, "path": str(readme), "content_hash": content_hash, "source": source, "regenerated": True}
+
+if __name__ == "__main__":
+    # 예: python -m prep.summary_readme
+    result = get_readme_summary()
+    print(f"[{result['source']}] {result['path']}\n{result['text']}")
@@ -0,0 +1,409 @@
+# run_all.py
+
+import sys
+import json
+import time
+import uuid
+import hashlib
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+sys.path.insert(0, "scoping")  # scoping 모듈은 형제 import 사용
+
+from utils.artifacts import ArtifactStore, json_default, get_store, input_key
+from utils.log import log
+from utils.path import get_repo_key, get_timestamp
+
+class Stage:
+    """
+    파이프라인 단계 1개
+    - deps: 입력으로 받는 상위 단계 이름 (fn(inputs) → inputs[이름] = 상위 출력)
+    - code: 코드 버전 해시에 들어가는 소스 파일 (바뀌면 캐시 무효)
+    - cache=False: 매번 실행 (싼 입력 수집 단계 / 부수 효과 단계)
+    - volatile: 출력 지문에서 제외할 컬럼/키 (실행마다 바뀌는 id 등)
+    """
+
+    def __init__(self, name: str, fn: Callable[[dict], Any], deps: tuple[str, ...] = (), code: tuple[str, ...] = (),
+                 cache: bool = True, volatile: tuple[str, ...] = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = deps
+        self.code = code
+        self.cache = cache
+        self.volatile = volatile
+
+def code_version(paths: tuple[str, ...]) -> str:
+    h = hashlib.sha256()
+    for p in paths:
+        path = Path(p)
+        h.update(p.encode() + b"\0" + (path.read_bytes() if path.exists() else b""))
+    return h.hexdigest()
+
+# 🔹 단계 출력 ↔ 산출물 (DataFrame은 그대로, 나머지는 JSON 1행)
+def _to_frame(value: Any) -> pd.DataFrame:
+    if isinstance(value, pd.DataFrame):
+        return value
+    return pd.DataFrame({"value": [json.dumps(value, ensure_ascii=False, default=json_default)]})
+
+def _from_frame(df: pd.DataFrame) -> Any:
+    if list(df.columns) == ["value"] and len(df) == 1 and isinstance(df["value"].iloc[0], str):
+        return json.loads(df["value"].iloc[0])
+    return df
+
+def output_fingerprint(value: Any, volatile: tuple[str, ...] = ()) -> str:
+    """출력 내용 해시 → 다시 실행했어도 결과가 같으면 하위 단계는 캐시 사용 (early cutoff)"""
+    if isinstance(value, pd.DataFrame):
+        value = value.drop(columns=[c for c in volatile if c in value.columns]).to_dict("records")
+    elif isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in volatile}
+    return input_key(value)
+
+class PipelineRunner:
+    """
+    단계 DAG 실행기
+    - 의존 단계가 끝난 단계부터 스레드 풀에 제출 → 독립 단계 동시 실행
+    - 단계 키 = hash(이름, 코드 버전, 상위 출력 지문) → 산출물 저장소(utils.artifacts)에 같은 키가 있으면 생략
+    - 실패한 단계의 하위 단계는 skipped, 나머지는 계속 진행
+    """
+
+    def __init__(self, stages: list[Stage], store: ArtifactStore, max_workers: int = 4, force: set[str] | None = None,
+                 on_event: Callable[[dict], None] | None = None):
+        self.stages = {s.name: s for s in stages}
+        self.store = store
+        self.max_workers = max_workers
+        self.force = force or set()
+        self.on_event = on_event  # 진행 상황 전달 (예: 데몬 → 클라이언트 스트리밍)
+        for s in stages:
+            missing = [d for d in s.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"{s.name}: 알 수 없는 의존 단계 {missing}")
+
+    def _emit(self, event: dict):
+        if self.on_event:
+            try:
+                self.on_event(event)
+            except Exception:
+                pass  # 진행 알림 실패(클라이언트 연결 끊김 등)가 실행을 막지 않도록
+
+    def _closure(self, targets: list[str] | None) -> list[str]:
+        if not targets:
+            return list(self.stages)
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].deps)
+        return [n for n in self.stages if n in needed]
+
+    def _run_stage(self, stage: Stage, outputs: dict[str, Any], fingerprints: dict[str, str]) -> dict:
+        start = time.perf_counter()
+        key = input_key(stage.name, code_version(stage.code), [fingerprints[d] for d in stage.deps])
+        if stage.cache and stage.name not in self.force and self.store.reuse(stage.name, key):
+            value, status = _from_frame(self.store.get_df(stage.name)), "cached"
+            fingerprint = self.store.meta(stage.name).get("output_fingerprint") or output_fingerprint(value, stage.volatile)
+        else:
+            value = stage.fn({d: outputs[d] for d in stage.deps})
+            status = "ran"
+            fingerprint = output_fingerprint(value, stage.volatile)
+            if stage.cache:
+                self.store.put(stage.name, _to_frame(value), key, {"output_fingerprint": fingerprint})
+        return {
+            "value": value,
+            "fingerprint": fingerprint,
+            "status": status,
+            "seconds": time.perf_counter() - start,
+            "rows": len(value) if isinstance(value, pd.DataFrame) else None,
+            "key": key,
+        }
+
+    def run(self, targets: list[str] | None = None) -> dict:
+        """
+        반환: {"outputs": {단계: 출력}, "report": [{stage, status, seconds, rows, key}], "seconds"}
+        - status: ran / cached / failed / skipped
+        """
+        order = self._closure(targets)
+        pending = set(order)
+        outputs: dict[str, Any] = {}
+        fingerprints: dict[str, str] = {}
+        report: dict[str, dict] = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                for name in [n for n in order if n in pending]:
+                    deps = self.stages[name].deps
+                    if any(report.get(d, {}).get("status") in ("failed", "skipped") for d in deps):
+                        pending.discard(name)
+                        report[name] = {"stage": name, "status": "skipped", "seconds": 0.0, "rows": None,
+                                        "key": None, "error": "상위 단계 실패"}
+                    elif all(d in fingerprints for d in deps):
+                        pending.discard(name)
+                        self._emit({"event": "stage", "stage": name, "status": "started"})
+                        running[executor.submit(self._run_stage, self.stages[name], outputs, fingerprints)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        log(f"[pipeline] {name} 실패: {e}", level="ERROR", source="run_all")
+                        report[name] = {"stage": name, "status": "failed", "seconds": None, "rows": None,
+                                        "key": None, "error": str(e)}
+                        self._emit({"event": "stage", **report[name]})
+                        continue
+                    outputs[name] = result.pop("value")
+                    fingerprints[name] = result.pop("fingerprint")
+                    report[name] = {"stage": name, **result}
+                    self._emit({"event": "stage", **report[name]})
+
+        rows = [report[n] for n in order if n in report]
+        total = time.perf_counter() - started
+        self.store.put("pipeline_report", pd.DataFrame(rows).astype({"rows": "float64", "seconds": "float64"}))
+        return {"outputs": outputs, "report": rows, "seconds": total}
+
+def format_timing(result: dict) -> str:
+    marks = {"ran": "▶️", "cached": "♻️", "failed": "❌", "skipped": "⏭️"}
+    lines = [f"⏱️ 파이프라인 {result['seconds']:.2f}s"]
+    for r in result["report"]:
+        sec = "-" if r["seconds"] is None else f"{r['seconds']:.3f}s"
+        rows = "" if r["rows"] is None else f"rows={r['rows']}"
+        err = f"  {r['error']}" if r.get("error") else ""
+        lines.append(f"  {marks[r['status']]} {r['stage']:<16} {r['status']:<8} {sec:>9} {rows}{err}")
+    return "\n".join(lines)
+
+# 🔹 단계 정의
+def _listup(_: dict) -> pd.DataFrame:
+    """변경 파일 + 내용 해시 (한 줄만 바뀌어도 지문이 달라짐)"""
+    from listup import get_changed_files
+    files = get_changed_files()
+    return pd.DataFrame({
+        "file": files,
+        "content_hash": [hashlib.sha256(Path(f).read_bytes()).hexdigest() for f in files],
+    })
+
+def _repo_state(_: dict) -> pd.DataFrame:
+    """커밋된 전체 파일 blob 해시 (변경되지 않은 파일의 참조 관계가 바뀌었는지 판단)"""
+    out = subprocess.run(["git", "ls-files", "-s"], capture_output=True, text=True, encoding="utf-8").stdout
+    rows = [line.split("\t", 1) for line in out.splitlines() if "\t" in line]
+    return pd.DataFrame({"path": [p for _, p in rows], "blob": [m.split()[1] for m, _ in rows]})
+
+def _dir_summary(_: dict) -> str:
+    from prep.dir_structure import get_dir_summary
+    return get_dir_summary()["text"]
+
+def _readme_summary(_: dict) -> str:
+    from prep.summary_readme import get_readme_summary
+    return get_readme_summary()["text"]
+
+def _diff(inputs: dict) -> dict:
+    from prep.diff import attribute_changes
+    return attribute_changes(paths=list(inputs["listup"]["file"]))
+
+def _conv_df(_: dict) -> pd.DataFrame:
+    from conv_df import convert_to_group_df
+    return convert_to_group_df()
+
+def _clustering(inputs: dict) -> pd.DataFrame:
+    from clustering import clustering_main
+    df = inputs["conv_df"]
+    if df.empty:
+        return df
+    return clustering_main(df, get_repo_key(), _store.run_id if _store else None, _request_uuid)
+
+def _describe_prompt(inputs: dict) -> pd.DataFrame:
+    from prep.describe_prompt import build_describe_prompts
+    if inputs["clustering"].empty:
+        return pd.DataFrame(columns=["file", "id", "prompt", "tokens", "report"])
+    return build_describe_prompts(inputs["clustering"], inputs["diff"], inputs["dir_summary"], inputs["readme_summary"])
+
+def _describe(inputs: dict) -> pd.DataFrame:
+    """
+    파일별 설명 LLM 호출
+    - 직전 실행 describe 산출물에서 프롬프트 해시가 같은 행은 재사용 → 바뀐 파일만 호출
+    - call_all은 실패를 "[ERROR] …" 문자열로 돌려줌 → 1건이라도 있으면 단계 실패
+      (성공한 행은 입력 키 없이 저장 → 단계 캐시로는 재사용되지 않고, 다음 실행의 행 단위 재사용에만 쓰임)
+    """
+    from LLM.llm_manager import LLMManager
+
+    prompts = inputs["describe_prompt"]
+    hashes = [input_key(p) for p in prompts["prompt"]]
+    previous = {}
+    prev_store = _store.previous("describe") if _store else None
+    if prev_store is not None:
+        prev = prev_store.get_df("describe")
+        previous = {h: d for h, d in zip(prev["prompt_hash"], prev["description"]) if not str(d).startswith("[ERROR]")}
+
+    todo = [i for i, h in enumerate(hashes) if h not in previous]
+    descriptions = [previous.get(h) for h in hashes]
+    manager = LLMManager("describe", prompts, run_id=_store.run_id if _store else None)
+    for i, h in enumerate(hashes):
+        if h in previous:  # 재사용 행도 원장에 cache_hit으로 남김 → summary()["cache_hits"]
+            manager.record_reuse(prompts["prompt"].iloc[i], prompts["file"].iloc[i], previous[h])
+    if todo:
+        answers = manager.call_all([prompts["prompt"].iloc[i] for i in todo], [prompts["file"].iloc[i] for i in todo])
+        for i, answer in zip(todo, answers):
+            descriptions[i] = answer
+    result = pd.DataFrame({"file": prompts["file"], "id": prompts["id"], "prompt_hash": hashes,
+                           "description": descriptions})
+    failed = [f for f, d in zip(result["file"], result["description"]) if str(d).startswith("[ERROR]")]
+    if failed:
+        if _store:
+            _store.put("describe", result)
+        raise RuntimeError(f"설명 생성 실패 {len(failed)}건: {', '.join(failed[:5])}")
+    return result
+
+def _mk_msg_prompt(inputs: dict) -> dict:
+    from prep.msg_prompt import build_msg_prompt
+    return build_msg_prompt(inputs["describe"], inputs["diff"])
+
+def _mk_msg(inputs: dict) -> dict:
+    from LLM.llm_manager import LLMManager
+    df = pd.DataFrame([inputs["mk_msg_prompt"]])
+    manager = LLMManager("mk_msg", df, run_id=_store.run_id if _store else None)
+    return {"message": manager.call(inputs["mk_msg_prompt"]["prompt"], tag="mk_msg").strip()}
+
+def _upload(inputs: dict) -> dict:
+    """변경 파일 전체를 생성된 메시지로 커밋 (push는 --push일 때만)"""
+    return commit_files(list(inputs["listup"]["file"]), inputs["mk_msg"]["message"])
+
+def commit_files(files: list[str], message: str) -> dict:
+    """기본 모드 upload 단계 / 스트리밍 모드 --upload 공용"""
+    from upload.git_batch import GitCommitExecutor
+    if not files:
+        return {"commits": [], "pushed": False}
+    outcome = GitCommitExecutor(log_func=lambda m: log(m, source="run_all")).run(
+        [(files, message)], push=_push)
+    return {"commits": outcome["commits"], "pushed": outcome["pushed"], "errors": outcome["errors"]}
+
+_store: ArtifactStore | None = None
+_push = False
+_request_uuid: str | None = None  # 커밋 생성 요청 id (ScopingLog ↔ finalized_commits 피드백 연결)
+
+SCOPING_CODE = ("scoping/listup.py", "scoping/conv_df.py", "scoping/import_flow.py", "scoping/extract_rel_fx.py",
+                "scoping/repo_walker.py", "config/user_config.yml")
+
+def build_stages(upload: bool = False) -> list[Stage]:
+    stages = [
+        Stage("listup", _listup, cache=False),
+        Stage("repo_state", _repo_state, cache=False),
+        Stage("dir_summary", _dir_summary, cache=False),        # 자체 캐시 (prep/dir_structure.py)
+        Stage("readme_summary", _readme_summary, cache=False),  # 자체 캐시 (README 해시)
+        Stage("diff", _diff, ("listup",), ("prep/diff.py", "prep/git_objects.py", "snapshot/elements.py")),
+        Stage("conv_df", _conv_df, ("listup", "repo_state"), SCOPING_CODE, volatile=("id",)),
+        Stage("clustering", _clustering, ("conv_df",),
+              ("scoping/clustering.py", "scoping/extract_select_features.py", "scoping/feature.json",
+               "scoping/weight.json", "config/conf.json"), volatile=("id",)),
+        Stage("describe_prompt", _describe_prompt, ("clustering", "diff", "dir_summary", "readme_summary"),
+              ("prep/describe_prompt.py", "prep/prompt_budget.py", "config/conf.json"), volatile=("id",)),
+        Stage("describe", _describe, ("describe_prompt",), ("LLM/llm_manager.py", "LLM/llm_router.py"),
+              volatile=("id",)),
+        Stage("mk_msg_prompt", _mk_msg_prompt, ("describe", "diff"),
+              ("prep/msg_prompt.py", "prep/latest_commit.py", "prep/prompt_budget.py", "config/user_config.yml")),
+        Stage("mk_msg", _mk_msg, ("mk_msg_prompt",), ("LLM/llm_manager.py", "LLM/llm_router.py", "config/conf.json")),
+    ]
+    if upload:
+        stages.append(Stage("upload", _upload, ("mk_msg", "listup"), cache=False))
+    return stages
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Comfort Commit 파이프라인 실행")
+    parser.add_argument("--until", nargs="*", help="이 단계까지만 실행 (의존 단계 포함)")
+    parser.add_argument("--force", nargs="*", default=[], help="캐시를 무시하고 다시 실행할 단계")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--run-id", default=None)
+    parser.add_argument("--request-uuid", default=None, help="커밋 생성 요청 id (기본: 실행마다 새로 발급)")
+    parser.add_argument("--upload", action="store_true", help="생성된 메시지로 커밋")
+    parser.add_argument("--push", action="store_true", help="커밋 후 push")
+    parser.add_argument("--stream", action="store_true", help="스트리밍 모드 (run_stream.py, scoping과 LLM 호출 겹침)")
+    return parser
+
+def execute(args: argparse.Namespace, on_event: Callable[[dict], None] | None = None) -> dict:
+    """
+    파싱된 인자로 1회 실행 (CLI / 상주 데몬 공용)
+    - 반환: {"report", "seconds", "message", "timing"(출력용 텍스트), "request_uuid"(ScopingLog에 기록된 요청 id)}
+    """
+    global _store, _push, _request_uuid
+    _push = args.push
+    _request_uuid = getattr(args, "request_uuid", None) or str(uuid.uuid4())
+    if args.stream:
+        return execute_stream(args, on_event)
+
+    _store = get_store(args.run_id or get_timestamp())
+    runner = PipelineRunner(build_stages(args.upload), _store, args.workers, set(args.force), on_event)
+    result = runner.run(args.until)
+    message = result["outputs"].get("mk_msg", {}).get("message", "")
+    return {"report": result["report"], "seconds": result["seconds"], "message": message,
+            "timing": format_timing(result), "request_uuid": _request_uuid}
+
+def check_args(args: argparse.Namespace):
+    """--stream은 scoping → mk_msg 전체를 한 번에 흘려보내므로 단계 선택 옵션과 함께 쓸 수 없음"""
+    if args.stream and (args.until or args.force):
+        raise ValueError("--stream 모드에서는 --until / --force를 쓸 수 없음 (단계 단위 실행은 기본 모드 사용)")
+
+def execute_stream(args: argparse.Namespace, on_event: Callable[[dict], None] | None = None) -> dict:
+    """
+    스트리밍 모드 실행 + (--upload) 커밋
+    - report는 기본 모드와 같은 형식 (describe / mk_msg / upload), 설명 실패 시 mk_msg·upload는 skipped
+    """
+    from run_stream import StreamPipeline, format_stream_stats
+
+    check_args(args)
+    pipeline = StreamPipeline(get_store(args.run_id or get_timestamp()), on_event=on_event, request_uuid=_request_uuid)
+    result = pipeline.run()
+
+    def row(stage: str, status: str, error: str | None = None) -> dict:
+        report_row = {"stage": stage, "status": status, "seconds": None, "rows": None, "key": None, "error": error}
+        if on_event:
+            on_event({"event": "stage", **report_row})
+        return report_row
+
+    failed = result["failed"]
+    report = [row("describe", "failed", f"설명 생성 실패 {len(failed)}건: {', '.join(failed[:5])}") if failed
+              else row("describe", "ran")]
+    if failed:
+        report.append(row("mk_msg", "skipped", "상위 단계 실패"))
+    elif result.get("mk_msg_error"):
+        report.append(row("mk_msg", "failed", result["mk_msg_error"]))
+    else:
+        report.append(row("mk_msg", "ran"))
+
+    timing = format_stream_stats(pipeline.stats)
+    if args.upload:
+        if report[-1]["status"] != "ran" or not result["message"]:
+            report.append(row("upload", "skipped", "커밋 메시지 없음"))
+        else:
+            try:
+                outcome = commit_files(result["files"], result["message"])
+                report.append(row("upload", "ran"))
+                timing += f"\n  📤 커밋 {len(outcome['commits'])}건 (push {'완료' if outcome['pushed'] else '안 함'})"
+            except Exception as e:
+                log(f"[pipeline] upload 실패: {e}", level="ERROR", source="run_all")
+                report.append(row("upload", "failed", str(e)))
+    return {"report": report, "seconds": pipeline.stats["total_s"], "message": result["message"], "timing": timing,
+            "request_uuid": _request_uuid}
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        check_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+    result = execute(args)
+    print(result["timing"])
+    if result["message"]:
+        print(f"\n📝 커밋 메시지\n{result['message']}")
+    return result
+
+if __name__ == "__main__":
+    # 예: python run_all.py --until describe_prompt   /   python run_all.py --upload --push
+    main()
@@ -0,0 +1,241 @@
+# run_stream.py
+
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, "scoping")  # scoping 모듈은 형제 import 사용
+
+from utils.artifacts import ArtifactStore, get_store, input_key
+from utils.log import log
+from utils.path import get_repo_key, get_timestamp
+
+DONE = object()  # 큐 종료 표시
+
+class StreamPipeline:
+    """
+    스트리밍 모드: scoping → describe → mk_msg를 bounded asyncio.Queue로 연결
+    - scoping(conv_df → clustering)은 전용 스레드에서 파일 1개씩 yield, 큐가 차면 스레드가 대기 (backpressure)
+    - describe worker(parallel calls개)는 scoping 결과가 나오는 즉시 프롬프트 구성 + LLM 호출
+    - mk_msg는 describe 결과를 받아 모으다가 스트림이 끝나면 1회 호출 (입력이 전체 설명이라 마지막 단계는 장벽)
+    - 메모리: 파일 본문/프롬프트는 큐 크기만큼만 존재, 누적되는 것은 파일별 설명 문자열뿐
+    """
+
+    def __init__(self, store: ArtifactStore, queue_size: int | None = None, workers: int | None = None,
+                 on_event=None, request_uuid: str | None = None, repo: str | None = None):
+        from LLM.llm_manager import LLMManager
+
+        self.store = store
+        self.describe_llm = LLMManager("describe", pd.DataFrame(), run_id=store.run_id)
+        self.msg_llm = LLMManager("mk_msg", pd.DataFrame(), run_id=store.run_id)
+        self.workers = workers or self.describe_llm.max_workers
+        self.queue_size = queue_size or self.workers * 2
+        self.stats = {"files": 0, "described": 0, "reused": 0, "errors": 0, "max_queue": 0,
+                      "scoping_s": 0.0, "llm_s": 0.0, "first_llm_at": None, "total_s": 0.0}
+        self._start = 0.0
+        self.on_event = on_event  # 파일별 진행 상황 전달 (상주 데몬 → 클라이언트)
+        self.request_uuid = request_uuid  # ScopingLog에 기록 → train_weights 피드백 연결
+        self.repo = repo or get_repo_key()  # weight.json 프로필 선택 + ScopingLog params.repo
+
+    # 🔹 단계별 코루틴
+    async def _produce(self, loop: asyncio.AbstractEventLoop, changed: list[str], queue: asyncio.Queue):
+        """CPU 위주 scoping을 스레드에서 실행, 결과를 1개씩 큐에 넣음"""
+        from clustering import iter_clustering
+        from conv_df import iter_group_records
+        from stage_log import ScopingLog
+
+        def worker():
+            stage_log = ScopingLog(self.store.run_id, self.request_uuid, params={"repo": self.repo})
+            started = time.perf_counter()
+            try:
+                for row in iter_clustering(iter_group_records(changed), stage_log, self.repo):
+                    asyncio.run_coroutine_threadsafe(queue.put(row), loop).result()
+                    self.stats["files"] += 1
+                    self.stats["max_queue"] = max(self.stats["max_queue"], queue.qsize())
+            finally:
+                stage_log.close()
+                self.stats["scoping_s"] = time.perf_counter() - started
+                asyncio.run_coroutine_threadsafe(queue.put(DONE), loop).result()
+
+        await loop.run_in_executor(None, worker)
+
+    async def _timed_call(self, manager, prompt: str, tag: str) -> str:
+        loop = asyncio.get_running_loop()
+        if self.stats["first_llm_at"] is None:
+            self.stats["first_llm_at"] = time.perf_counter() - self._start
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(None, manager.call, prompt, tag)
+        finally:
+            self.stats["llm_s"] += time.perf_counter() - started
+
+    async def _describe_worker(self, context: asyncio.Future, in_q: asyncio.Queue, out_q: asyncio.Queue,
+                               previous: dict[str, str]):
+        from prep.describe_prompt import build_describe_prompts
+
+        ctx = await context
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await in_q.get()
+            if row is DONE:
+                await in_q.put(DONE)  # 다른 worker도 종료
+                return
+            # 파일 1개 실패가 큐 전체를 멈추지 않도록 행 단위로 오류 기록
+            prompt_hash = None
+            try:
+                prompts = await loop.run_in_executor(
+                    None, build_describe_prompts, pd.DataFrame([row]), ctx["diffs"], ctx["dir"], ctx["readme"])
+                prompt = prompts["prompt"].iloc[0]
+                prompt_hash = input_key(prompt)
+                if prompt_hash in previous:
+                    description = previous[prompt_hash]
+                    self.describe_llm.record_reuse(prompt, row["file"], description)
+                    self.stats["reused"] += 1
+                else:
+                    description = await self._timed_call(self.describe_llm, prompt, row["file"])
+            except Exception as e:
+                description = f"[ERROR] {e}"
+                self.stats["errors"] += 1
+            self.stats["described"] += 1
+            if self.on_event:
+                self.on_event({"event": "file", "file": row["file"], "status": "described",
+                               "error": description if description.startswith("[ERROR]") else None})
+            await out_q.put({"file": row["file"], "id": row.get("id", "N/A"), "prompt_hash": prompt_hash,
+                             "description": description})
+
+    async def _load_context(self, changed: list[str]) -> dict:
+        """
+        diff / 디렉터리 요약 / README 요약을 scoping과 동시에 준비
+        - 하나가 실패해도 worker 전체를 멈추지 않음 → 해당 항목만 빈 값으로 두고 계속 (행 단위 오류와 같은 방식)
+        """
+        from prep.diff import attribute_changes
+        from prep.dir_structure import get_dir_summary
+        from prep.summary_readme import get_readme_summary
+
+        loop = asyncio.get_running_loop()
+        diffs, dir_summary, readme = await asyncio.gather(
+            loop.run_in_executor(None, lambda: attribute_changes(paths=changed)),
+            loop.run_in_executor(None, get_dir_summary),
+            loop.run_in_executor(None, get_readme_summary),
+            return_exceptions=True,
+        )
+        for name, value in (("diff", diffs), ("dir_summary", dir_summary), ("readme_summary", readme)):
+            if isinstance(value, BaseException):
+                log(f"[stream] {name} 준비 실패 → 빈 값으로 진행: {value}", level="ERROR", source="run_stream")
+        return {
+            "diffs": {} if isinstance(diffs, BaseException) else diffs,
+            "dir": "" if isinstance(dir_summary, BaseException) else dir_summary["text"],
+            "readme": "" if isinstance(readme, BaseException) else readme["text"],
+        }
+
+    def _previous_descriptions(self) -> dict[str, str]:
+        prev = self.store.previous("describe")
+        if prev is None:
+            return {}
+        df = prev.get_df("describe")
+        if "prompt_hash" not in df.columns:
+            return {}
+        return {h: d for h, d in zip(df["prompt_hash"], df["description"]) if not str(d).startswith("[ERROR]")}
+
+    # 🔹 실행
+    async def run_async(self, changed: list[str]) -> dict:
+        from prep.msg_prompt import build_msg_prompt
+
+        loop = asyncio.get_running_loop()
+        # LLM 호출 + scoping 스레드 + 프롬프트 구성이 기본 executor 크기에 막히지 않도록
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=self.workers * 2 + 4))
+        self._start = time.perf_counter()
+        scoped_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        described_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        producer = asyncio.create_task(self._produce(loop, changed, scoped_q))
+        context = asyncio.ensure_future(self._load_context(changed))
+        previous = self._previous_descriptions()
+        workers = [asyncio.create_task(self._describe_worker(context, scoped_q, described_q, previous))
+                   for _ in range(self.workers)]
+
+        async def close_described():
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                await described_q.put(DONE)  # worker가 죽어도 아래 수집 루프는 끝나야 함
+
+        closer = asyncio.create_task(close_described())
+        rows = []
+        while (item := await described_q.get()) is not DONE:
+            rows.append(item)
+        try:
+            await closer
+        except BaseException:
+            for w in workers:
+                w.cancel()
+            # scoping 스레드가 가득 찬 큐에서 멈춰 있지 않도록 DONE이 올 때까지 비움
+            while not producer.done():
+                if await scoped_q.get() is DONE:
+                    break
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+        await producer
+
+        described = pd.DataFrame(rows, columns=["file", "id", "prompt_hash", "description"])
+        failed = [r["file"] for r in rows if str(r["description"]).startswith("[ERROR]")]
+        result = {"describe": described, "message": "", "prompt": None, "failed": failed}
+        if failed:
+            # 오류 문자열이 커밋 메시지 프롬프트에 들어가지 않도록 mk_msg 생략 (run_all describe 단계와 같은 규칙)
+            log(f"[stream] 설명 생성 실패 {len(failed)}건 → mk_msg 생략: {', '.join(failed[:5])}",
+                level="ERROR", source="run_stream")
+        elif not described.empty:
+            ctx = context.result()
+            msg_prompt = await loop.run_in_executor(None, build_msg_prompt, described, ctx["diffs"])
+            result["prompt"] = msg_prompt
+            try:
+                result["message"] = (await self._timed_call(self.msg_llm, msg_prompt["prompt"], "mk_msg")).strip()
+            except Exception as e:
+                result["mk_msg_error"] = str(e)
+                log(f"[stream] mk_msg 실패: {e}", level="ERROR", source="run_stream")
+        self.stats["total_s"] = time.perf_counter() - self._start
+        return result
+
+    def run(self, changed: list[str] | None = None) -> dict:
+        if changed is None:
+            from listup import get_changed_files
+            changed = get_changed_files()
+        result = asyncio.run(self.run_async(changed))
+        result["files"] = list(changed)
+        self.store.put("describe", result["describe"])
+        if result["prompt"] is not None:
+            self.store.put("mk_msg", pd.DataFrame([{**result["prompt"], "message": result["message"]}]))
+        return result
+
+def format_stream_stats(stats: dict) -> str:
+    first = "-" if stats["first_llm_at"] is None else f"{stats['first_llm_at']:.2f}s"
+    return (
+        f"⏱️ 스트리밍 {stats['total_s']:.2f}s (scoping {stats['scoping_s']:.2f}s + LLM 누적 {stats['llm_s']:.2f}s)\n"
+        f"  📂 파일 {stats['files']} / 설명 {stats['described']} (재사용 {stats['reused']}, 실패 {stats['errors']})\n"
+        f"  🚀 첫 LLM 호출 {first}, 최대 큐 길이 {stats['max_queue']}"
+    )
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Comfort Commit 스트리밍 실행 (scoping과 LLM 호출 겹침)")
+    parser.add_argument("--run-id", default=None)
+    parser.add_argument("--queue-size", type=int, default=None, help="단계 사이 큐 크기 (기본 parallel calls × 2)")
+    parser.add_argument("--workers", type=int, default=None, help="describe 동시 호출 수 (기본 conf.json parallel calls)")
+    parser.add_argument("--request-uuid", default=None, help="커밋 생성 요청 id (기본: 실행마다 새로 발급)")
+    args = parser.parse_args(argv)
+
+    pipeline = StreamPipeline(get_store(args.run_id or get_timestamp()), args.queue_size, args.workers,
+                              request_uuid=args.request_uuid or str(uuid.uuid4()))
+    result = pipeline.run()
+    print(format_stream_stats(pipeline.stats))
+    if result["message"]:
+        print(f"\n📝 커밋 메시지\n{result['message']}")
+    return result
+
+if __name__ == "__main__":
+    # 예: python run_stream.py --queue-size 8
+    main()
@@ -3,6 +3,13 @@ import pandas as pd
 import tiktoken
 from extract_select_features import FeatureRegistry
 from conv_df import convert_to_group_df, load_debug_mode
+from extract_rel_fx import RelatedFunctionFinder
+from stage_log import ScopingLog
+
+try:
+    from embedding.semantic import get_semantic_index, load_semantic_conf
+except ImportError:  # 저장소 루트가 sys.path에 없을 때 → 의미 기반 단계 생략
+    get_semantic_index = load_semantic_conf = None
 
 def get_token_count_gpt4o(text: str) -> int:
     try:
@@ -29,11 +36,31 @@ def chunk_selected_fx(fx_list: list[str], split: int) -> list[list[str]]:
     chunked.append(fx_list[(split - 1) * size:])
     return chunked
 
-def clustering_main(df: pd.DataFrame, repo: str = "default") -> pd.DataFrame:
+def load_semantic_stage():
+    """
+    의미 기반 후보 단계 준비 (conf.json "semantic index" mode가 on일 때)
+    - 전체 코드 파일로 로컬 임베딩 인덱스 갱신 (변경 파일만 재인코딩)
+    - 반환: (인덱스, top k, min score) 또는 None
+    """
+    if get_semantic_index is None:
+        return None
+    conf = load_semantic_conf()
+    if conf.get("mode", "off").lower() != "on":
+        return None
+    index = get_semantic_index()
+    index.refresh(RelatedFunctionFinder().get_all_code_files(), prune=True)
+    return index, int(conf.get("top k", 3)), float(conf.get("min score", 0.35))
+
+def iter_clustering(rows, stage_log: ScopingLog, repo: str = "default"):
+    """
+    group_df 행(dict/Series)을 하나씩 받아 파일 1개 처리가 끝날 때마다 결과 행 yield
+    - 스트리밍 모드(run_stream.py)는 yield 즉시 describe로 넘김
+    - stage_log close는 호출 측 책임
+    """
     debug = load_debug_mode()
-    updated_rows = []
+    semantic = load_semantic_stage()
 
-    for i, row in df.iterrows():
+    for row in rows:
         file_path = Path(row["file"])
         fx_list: list[str] = row["functions"]
         rel_lists: list[list[str]] = row["relatives"]
@@ -61,56 +88,96 @@ def clustering_main(df: pd.DataFrame, repo: str = "default") -> pd.DataFrame:
 
         for fx, rels in zip(fx_list, rel_lists):
             rels = list(set(r for r in rels if Path(r).exists()))
+            for r in rels:
+                stage_log.record("INITIAL_CANDIDATES", file_path, fx, r, "SYMBOL_REFERENCE_SCAN", selected=True)
+            if semantic:
+                # 🔹 심볼 검색으로 못 찾은 의미상 이웃 파일을 후보에 추가
+                index, top_k, min_score = semantic
+                neighbors = index.neighbor_files(file_path, fx, k=top_k, min_score=min_score)
+                known = {Path(r).as_posix() for r in rels}
+                for p, sim in neighbors:
+                    if p not in known and Path(p).exists():
+                        rels.append(p)
+                        stage_log.record("INITIAL_CANDIDATES", file_path, fx, p, "EMBEDDING_NEIGHBOR", sim, selected=True)
+                if debug and neighbors:
+                    print(f"  🧭 {fx}() 의미상 이웃: {neighbors}")
             if not rels:
                 continue
+
+            rel_scores = [(r, *FeatureRegistry.extract_scored(file_path, Path(r), repo, use_execution=False)) for r in rels]
+            rel_scores.sort(key=lambda x: x[1], reverse=True)
             if len(rels) < 3:
-                rel_scores = [(r, FeatureRegistry.extract_weighted_score(file_path, Path(r), repo, use_execution=False)) for r in rels]
-                rel_scores.sort(key=lambda x: x[1], reverse=True)
-                selected_fx_group.append([r for r, _ in rel_scores])
+                final = [r for r, _, _ in rel_scores]
+                stage_log.record_ranking("STATIC_ANALYSIS_FILTER", file_path, fx, rel_scores, "WEIGHTED_STATIC_FEATURES",
+                                         set(final), "후보 3개 미만 → 전체 선택")
+                stage_log.record_ranking("FINAL_CONTEXT_SET", file_path, fx, rel_scores, "WEIGHTED_STATIC_FEATURES", set(final))
+                selected_fx_group.append(final)
                 continue
 
-            rel_scores = [(r, float(FeatureRegistry.extract_weighted_score(file_path, Path(r), repo, use_execution=False))) for r in rels]
-            rel_scores.sort(key=lambda x: x[1], reverse=True)
             top_rels = rel_scores[:5]
+            stage_log.record_ranking("STATIC_ANALYSIS_FILTER", file_path, fx, rel_scores, "WEIGHTED_STATIC_FEATURES",
+                                     {r for r, _, _ in top_rels}, "정적 점수 상위 5")
 
             if top_rels[0][1] == top_rels[1][1]:
-                selected_fx_group.append([r for r, _ in top_rels[:3]])
-                continue
-
-            diff = abs(top_rels[0][1] - top_rels[1][1])
-            relative = top_rels[0][1] if top_rels[0][1] != 0 else 1.0
-
-            # 🔥 기준을 낮게 설정해야 실행 기반 비교가 제한됨
-            if diff / relative < 0.1:  # 또는 단순히: if diff < 0.005:
-                rescored = [
-                    (r, float(FeatureRegistry.extract_weighted_score(file_path, Path(r), repo, use_execution=True)))
-                    for r, _ in top_rels
-                ]
-                rescored.sort(key=lambda x: x[1], reverse=True)
-                selected_fx_group.append([r for r, _ in rescored[:3]])
+                final_scores = top_rels[:3]
+                method = "WEIGHTED_STATIC_FEATURES"
             else:
-                selected_fx_group.append([r for r, _ in top_rels[:3]])
+                diff = abs(top_rels[0][1] - top_rels[1][1])
+                relative = top_rels[0][1] if top_rels[0][1] != 0 else 1.0
+
+                # 🔥 기준을 낮게 설정해야 실행 기반 비교가 제한됨
+                if diff / relative < 0.1:  # 또는 단순히: if diff < 0.005:
+                    rescored = [
+                        (r, *FeatureRegistry.extract_scored(file_path, Path(r), repo, use_execution=True))
+                        for r, _, _ in top_rels
+                    ]
+                    rescored.sort(key=lambda x: x[1], reverse=True)
+                    stage_log.record_ranking("EXECUTION_RERANK", file_path, fx, rescored, "WEIGHTED_ALL_FEATURES",
+                                             {r for r, _, _ in rescored[:3]}, "상위 1·2위 점수 차 10% 미만 → 실행 기반 재순위")
+                    final_scores = rescored[:3]
+                    method = "WEIGHTED_ALL_FEATURES"
+                else:
+                    final_scores = top_rels[:3]
+                    method = "WEIGHTED_STATIC_FEATURES"
+
+            final = [r for r, _, _ in final_scores]
+            stage_log.record_ranking("FINAL_CONTEXT_SET", file_path, fx, final_scores, method, set(final))
+            selected_fx_group.append(final)
 
         if not selected_fx_group:
             continue
 
         split_count = get_split_count(sum(len(r) for r in selected_fx_group))
         grouped_fx = chunk_selected_fx(selected_fx_group, split_count)
-        updated_rows.append({
+        yield {
             "file": str(file_path),
             "id": row.get("id", "N/A"),
             "selected_fx": selected_fx_group,
             "split_group": split_count,
             "fx_grouped": grouped_fx
-        })
-
-    return pd.DataFrame(updated_rows)
+        }
+
+def clustering_main(df: pd.DataFrame, repo: str = "default", run_uuid: str | None = None,
+                    request_uuid: str | None = None) -> pd.DataFrame:
+    """
+    함수별 참조 파일 후보 → 점수화 → 최종 선택
+    - 단계별 후보/점수/선택 결과는 ScopingLog로 기록 (DB/cache/scoping_results.db, run_uuid 단위)
+    - request_uuid: 커밋 생성 요청 id → train_weights가 finalized_commits 피드백과 연결할 때 사용
+    """
+    stage_log = ScopingLog(run_uuid, request_uuid, params={"repo": repo})
+    updated_rows = list(iter_clustering((row for _, row in df.iterrows()), stage_log, repo))
+    stage_log.close()
+    result = pd.DataFrame(updated_rows)
+    result.attrs["scoping_run_uuid"] = stage_log.run_uuid
+    return result
 
 
 if __name__ == "__main__":
+    from utils.path import get_repo_key  # stage_log import 시 저장소 루트가 경로에 추가됨
+
     df = convert_to_group_df()
     if not df.empty:
-        final_df = clustering_main(df)
+        final_df = clustering_main(df, get_repo_key())
         pd.set_option("display.max_columns", None)
         pd.set_option("display.wuuidth", 160)
         print(final_df)
\ No newline at end of file
@@ -1,5 +1,6 @@
-import yaml
 import id
+import sys
+import threading
 import pandas as pd
 from pathlib import Path
 import tiktoken
@@ -8,13 +9,19 @@ from listup import get_changed_files
 from import_flow import ImportAnalyzer
 from extract_rel_fx import RelatedFunctionFinder
 
+try:
+    from utils.config import config_version, get_user_config
+except ImportError:  # scoping/ 단독 실행 → 저장소 루트를 경로에 추가
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from utils.config import config_version, get_user_config
+
+try:
+    from prep.diff import attribute_changes
+except ImportError:  # 저장소 루트가 sys.path에 없을 때 → 파일 전체 함수 분석
+    attribute_changes = None
+
 def load_debug_mode() -> bool:
-    config_path = Path("config/user_config.yml")
-    if not config_path.exists():
-        return False
-    with config_path.open(encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
-    return cfg.get("debug mode", "off").lower() == "on"
+    return get_user_config().debug
 
 def get_token_count_gpt4o(file_path: Path) -> int:
     try:
@@ -24,16 +31,42 @@ def get_token_count_gpt4o(file_path: Path) -> int:
     except:
         return 0
 
-def convert_to_group_df() -> pd.DataFrame:
-    changed_files = get_changed_files()
+_analyzers: tuple | None = None
+_analyzers_key = None
+_analyzers_lock = threading.Lock()
+
+def get_analyzers() -> tuple[ImportAnalyzer, RelatedFunctionFinder]:
+    """
+    ImportAnalyzer / RelatedFunctionFinder 재사용 (상주 데몬에서 매 실행 재생성 방지)
+    - 설정이 다시 읽히면(config_version 변경) 다시 생성 (허용 확장자 등 설정을 생성 시점에 읽음)
+    """
+    global _analyzers, _analyzers_key
+    key = config_version()
+    with _analyzers_lock:
+        if _analyzers is None or key != _analyzers_key:
+            _analyzers = (ImportAnalyzer(), RelatedFunctionFinder())
+            _analyzers_key = key
+        return _analyzers
+
+def iter_group_records(changed_files: list[str] | None = None):
+    """
+    변경 파일 1개 분석이 끝날 때마다 group_df 행(dict) yield
+    - 스트리밍 모드(run_stream.py)는 다음 파일 분석과 LLM 호출을 겹쳐 실행
+    """
+    changed_files = get_changed_files() if changed_files is None else changed_files
     if not changed_files:
-        print("❌ 변경된 파일 없음")
-        return pd.DataFrame()
+        return
 
-    analyzer = ImportAnalyzer()
-    finder = RelatedFunctionFinder()
+    analyzer, finder = get_analyzers()
     debug = load_debug_mode()
-    all_records = []
+
+    # 🔹 git diff -U0 hunk → 변경된 함수만 역참조 탐색 대상으로
+    changes = {}
+    if attribute_changes is not None:
+        try:
+            changes = attribute_changes(paths=changed_files)
+        except Exception as e:
+            print(f"⚠️ diff 분석 실패 → 파일 전체 함수 분석: {e}")
 
     for file_path in changed_files:
         file = Path(file_path)
@@ -44,10 +77,13 @@ def convert_to_group_df() -> pd.DataFrame:
             continue
 
         imports = analyzer.analyze_file(file)
-        rel_map = finder.analyze_file(file)
+        touched = changes.get(file.as_posix(), {}).get("functions")
+        rel_map = finder.analyze_file(file, only=touched)
 
         if debug:
             print(f"\n📂 파일: {file}")
+            if touched is not None:
+                print(f"✂️ 변경 함수 {len(rel_map)}개만 분석: {', '.join(rel_map) or '(함수 밖 변경)'}")
             print("📎 import하고 있는 파일:")
             if imports:
                 for i in imports:
@@ -71,9 +107,14 @@ def convert_to_group_df() -> pd.DataFrame:
             "functions": list(rel_map.keys()),
             "relatives": list(rel_map.values())
         }
-        all_records.append(record)
+        yield record
 
-    return pd.DataFrame(all_records)
+def convert_to_group_df() -> pd.DataFrame:
+    changed_files = get_changed_files()
+    if not changed_files:
+        print("❌ 변경된 파일 없음")
+        return pd.DataFrame()
+    return pd.DataFrame(list(iter_group_records(changed_files)))
 
 if __name__ == "__main__":
     df = convert_to_group_df()
@@ -1,20 +1,24 @@
-import yaml
 import re
+import sys
 from pathlib import Path
 from typing import List, Dict
 
-USER_CONFIG_PATH = Path("config/user_config.yml")
+from repo_walker import get_walker, DEFAULT_IGNORED_DIRS
+
+try:
+    from utils.config import get_user_config
+except ImportError:  # scoping/ 단독 실행 → 저장소 루트를 경로에 추가
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from utils.config import get_user_config
 
 class RelatedFunctionFinder:
     def __init__(self, root: Path = Path(".")):
         self.root = root
         self.allowed_exts = self._load_allowed_extensions()
-        self.ignored_dirs = {".git", "__pycache__", "venv", ".mypy_cache", ".pytest_cache", "build", "dist", ".ipynb_checkpoints"}
+        self.ignored_dirs = DEFAULT_IGNORED_DIRS
 
     def _load_allowed_extensions(self) -> List[str]:
-        with USER_CONFIG_PATH.open(encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        return cfg.get("change detection", {}).get("provuuider", [".py"])
+        return list(get_user_config().allowed_extensions)
 
     def extract_function_names(self, file: Path) -> List[str]:
         if file.suffix == ".py":
@@ -31,16 +35,10 @@ class RelatedFunctionFinder:
             return []
 
     def get_all_code_files(self) -> List[Path]:
-        files = []
-        for f in self.root.rglob("*"):
-            if not f.is_file():
-                continue
-            if f.suffix not in self.allowed_exts:
-                continue
-            if any(part in self.ignored_dirs or part.startswith(".") for part in f.parts):
-                continue
-            files.append(f)
-        return files
+        """
+        허용 확장자 코드 파일 목록 (repo_walker: .gitignore + ignore patterns 적용, 실행 중 캐시)
+        """
+        return get_walker(self.root).files(self.allowed_exts)
 
     def find_files_using_symbol(self, symbol: str, files: List[Path], skip_file: Path) -> List[str]:
         """
@@ -59,9 +57,16 @@ class RelatedFunctionFinder:
                 continue
         return used_in
 
-    def analyze_file(self, file: Path) -> Dict[str, List[str]]:
+    def analyze_file(self, file: Path, only: List[str] | None = None) -> Dict[str, List[str]]:
+        """
+        함수별 역참조 파일 탐색
+        - only: 변경된 함수 이름 (prep/diff.py attribute_changes 결과), None이면 파일 전체 함수
+        """
         all_files = self.get_all_code_files()
         fx_names = [fx for fx in self.extract_function_names(file) if fx != "__init__"]
+        if only is not None:
+            touched = set(only)
+            fx_names = [fx for fx in fx_names if fx in touched]
         rel_map = {}
         for fx in fx_names:
             rel_map[fx] = self.find_files_using_symbol(fx, all_files, file)  # ✅ 인자 추가
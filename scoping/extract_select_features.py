@@ -113,7 +113,11 @@ class FeatureRegistry:
         with feature_path.open(encoding="utf-8") as ff:
             feature_meta = json.load(ff)
         feature_names = [f["name"] for f in feature_meta]
-        weights = weight_dict[repo]["weight"]
+        # 학습된 프로필이 없는 저장소는 default 사용 (train_weights.py --repo <이름>으로 생성)
+        weights = weight_dict.get(repo, weight_dict["default"])["weight"]
+        if isinstance(weights, dict):
+            # {"feature명": 가중치} 형식 → feature명 그대로 사용
+            return {name: float(w) for name, w in weights.items()}
         return dict(zip(feature_names, weights))
 
     @classmethod
@@ -124,6 +128,19 @@ class FeatureRegistry:
         repo: str = "default",
         use_execution: bool = True
     ) -> float:
+        return cls.extract_scored(file_a, file_b, repo, use_execution)[0]
+
+    @classmethod
+    def extract_scored(
+        cls,
+        file_a: Path,
+        file_b: Path,
+        repo: str = "default",
+        use_execution: bool = True
+    ) -> tuple[float, Dict[str, float]]:
+        """
+        가중합 점수 + feature별 원점수 (스코핑 기록 / 오프라인 가중치 재평가용)
+        """
         # extract_all은 내부에서 use_execution에 따라 static만 추출 가능해야 함
         features = cls.extract_all(file_a, file_b, use_execution=use_execution)
         weights = cls.load_weights(repo)
@@ -136,7 +153,7 @@ class FeatureRegistry:
                 total += score * weight
             except (ValueError, TypeError):
                 continue
-        return total
+        return total, features
 
     @classmethod
     def extract_static(cls, file_a: Path, file_b: Path) -> Dict[str, float]:
@@ -1,18 +1,18 @@
 # scoping/listup.py
 
+import sys
 import subprocess
-import yaml
 from pathlib import Path
 
+try:
+    from utils.config import get_user_config
+except ImportError:  # scoping/ 단독 실행 → 저장소 루트를 경로에 추가
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from utils.config import get_user_config
+
 def get_allowed_extensions() -> list[str]:
-    """user_config.yml에서 확장자 목록 로딩"""
-    config_path = Path("config/user_config.yml")
-    if not config_path.exists():
-        return [".py", ".sh", ".html", ".css", ".js", ".ts"]
-    
-    with config_path.open(encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
-    return cfg.get("change detection", {}).get("provuuider", [])
+    """user_config.yml에서 확장자 목록 로딩 (utils.config 캐시)"""
+    return list(get_user_config().allowed_extensions)
 
 def get_changed_files() -> list[str]:
     """
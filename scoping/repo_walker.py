@@ -0,0 +1,325 @@
+# scoping/repo_walker.py
+
+import os
+import re
+import sys
+import subprocess
+import threading
+from pathlib import Path
+
+import yaml
+
+try:
+    from utils.config import USER_CONFIG_PATH, config_version, get_user_config, thaw
+except ImportError:  # scoping/ 단독 실행 → 저장소 루트를 경로에 추가
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from utils.config import USER_CONFIG_PATH, config_version, get_user_config, thaw
+
+# 내려가기 전에 잘라내는 디렉터리 (이름 기준)
+DEFAULT_IGNORED_DIRS = {
+    ".git", "__pycache__", "venv", ".venv", "node_modules", ".mypy_cache", ".pytest_cache",
+    "build", "dist", ".ipynb_checkpoints", ".tox", ".idea", ".vscode",
+}
+
+# 🔹 gitignore 형식 패턴 → 정규식
+def _glob_to_regex(glob: str) -> str:
+    out, i = [], 0
+    while i < len(glob):
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if glob.startswith("/**", i) and i + 3 == len(glob):
+            out.append("/.*")
+            i += 3
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = glob.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:j].replace("\\", "\\\\")
+                out.append(f"[^{body[1:]}]" if body.startswith("!") else f"[{body}]")
+                i = j
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+def compile_pattern(line: str, base: str = "", kind: str = "glob") -> tuple[bool, bool, re.Pattern] | None:
+    """
+    패턴 1줄 → (negate, dir_only, regex)
+    - kind="glob": gitignore 규칙 (!부정, 끝 / 는 디렉터리 전용, 중간/앞 / 가 있으면 base 기준 고정)
+    - kind="regex": 저장소 루트 기준 경로에 그대로 적용
+    - base: .gitignore가 있는 디렉터리 (루트 기준, 끝 / 포함)
+    """
+    line = line.rstrip("\n")
+    if kind == "regex":
+        return (False, False, re.compile(line)) if line else None
+    if not line.strip() or line.startswith("#"):
+        return None
+    line = line.rstrip() if not line.endswith("\\ ") else line
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    body = _glob_to_regex(line.lstrip("/"))
+    prefix = re.escape(base) if anchored else re.escape(base) + "(?:.*/)?"
+    return negate, dir_only, re.compile(f"^{prefix}{body}$")
+
+class IgnoreMatcher:
+    """
+    컴파일된 ignore 규칙 묶음 (마지막으로 일치한 규칙이 결정, ! 부정 지원)
+    - 부정 규칙이 없으면 파일용/디렉터리용 정규식을 하나씩으로 합쳐 1회 검사
+    """
+
+    def __init__(self, rules: list[tuple[bool, bool, re.Pattern]] | None = None):
+        self.rules = list(rules or [])
+        self._combined = None
+        self._compile()
+
+    def _compile(self):
+        if any(neg for neg, _, _ in self.rules):
+            self._combined = None
+            return
+        files = [r.pattern for _, dir_only, r in self.rules if not dir_only]
+        dirs = [r.pattern for _, _, r in self.rules]
+        self._combined = (
+            re.compile("|".join(f"(?:{p})" for p in files)) if files else None,
+            re.compile("|".join(f"(?:{p})" for p in dirs)) if dirs else None,
+        )
+
+    def extend(self, rules: list[tuple[bool, bool, re.Pattern]]) -> "IgnoreMatcher":
+        return IgnoreMatcher(self.rules + [r for r in rules if r])
+
+    def ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        if not self.rules:
+            return False
+        if self._combined is not None:
+            regex = self._combined[1] if is_dir else self._combined[0]
+            return bool(regex and regex.match(rel_path))
+        for negate, dir_only, regex in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negate
+        return False
+
+def read_gitignore(path: Path, base: str = "") -> list:
+    try:
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return []
+    return [r for r in (compile_pattern(l, base) for l in lines) if r]
+
+# 🔹 analysis_ignore_patterns 규칙
+def load_ignore_rules(config_path: Path = USER_CONFIG_PATH) -> list[dict]:
+    """
+    user_config.yml의 change detection → ignore patterns
+    - 항목: "glob 문자열" 또는 {"pattern", "pattern_type"(glob|regex), "is_active"} (analysis_ignore_patterns 행과 같은 형태)
+    """
+    if Path(config_path) == USER_CONFIG_PATH:
+        raw = thaw(get_user_config().ignore_patterns)
+    else:
+        if not config_path.exists():
+            return []
+        with config_path.open(encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
+        raw = (cfg.get("change detection", {}) or {}).get("ignore patterns", []) or []
+    return [{"pattern": r, "pattern_type": "glob"} if isinstance(r, str) else r for r in raw]
+
+def load_db_ignore_rules(repo_id: str, dsn: str | None = None) -> list[dict]:
+    """analysis_ignore_patterns (저장소별 활성 규칙) 조회"""
+    import psycopg2
+    from snapshot.ingest import get_dsn
+
+    conn = psycopg2.connect(dsn or get_dsn())
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT pattern, pattern_type FROM analysis_ignore_patterns "
+                "WHERE repo_id = %s AND is_active ORDER BY created_at",
+                (repo_id,),
+            )
+            return [{"pattern": p, "pattern_type": (t or "glob").lower()} for p, t in cur.fetchall()]
+    finally:
+        conn.close()
+
+def compile_rules(rules: list[dict]) -> list:
+    compiled = []
+    for r in rules:
+        if r.get("is_active", True) is False:
+            continue
+        kind = "regex" if str(r.get("pattern_type", "glob")).lower() == "regex" else "glob"
+        c = compile_pattern(r["pattern"], "", kind)
+        if c:
+            compiled.append(c)
+    return compiled
+
+# 🔹 파일 나열
+def _git_ls_files(root: Path) -> list[str] | None:
+    """추적 파일 + .gitignore에 걸리지 않은 미추적 파일 (root 기준 상대 경로), git 저장소가 아니면 None"""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=root, capture_output=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [p for p in result.stdout.decode("utf-8", errors="replace").split("\0") if p]
+
+def _scandir_walk(root: Path, ignored_dirs: set[str], matcher: IgnoreMatcher):
+    """os.scandir 재귀: 무시 디렉터리는 내려가기 전에 제외, 디렉터리별 .gitignore 누적"""
+    stack = [("", matcher)]
+    while stack:
+        rel_dir, m = stack.pop()
+        gi = root / rel_dir / ".gitignore"
+        if gi.is_file():
+            m = m.extend(read_gitignore(gi, rel_dir))
+        try:
+            entries = os.scandir(root / rel_dir if rel_dir else root)
+        except OSError:
+            continue
+        with entries:
+            for e in entries:
+                name = e.name
+                if name.startswith("."):
+                    continue
+                rel = f"{rel_dir}{name}"
+                try:
+                    is_dir = e.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if name in ignored_dirs or m.ignored(rel, is_dir=True):
+                        continue
+                    stack.append((rel + "/", m))
+                elif not m.ignored(rel):
+                    yield rel
+
+class RepoWalker:
+    """
+    코드 파일 나열 (RelatedFunctionFinder.get_all_code_files 대체)
+    - git 저장소면 git ls-files -z (git이 .gitignore 처리), 아니면 os.scandir + .gitignore 직접 적용
+    - 숨김 경로 / DEFAULT_IGNORED_DIRS / analysis ignore 규칙은 두 경우 모두 적용
+    - 결과는 (root, 확장자, 규칙, 무효화 토큰) 단위로 캐시 → 한 실행 안에서 파일마다 다시 걷지 않음
+    - rules 미지정(user_config.yml 규칙)이면 config_version()이 바뀔 때 규칙/matcher 재구성 (상주 데몬에서 설정 변경 반영)
+    """
+
+    def __init__(self, root: Path = Path("."), ignored_dirs: set[str] | None = None, rules: list[dict] | None = None,
+                 use_git: bool = True):
+        self.root = Path(root)
+        self.ignored_dirs = set(ignored_dirs or DEFAULT_IGNORED_DIRS)
+        self._config_rules = rules is None
+        self._rules_version = config_version() if self._config_rules else None
+        self.rules = load_ignore_rules() if rules is None else rules
+        self.matcher = IgnoreMatcher(compile_rules(self.rules))
+        self.use_git = use_git
+        self._cache: dict[tuple, list[Path]] = {}
+        self._lock = threading.Lock()
+
+    def token(self) -> tuple:
+        """
+        무효화 토큰: git index / 루트 디렉터리 / .gitignore mtime
+        - 파일 추가·삭제·stage 시 바뀜 (파일 내용 수정은 목록에 영향 없음)
+        - 하위 디렉터리에 미추적 파일만 추가된 경우는 감지 못 함 → 한 실행 안에서만 유효,
+          실행 사이에 walker를 유지하는 프로세스(comfortd)는 실행마다 invalidate_walkers() 호출
+        """
+        stamps = []
+        for p in (self.root / ".git" / "index", self.root, self.root / ".gitignore", USER_CONFIG_PATH):
+            try:
+                stamps.append(p.stat().st_mtime_ns)
+            except OSError:
+                stamps.append(0)
+        return tuple(stamps)
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _refresh_rules(self):
+        """user_config.yml ignore patterns가 바뀌었으면 규칙/matcher 교체 + 목록 캐시 비움"""
+        if not self._config_rules:
+            return
+        version = config_version()
+        if version == self._rules_version:
+            return
+        rules = load_ignore_rules()
+        matcher = IgnoreMatcher(compile_rules(rules))
+        with self._lock:
+            self.rules, self.matcher, self._rules_version = rules, matcher, version
+            self._cache.clear()
+
+    def _keep(self, rel: str, exts: set[str] | None) -> bool:
+        if exts is not None and os.path.splitext(rel)[1] not in exts:
+            return False
+        parts = rel.split("/")
+        if any(p.startswith(".") or p in self.ignored_dirs for p in parts):
+            return False
+        if self.matcher.ignored(rel):
+            return False
+        # 디렉터리 규칙 (예: generated/) 은 상위 경로에 대해 검사
+        return not any(self.matcher.ignored("/".join(parts[:i]), is_dir=True) for i in range(1, len(parts)))
+
+    def files(self, exts: list[str] | None = None, token=None) -> list[Path]:
+        self._refresh_rules()
+        ext_set = set(exts) if exts is not None else None
+        key = (tuple(sorted(ext_set)) if ext_set is not None else None, token if token is not None else self.token())
+        with self._lock:
+            if key in self._cache:
+                return list(self._cache[key])
+
+        listed = _git_ls_files(self.root) if self.use_git else None
+        if listed is not None:
+            # 추적 중이지만 작업 트리에서 지운 파일 제외
+            result = [self.root / r for r in sorted(listed) if self._keep(r, ext_set) and (self.root / r).is_file()]
+        else:
+            result = [self.root / r for r in sorted(_scandir_walk(self.root, self.ignored_dirs, self.matcher))
+                      if ext_set is None or os.path.splitext(r)[1] in ext_set]
+
+        with self._lock:
+            self._cache = {key: result}  # 이전 토큰 결과는 버림
+        return list(result)
+
+_walkers: dict[str, RepoWalker] = {}
+_walkers_lock = threading.Lock()
+
+def get_walker(root: Path = Path(".")) -> RepoWalker:
+    key = str(Path(root).resolve())
+    with _walkers_lock:
+        if key not in _walkers:
+            _walkers[key] = RepoWalker(root)
+        return _walkers[key]
+
+def invalidate_walkers():
+    """모든 walker의 파일 목록 캐시 비움 (다음 files() 호출에서 다시 나열)"""
+    with _walkers_lock:
+        walkers = list(_walkers.values())
+    for w in walkers:
+        w.invalidate()
+
+if __name__ == "__main__":
+    # 예: python scoping/repo_walker.py  → 나열 시간 비교 (rglob vs walker)
+    import time
+    exts = [".py", ".sh", ".js", ".ts", ".html", ".css"]
+    t0 = time.perf_counter()
+    legacy = [f for f in Path(".").rglob("*") if f.is_file() and f.suffix in exts
+              and not any(p in DEFAULT_IGNORED_DIRS or p.startswith(".") for p in f.parts)]
+    t1 = time.perf_counter()
+    walker = get_walker()
+    found = walker.files(exts)
+    t2 = time.perf_counter()
+    walker.files(exts)
+    t3 = time.perf_counter()
+    print(f"rglob: {len(legacy)}개 {t1 - t0:.3f}s | walker: {len(found)}개 {t2 - t1:.3f}s | 캐시: {t3 - t2:.4f}s")
@@ -0,0 +1,253 @@
+# scoping/stage_log.py
+
+import io
+import csv
+import sys
+import json
+import uuid
+import sqlite3
+import datetime
+from pathlib import Path
+from contextlib import closing
+
+try:
+    from snapshot.ingest import get_dsn
+except ImportError:  # scoping/ 단독 실행 → 저장소 루트를 경로에 추가
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from snapshot.ingest import get_dsn
+
+DEFAULT_DB_PATH = Path("DB/cache/scoping_results.db")
+MODULE_QUALNAME = "<module>"
+
+# scoping_results.scoping_stage_name / scoping_stage_order
+STAGES = {
+    "INITIAL_CANDIDATES": 1,
+    "STATIC_ANALYSIS_FILTER": 2,
+    "EXECUTION_RERANK": 3,
+    "FINAL_CONTEXT_SET": 4,
+}
+
+COLUMNS = [
+    "run_uuid", "request_uuid", "created_at", "stage_name", "stage_order", "base_file", "base_fx",
+    "target_file", "method", "score", "rank", "selected", "reason", "features", "params",
+]
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scoping_results (
+            uuid INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_uuid TEXT NOT NULL,
+            request_uuid TEXT,
+            created_at TEXT NOT NULL,
+            stage_name TEXT NOT NULL,
+            stage_order INTEGER NOT NULL,
+            base_file TEXT NOT NULL,
+            base_fx TEXT,
+            target_file TEXT NOT NULL,
+            method TEXT NOT NULL,
+            score REAL,
+            rank INTEGER,
+            selected INTEGER NOT NULL DEFAULT 0,
+            reason TEXT,
+            features TEXT,
+            params TEXT
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS uuidx_sr_run_stage ON scoping_results(run_uuid, stage_order, rank)")
+    return conn
+
+class ScopingLog:
+    """
+    clustering_main 1회 실행의 단계별 스코핑 기록 (scoping_results 구조)
+    - record*(): 메모리 버퍼에 append만 → 점수 계산 루프에 I/O 없음
+    - batch_size 도달 시 / close() 시 SQLite에 executemany 1회로 flush
+    - STATIC_ANALYSIS_FILTER 행에는 feature별 원점수를 같이 저장 → weight.json 변경을 재실행 없이 재평가
+    """
+
+    def __init__(self, run_uuid: str | None = None, request_uuid: str | None = None,
+                 db_path: Path = DEFAULT_DB_PATH, batch_size: int = 500, params: dict | None = None):
+        self.run_uuid = run_uuid or str(uuid.uuid4())
+        self.request_uuid = request_uuid
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.params = params or {}
+        self._buffer: list[tuple] = []
+        self.flushed = 0
+
+    # 🔹 기록
+    def record(self, stage: str, base_file: str | Path, base_fx: str | None, target_file: str | Path, method: str,
+               score: float | None = None, rank: int | None = None, selected: bool = False,
+               reason: str | None = None, features: dict | None = None, params: dict | None = None):
+        self._buffer.append((
+            self.run_uuid, self.request_uuid, datetime.datetime.now().isoformat(), stage, STAGES[stage],
+            Path(base_file).as_posix(), base_fx, Path(target_file).as_posix(), method,
+            None if score is None else float(score), rank, int(bool(selected)), reason,
+            json.dumps(features) if features else None,
+            json.dumps({**self.params, **(params or {})}, ensure_ascii=False) if (self.params or params) else None,
+        ))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def record_ranking(self, stage: str, base_file, base_fx: str, scored: list[tuple], method: str,
+                       selected: set, reason: str | None = None, params: dict | None = None):
+        """scored: [(target, score, features)] 점수 내림차순 → rank 1부터 기록"""
+        for rank, (target, score, features) in enumerate(scored, start=1):
+            self.record(stage, base_file, base_fx, target, method, score, rank,
+                        target in selected, reason if target in selected else None, features, params)
+
+    # 🔹 flush
+    def flush(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        with closing(_connect(self.db_path)) as conn, conn:
+            conn.executemany(
+                f"INSERT INTO scoping_results ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows,
+            )
+        self.flushed += len(rows)
+
+    def close(self):
+        self.flush()
+
+# 🔹 조회 / 재현
+def _rows(query: str, args: tuple, db_path: Path) -> list[dict]:
+    with closing(_connect(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(query, args).fetchall()]
+
+def list_runs(limit: int = 20, db_path: Path = DEFAULT_DB_PATH) -> list[dict]:
+    return _rows(
+        "SELECT run_uuid, request_uuid, MIN(created_at) AS started_at, COUNT(*) AS entries, "
+        "COUNT(DISTINCT base_file) AS files FROM scoping_results GROUP BY run_uuid "
+        "ORDER BY started_at DESC LIMIT ?",
+        (limit,), db_path,
+    )
+
+def load_run(run_uuid: str, stage: str | None = None, db_path: Path = DEFAULT_DB_PATH) -> list[dict]:
+    query = "SELECT * FROM scoping_results WHERE run_uuid = ?"
+    args: tuple = (run_uuid,)
+    if stage:
+        query += " AND stage_name = ?"
+        args += (stage,)
+    rows = _rows(query + " ORDER BY stage_order, base_file, base_fx, rank", args, db_path)
+    for r in rows:
+        r["features"] = json.loads(r["features"]) if r["features"] else {}
+        r["params"] = json.loads(r["params"]) if r["params"] else {}
+        r["selected"] = bool(r["selected"])
+    return rows
+
+def final_sets(run_uuid: str, db_path: Path = DEFAULT_DB_PATH) -> dict[tuple[str, str], list[str]]:
+    """(base_file, base_fx) → 최종 선택 파일 목록 (rank 순)"""
+    result: dict[tuple[str, str], list[str]] = {}
+    for r in load_run(run_uuid, "FINAL_CONTEXT_SET", db_path):
+        result.setdefault((r["base_file"], r["base_fx"]), []).append(r["target_file"])
+    return result
+
+def replay(run_uuid: str, weights: dict[str, float], top_n: int = 3, db_path: Path = DEFAULT_DB_PATH) -> dict[tuple[str, str], list[str]]:
+    """
+    저장된 정적 feature로 weights를 적용해 선택 결과 재계산 (파일 I/O·실행 없음)
+    - 실행 기반 재순위 단계는 재현하지 않음 (정적 점수 기준 top_n)
+    """
+    groups: dict[tuple[str, str], list[tuple[str, float]]] = {}
+    for r in load_run(run_uuid, "STATIC_ANALYSIS_FILTER", db_path):
+        score = sum(float(v) * float(weights.get(name, 1.0)) for name, v in r["features"].items())
+        groups.setdefault((r["base_file"], r["base_fx"]), []).append((r["target_file"], score))
+    return {
+        key: [t for t, _ in sorted(scored, key=lambda x: x[1], reverse=True)[:top_n]]
+        for key, scored in groups.items()
+    }
+
+def compare(a: dict[tuple[str, str], list[str]], b: dict[tuple[str, str], list[str]]) -> dict:
+    """두 선택 결과(final_sets / replay 반환값) 비교 → 그룹별 Jaccard 평균, 완전 일치 비율"""
+    keys = a.keys() | b.keys()
+    if not keys:
+        return {"groups": 0, "mean_jaccard": 0.0, "exact_match": 0.0, "changed": []}
+    jaccards, changed = [], []
+    for key in sorted(keys):
+        sa, sb = set(a.get(key, [])), set(b.get(key, []))
+        j = len(sa & sb) / len(sa | sb) if sa | sb else 1.0
+        jaccards.append(j)
+        if sa != sb:
+            changed.append({"file": key[0], "fx": key[1], "a": a.get(key, []), "b": b.get(key, [])})
+    return {
+        "groups": len(keys),
+        "mean_jaccard": round(sum(jaccards) / len(jaccards), 4),
+        "exact_match": round(sum(1 for j in jaccards if j == 1.0) / len(jaccards), 4),
+        "changed": changed,
+    }
+
+def evaluate_weights(weights: dict[str, float], run_uuids: list[str] | None = None, top_n: int = 3,
+                     db_path: Path = DEFAULT_DB_PATH) -> dict:
+    """과거 실행들의 최종 선택과 weights 재현 결과 비교 (run별 + 전체 평균)"""
+    run_uuids = run_uuids or [r["run_uuid"] for r in list_runs(limit=100, db_path=db_path)]
+    per_run = {rid: compare(final_sets(rid, db_path), replay(rid, weights, top_n, db_path)) for rid in run_uuids}
+    scored = [r for r in per_run.values() if r["groups"]]
+    return {
+        "runs": len(scored),
+        "mean_jaccard": round(sum(r["mean_jaccard"] for r in scored) / len(scored), 4) if scored else 0.0,
+        "per_run": {rid: {k: v for k, v in r.items() if k != "changed"} for rid, r in per_run.items()},
+    }
+
+# 🔹 PostgreSQL scoping_results 적재
+def copy_to_postgres(run_uuid: str, request_uuid: str, resolved: dict[str, str], dsn: str | None = None,
+                     db_path: Path = DEFAULT_DB_PATH) -> int:
+    """
+    로컬 기록 → scoping_results COPY
+    - resolved: {"파일::qualname": element_instance_id} (SnapshotIngestor.ingest 결과의 "resolved")
+    - 대상은 파일 MODULE 요소, 기준은 변경 함수 요소 (없으면 파일 MODULE)
+    - (단계, 대상, 방법)이 겹치면 최고 점수 행만 남김 (uq_scoping_result_run_stage_target)
+    """
+    import psycopg2
+
+    best: dict[tuple, dict] = {}
+    for r in load_run(run_uuid, db_path=db_path):
+        target = resolved.get(f"{r['target_file']}::{MODULE_QUALNAME}")
+        if target is None:
+            continue
+        key = (r["stage_name"], target, r["method"])
+        if key not in best or (r["score"] or 0) > (best[key]["score"] or 0):
+            best[key] = {**r, "target_id": target}
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for (stage, target, method), r in best.items():
+        base = resolved.get(f"{r['base_file']}::{r['base_fx']}") or resolved.get(f"{r['base_file']}::{MODULE_QUALNAME}")
+        writer.writerow([
+            request_uuid, run_uuid, stage, r["stage_order"], target, base or "", method,
+            "" if r["score"] is None else r["score"], "" if r["rank"] is None else r["rank"],
+            r["selected"], r["reason"] or "",
+            json.dumps({**r["params"], "base_fx": r["base_fx"], "features": r["features"]}, ensure_ascii=False),
+            r["created_at"],
+        ])
+    buf.seek(0)
+
+    conn = psycopg2.connect(dsn or get_dsn())
+    try:
+        with conn, conn.cursor() as cur:
+            cur.copy_expert(
+                "COPY scoping_results (request_uuid, scoping_run_uuid, scoping_stage_name, scoping_stage_order, "
+                "target_element_instance_id, base_element_instance_id, scoping_method, score, rank_within_stage, "
+                "is_selected_for_next_stage, selection_reason, scoping_parameters, scoping_timestamp) "
+                "FROM STDIN WITH (FORMAT csv, NULL '')",
+                buf,
+            )
+    finally:
+        conn.close()
+    return len(best)
+
+if __name__ == "__main__":
+    # 예: python scoping/stage_log.py  → 최근 실행 목록 + 현재 weight.json 재평가
+    from extract_select_features import FeatureRegistry
+
+    runs = list_runs()
+    for r in runs:
+        print(f"{r['started_at']}  {r['run_uuid']}  files={r['files']}  entries={r['entries']}")
+    if runs:
+        from utils.path import get_repo_key
+
+        repo = sys.argv[1] if len(sys.argv) > 1 else get_repo_key()
+        report = evaluate_weights(FeatureRegistry.load_weights(repo))
+        print(f"\n📊 weight.json[{repo}] 재현율: runs={report['runs']} mean_jaccard={report['mean_jaccard']}")
@@ -0,0 +1,234 @@
+# scoping/train_weights.py
+
+import sys
+import json
+import argparse
+import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from snapshot.ingest import get_dsn
+except ImportError:  # scoping/ 단독 실행 → 저장소 루트를 경로에 추가
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from snapshot.ingest import get_dsn
+
+from stage_log import DEFAULT_DB_PATH, list_runs, load_run
+from extract_select_features import FeatureRegistry
+
+WEIGHT_PATH = Path("scoping/weight.json")
+TIE_RATIO = 0.1   # clustering_main: 상위 1·2위 차이가 10% 미만이면 실행 기반 재순위
+
+# 🔹 학습 데이터
+def collect_groups(repo: str, run_uuids: list[str] | None = None, db_path: Path = DEFAULT_DB_PATH) -> list[dict]:
+    """
+    로컬 스코핑 기록 → (run, 파일, 함수) 그룹별 정적 feature 행렬
+    - 반환: [{"run_uuid", "request_uuid", "file", "fx", "targets", "features": [dict], "rerank": [파일] | None}]
+    """
+    run_uuids = run_uuids or [r["run_uuid"] for r in list_runs(limit=10000, db_path=db_path)]
+    groups = []
+    for rid in run_uuids:
+        rows = load_run(rid, db_path=db_path)
+        if not rows or rows[0]["params"].get("repo", "default") != repo:
+            continue
+        by_key: dict[tuple, dict] = {}
+        for r in rows:
+            key = (r["base_file"], r["base_fx"])
+            g = by_key.setdefault(key, {
+                "run_uuid": rid, "request_uuid": r["request_uuid"], "file": key[0], "fx": key[1],
+                "targets": [], "features": [], "rerank": None,
+            })
+            if r["stage_name"] == "STATIC_ANALYSIS_FILTER":
+                g["targets"].append(r["target_file"])
+                g["features"].append(r["features"])
+            elif r["stage_name"] == "EXECUTION_RERANK" and r["selected"]:
+                g["rerank"] = (g["rerank"] or []) + [r["target_file"]]
+        groups.extend(g for g in by_key.values() if len(g["targets"]) >= 2)
+    return groups
+
+def fetch_feedback(request_uuids: list[str], dsn: str | None = None) -> dict[str, dict]:
+    """
+    finalized_commits / user_feedback_log → 요청별 사용자 반응
+    - message: 최종 확정 메시지, edited: 초안 수정 여부
+    - score: 커밋 검토 화면(page_context에 request uuid 포함)에서 남긴 만족도 1~10
+    """
+    import psycopg2
+
+    if not request_uuids:
+        return {}
+    conn = psycopg2.connect(dsn or get_dsn())
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT fc.request_uuid::text, fc.final_commit_message_full, fc.was_edited_from_generated,
+                       (SELECT AVG(fb.score) FROM user_feedback_log fb
+                        WHERE fb.page_context LIKE '%%' || fc.request_uuid::text || '%%')
+                FROM finalized_commits fc
+                WHERE fc.request_uuid::text = ANY(%s)
+                """,
+                (request_uuids,),
+            )
+            return {
+                rid: {"message": msg or "", "edited": bool(edited), "score": float(score) if score is not None else None}
+                for rid, msg, edited, score in cur.fetchall()
+            }
+    finally:
+        conn.close()
+
+def label_groups(groups: list[dict], feedback: dict[str, dict]) -> list[dict]:
+    """
+    그룹별 정답(positives)과 가중치 부여
+    1) 사용자 확정 메시지가 있으면: 메시지에 파일 경로/이름이 등장한 후보 = 정답
+       (수정 없이 승인된 경우는 최종 선택 그대로 정답으로 간주)
+    2) 실행 기반 재순위가 돌았던 그룹: 재순위 상위 = 정답 (느린 경로를 정적 가중치로 흉내내도록)
+    """
+    labeled = []
+    for g in groups:
+        fb = feedback.get(g["request_uuid"] or "")
+        positives, weight = set(), 1.0
+        if fb:
+            msg = fb["message"].lower()
+            positives = {t for t in g["targets"] if t.lower() in msg or Path(t).stem.lower() in msg}
+            if not positives and not fb["edited"] and g["rerank"]:
+                positives = set(g["rerank"])
+            if fb["score"] is not None:
+                weight = max(fb["score"], 1.0) / 10.0
+        elif g["rerank"]:
+            positives = set(g["rerank"])
+        if positives and len(positives) < len(g["targets"]):
+            labeled.append({**g, "positives": positives, "weight": weight})
+    return labeled
+
+def to_matrix(groups: list[dict]) -> tuple[list[str], list[np.ndarray]]:
+    names = sorted({n for g in groups for f in g["features"] for n in f})
+    mats = [np.array([[float(f.get(n, 0.0)) for n in names] for f in g["features"]], dtype=np.float64) for g in groups]
+    return names, mats
+
+# 🔹 학습 (NumPy)
+def fit_pairwise(groups: list[dict], mats: list[np.ndarray], l2: float = 1e-3, lr: float = 0.5, epochs: int = 300) -> np.ndarray:
+    """RankNet식 pairwise logistic loss: 정답 후보 점수 > 오답 후보 점수, 가중치는 0 이상으로 투영"""
+    diffs, weights = [], []
+    for g, x in zip(groups, mats):
+        pos = [i for i, t in enumerate(g["targets"]) if t in g["positives"]]
+        neg = [i for i, t in enumerate(g["targets"]) if t not in g["positives"]]
+        for i in pos:
+            for j in neg:
+                diffs.append(x[i] - x[j])
+                weights.append(g["weight"])
+    d = np.array(diffs)
+    sw = np.array(weights) / np.sum(weights)
+    w = np.ones(d.shape[1])
+    for _ in range(epochs):
+        margin = d @ w
+        grad = -(d * (sw / (1.0 + np.exp(margin)))[:, None]).sum(axis=0) + l2 * w
+        w = np.maximum(w - lr * grad, 0.0)
+    return w
+
+def fit_logistic(groups: list[dict], mats: list[np.ndarray], l2: float = 1e-3, lr: float = 0.5, epochs: int = 300) -> np.ndarray:
+    """후보 단위 logistic regression (정답=1), bias는 순위에 영향 없으므로 버림"""
+    x = np.vstack(mats)
+    y = np.concatenate([[1.0 if t in g["positives"] else 0.0 for t in g["targets"]] for g in groups])
+    sw = np.concatenate([[g["weight"]] * len(g["targets"]) for g in groups])
+    sw = sw / sw.sum()
+    xb = np.hstack([x, np.ones((len(x), 1))])
+    w = np.zeros(xb.shape[1])
+    for _ in range(epochs):
+        p = 1.0 / (1.0 + np.exp(-(xb @ w)))
+        grad = xb.T @ ((p - y) * sw) + l2 * np.r_[w[:-1], 0.0]
+        w = w - lr * grad
+        w[:-1] = np.maximum(w[:-1], 0.0)
+    return w[:-1]
+
+# 🔹 평가
+def evaluate(groups: list[dict], mats: list[np.ndarray], w: np.ndarray) -> dict:
+    """pairwise 정확도 / top-3 적중률 / 실행 기반 재순위 발생률 (후보 3개 이상 그룹 중 1·2위 차 10% 미만)"""
+    correct = total = hits = fallback = multi = 0
+    for g, x in zip(groups, mats):
+        s = x @ w
+        pos = [i for i, t in enumerate(g["targets"]) if t in g.get("positives", ())]
+        neg = [i for i in range(len(s)) if i not in pos]
+        for i in pos:
+            for j in neg:
+                correct += s[i] > s[j]
+                total += 1
+        order = np.argsort(-s)
+        hits += bool(set(order[:3]) & set(pos)) if pos else 0
+        if len(s) >= 3:
+            multi += 1
+            top1, top2 = s[order[0]], s[order[1]]
+            relative = top1 if top1 != 0 else 1.0
+            fallback += top1 == top2 or abs(top1 - top2) / abs(relative) < TIE_RATIO
+    return {
+        "pairwise_acc": round(float(correct) / total, 4) if total else 0.0,
+        "top3_hit": round(float(hits) / len(groups), 4) if groups else 0.0,
+        "fallback_rate": round(float(fallback) / multi, 4) if multi else 0.0,
+    }
+
+def write_profile(repo: str, weights: dict[str, float], meta: dict, path: Path = WEIGHT_PATH):
+    """weight.json[repo] 갱신 (학습하지 않은 feature(실행 기반 등)는 기존 값 유지)"""
+    data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    base = dict(data.get(repo, data.get("default", {})).get("weight", {}))
+    base.update({k: round(v, 4) for k, v in weights.items()})
+    data[repo] = {"weight": base, "trained": meta}
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+def train(repo: str = "default", method: str = "pairwise", use_db: bool = True, dsn: str | None = None,
+          db_path: Path = DEFAULT_DB_PATH, dry_run: bool = False) -> dict:
+    groups = collect_groups(repo, db_path=db_path)
+    feedback = {}
+    if use_db:
+        try:
+            import psycopg2
+        except ImportError:
+            print("⚠️ psycopg2 없음 → 실행 기반 재순위 결과만 사용")
+        else:
+            try:
+                feedback = fetch_feedback(sorted({g["request_uuid"] for g in groups if g["request_uuid"]}), dsn)
+            except psycopg2.Error as e:
+                print(f"⚠️ 피드백 조회 실패 → 실행 기반 재순위 결과만 사용: {e}")
+    labeled = label_groups(groups, feedback)
+    if not labeled:
+        return {"repo": repo, "groups": len(groups), "labeled": 0, "written": False}
+
+    names, mats = to_matrix(labeled)
+    try:
+        current = FeatureRegistry.load_weights(repo)
+    except KeyError:
+        current = FeatureRegistry.load_weights()
+    w_before = np.array([float(current.get(n, 1.0)) for n in names])
+    w = (fit_pairwise if method == "pairwise" else fit_logistic)(labeled, mats)
+
+    # 기존 프로필과 같은 L1 크기로 맞춤 (순위·동점 비율은 스케일과 무관)
+    if w.sum() > 0:
+        w = w * (w_before.sum() / w.sum())
+
+    before, after = evaluate(labeled, mats, w_before), evaluate(labeled, mats, w)
+    meta = {
+        "at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "method": method,
+        "groups": len(labeled),
+        "feedback_requests": len(feedback),
+        "before": before,
+        "after": after,
+    }
+    written = not dry_run and after["pairwise_acc"] >= before["pairwise_acc"]
+    if written:
+        write_profile(repo, dict(zip(names, w.tolist())), meta)
+    return {"repo": repo, "groups": len(groups), "labeled": len(labeled), "weights": dict(zip(names, np.round(w, 4).tolist())),
+            **meta, "written": written}
+
+if __name__ == "__main__":
+    # 예: python scoping/train_weights.py --repo comfort-commit --method pairwise
+    from utils.path import get_repo_key
+
+    parser = argparse.ArgumentParser(description="스코핑 기록 + 사용자 확정 결과로 weight.json 프로필 학습")
+    parser.add_argument("--repo", default=get_repo_key(), help="weight.json 프로필 이름 (기본: 현재 저장소)")
+    parser.add_argument("--method", choices=["pairwise", "logistic"], default="pairwise")
+    parser.add_argument("--no-db", action="store_true", help="finalized_commits 조회 없이 로컬 기록만 사용")
+    parser.add_argument("--dry-run", action="store_true", help="weight.json에 쓰지 않고 결과만 출력")
+    args = parser.parse_args()
+
+    result = train(args.repo, args.method, use_db=not args.no_db, dry_run=args.dry_run)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
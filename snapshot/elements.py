@@ -0,0 +1,137 @@
+# snapshot/elements.py
+
+import os
+import ast
+import hashlib
+from pathlib import Path
+
+# 확장자 → file_detected_language_enum
+LANGUAGE_BY_EXT = {
+    ".py": "python", ".js": "javascript", ".ts": "typescript", ".java": "java", ".go": "go",
+    ".cs": "csharp", ".cpp": "cpp", ".cc": "cpp", ".h": "cpp", ".rb": "ruby", ".php": "php",
+    ".swift": "swift", ".kt": "kotlin", ".rs": "rust", ".html": "html", ".css": "css",
+    ".scss": "scss", ".sql": "sql", ".sh": "shell", ".ps1": "powershell", ".tf": "terraform",
+    ".yml": "yaml", ".yaml": "yaml", ".json": "json", ".xml": "xml", ".md": "markdown",
+    ".txt": "text",
+}
+
+SNIPPET_MAX_CHARS = 4000
+
+# def/class를 품을 수 있는 제어문 블록 (if TYPE_CHECKING / try-import / 분기별 정의) → 같은 scope로 내려감
+_BLOCK_NODES = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try, ast.ExceptHandler,
+                ast.Match, ast.match_case) + ((ast.TryStar,) if hasattr(ast, "TryStar") else ())
+
+def sha256_hex(data: bytes | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def detect_language(path: Path) -> str:
+    if path.name == "Dockerfile":
+        return "dockerfile"
+    return LANGUAGE_BY_EXT.get(path.suffix.lower(), "unknown_language")
+
+def _is_binary(raw: bytes) -> bool:
+    return b"\0" in raw[:8192]
+
+def _signature(node: ast.AST) -> str:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        sig = f"({ast.unparse(node.args)})"
+        return sig + (f" -> {ast.unparse(node.returns)}" if node.returns else "")
+    if isinstance(node, ast.ClassDef) and node.bases:
+        return f"({', '.join(ast.unparse(b) for b in node.bases)})"
+    return ""
+
+def parse_python_elements(text: str, strict: bool = False) -> list[dict]:
+    """
+    ast 기반 Python 코드 요소 추출 (CLASS / FUNCTION / METHOD, 중첩 포함)
+    - qualname: Outer.inner 형식 (element_uuidentifier의 파일 내 부분)
+      같은 이름이 반복되면(property getter/setter, if/else 분기의 같은 def) 두 번째부터 #2, #3 … 접미사
+    - start/end line은 데코레이터 포함 1-based
+    - 문법 오류 파일은 빈 리스트 (strict=True면 SyntaxError 전파 → "함수 없음"과 구분할 때)
+    """
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        if strict:
+            raise
+        return []
+
+    lines = text.splitlines(keepends=True)
+    elements = []
+    counts: dict[str, int] = {}
+
+    def visit(node: ast.AST, prefix: str, in_class: bool):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                is_class = isinstance(child, ast.ClassDef)
+                if is_class:
+                    element_type = "CLASS"
+                elif in_class:
+                    element_type = "CONSTRUCTOR" if child.name == "__init__" else "METHOD"
+                else:
+                    element_type = "FUNCTION"
+
+                start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                end = child.end_lineno or child.lineno
+                source = "".join(lines[start - 1:end])
+                qualname = f"{prefix}{child.name}"
+                counts[qualname] = counts.get(qualname, 0) + 1
+                if counts[qualname] > 1:
+                    qualname = f"{qualname}#{counts[qualname]}"
+                elements.append({
+                    "qualname": qualname,
+                    "name": child.name,
+                    "element_type": element_type,
+                    "start_line": start,
+                    "end_line": end,
+                    "signature": _signature(child),
+                    "checksum": sha256_hex(source),
+                    "snippet": source[:SNIPPET_MAX_CHARS],
+                })
+                visit(child, f"{qualname}.", is_class)
+            elif isinstance(child, _BLOCK_NODES):
+                visit(child, prefix, in_class)
+
+    visit(tree, "", False)
+    return elements
+
+def build_file_record(path: Path, root: Path = Path(".")) -> dict:
+    """
+    파일 1개의 스냅샷 레코드 (snapshot_file_instances + 코드 요소)
+    - 삭제된 파일은 deleted=True 레코드
+    """
+    rel = path.resolve().relative_to(root.resolve()).as_posix() if path.is_absolute() else path.as_posix()
+    full = root / rel
+    if not full.exists():
+        return {"path": rel, "deleted": True, "elements": []}
+
+    raw = full.read_bytes()
+    binary = _is_binary(raw)
+    text = "" if binary else raw.decode("utf-8", errors="ignore")
+    language = "binary" if binary else detect_language(full)
+    elements = parse_python_elements(text) if language == "python" else []
+
+    # 파일 전체를 MODULE 요소로 추가 → 파일 단위 관계(DEPENDS_ON_FILE 등)의 끝점
+    line_count = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+    module = {
+        "qualname": "<module>",
+        "name": full.stem,
+        "element_type": "MODULE",
+        "start_line": 1,
+        "end_line": max(line_count, 1),
+        "signature": "",
+        "checksum": sha256_hex(raw),
+        "snippet": "",
+    }
+    return {
+        "path": rel,
+        "deleted": False,
+        "content_hash": sha256_hex(raw),
+        "size": len(raw),
+        "loc": sum(1 for line in text.splitlines() if line.strip()),
+        "language": language,
+        "is_binary": binary,
+        "mode": "100755" if os.access(full, os.X_OK) else "100644",
+        "elements": [module] + elements,
+    }
@@ -0,0 +1,263 @@
+# snapshot/merkle.py
+
+import json
+import zlib
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+DEFAULT_DB_PATH = Path("DB/cache/snapshot_objects.db")
+TREE_CACHE_SIZE = 4096
+
+BLOB, TREE = "blob", "tree"
+
+def blob_hash(data: bytes) -> str:
+    return hashlib.sha256(b"blob\0" + data).hexdigest()
+
+def tree_hash(entries: dict[str, tuple[str, str, str]]) -> str:
+    """entries: {이름: (kind, hash, mode)} → 이름 순 정렬 직렬화의 sha256"""
+    raw = json.dumps(sorted((name, *entry) for name, entry in entries.items()), separators=(",", ":"))
+    return hashlib.sha256(b"tree\0" + raw.encode("utf-8")).hexdigest()
+
+EMPTY_TREE = tree_hash({})
+
+class MerkleStore:
+    """
+    git tree 방식의 content-addressed 스냅샷 저장소 (SQLite)
+    - blobs: 파일 내용 (hash → zlib 압축 내용), 같은 내용은 스냅샷 간 1회만 저장
+    - trees: 디렉토리 (hash → 하위 항목 목록), 변경 없는 하위 트리는 스냅샷 간 공유
+    - snapshots: 스냅샷 id(커밋 해시) → root tree hash
+    - create_snapshot()은 변경 경로가 지나는 트리만 새로 만듦 → O(변경 경로 × 깊이)
+    - diff()는 하위 트리 hash가 같으면 내려가지 않음
+    """
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, store_content: bool = True):
+        self.db_path = Path(db_path)
+        self.store_content = store_content
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()  # create_snapshot → _apply → get_tree 재진입
+        self._trees: OrderedDict[str, dict] = OrderedDict()
+        self._init_db()
+
+    def _init_db(self):
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER NOT NULL, content BLOB)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS trees (hash TEXT PRIMARY KEY, entries TEXT NOT NULL)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    snapshot_id TEXT PRIMARY KEY,
+                    root_hash TEXT NOT NULL,
+                    parent_id TEXT,
+                    created_at REAL NOT NULL
+                )""")
+            self._conn.execute("INSERT OR IGNORE INTO trees (hash, entries) VALUES (?, ?)", (EMPTY_TREE, "{}"))
+
+    def close(self):
+        self._conn.close()
+
+    # 🔹 객체 조회
+    def get_tree(self, hash_: str) -> dict[str, tuple[str, str, str]]:
+        """tree 항목 {이름: (kind, hash, mode)}, 불변 객체이므로 LRU 캐시 (OrderedDict 갱신은 lock 안에서)"""
+        with self._lock:
+            cached = self._trees.get(hash_)
+            if cached is not None:
+                self._trees.move_to_end(hash_)
+                return cached
+            row = self._conn.execute("SELECT entries FROM trees WHERE hash = ?", (hash_,)).fetchone()
+            if row is None:
+                raise KeyError(f"tree 없음: {hash_}")
+            entries = {name: tuple(entry) for name, entry in json.loads(row[0]).items()}
+            self._trees[hash_] = entries
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+            return entries
+
+    def read_blob(self, hash_: str) -> bytes | None:
+        row = self._conn.execute("SELECT content FROM blobs WHERE hash = ?", (hash_,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return zlib.decompress(row[0])
+
+    def root_of(self, snapshot_id: str) -> str:
+        row = self._conn.execute("SELECT root_hash FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"스냅샷 없음: {snapshot_id}")
+        return row[0]
+
+    def resolve(self, snapshot_id: str, path: str) -> tuple[str, str, str] | None:
+        """경로 → (kind, hash, mode), 없으면 None"""
+        entry = (TREE, self.root_of(snapshot_id), "040000")
+        for part in filter(None, path.split("/")):
+            if entry[0] != TREE:
+                return None
+            entry = self.get_tree(entry[1]).get(part)
+            if entry is None:
+                return None
+        return entry
+
+    def walk(self, snapshot_id: str, prefix: str = ""):
+        """(경로, blob hash, mode) 순회"""
+        entry = self.resolve(snapshot_id, prefix)
+        if entry is None:
+            return
+        if entry[0] == BLOB:
+            yield prefix, entry[1], entry[2]
+            return
+        stack = [(prefix.strip("/"), entry[1])]
+        while stack:
+            base, h = stack.pop()
+            for name, (kind, child, mode) in sorted(self.get_tree(h).items(), reverse=True):
+                path = f"{base}/{name}" if base else name
+                if kind == TREE:
+                    stack.append((path, child))
+                else:
+                    yield path, child, mode
+
+    # 🔹 스냅샷 생성
+    def _apply(self, hash_: str | None, changes: dict, new_trees: dict) -> str | None:
+        """
+        tree hash_에 changes({경로 조각 tuple: (kind, hash, mode) | None})를 적용한 새 tree hash
+        - 빈 디렉토리는 None (부모에서 항목 제거)
+        """
+        entries = dict(self.get_tree(hash_)) if hash_ else {}
+        grouped: dict[str, dict] = {}
+        for parts, value in changes.items():
+            if len(parts) == 1:
+                if value is None:
+                    entries.pop(parts[0], None)
+                else:
+                    entries[parts[0]] = value
+            else:
+                grouped.setdefault(parts[0], {})[parts[1:]] = value
+
+        for name, sub_changes in grouped.items():
+            current = entries.get(name)
+            sub_hash = current[1] if current and current[0] == TREE else None
+            new_sub = self._apply(sub_hash, sub_changes, new_trees)
+            if new_sub is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = (TREE, new_sub, "040000")
+
+        if not entries:
+            return None
+        h = tree_hash(entries)
+        if h != hash_:
+            new_trees[h] = entries
+        return h
+
+    def create_snapshot(
+        self,
+        snapshot_id: str,
+        changes: dict[str, bytes | tuple[bytes, str] | None],
+        base: str | None = None,
+    ) -> dict:
+        """
+        base 스냅샷에 변경 경로만 적용해 새 스냅샷 생성
+        - changes: {경로: 내용 bytes | (내용, mode) | None(삭제)}
+        - base=None이면 빈 트리에서 시작 (첫 스냅샷은 전체 파일을 changes로 전달)
+        - 반환: {"snapshot_id", "root_hash", "new_trees", "new_blobs"}
+        """
+        blob_rows, tree_changes = {}, {}
+        for path, value in changes.items():
+            parts = tuple(filter(None, path.split("/")))
+            if value is None:
+                tree_changes[parts] = None
+                continue
+            data, mode = value if isinstance(value, tuple) else (value, "100644")
+            h = blob_hash(data)
+            blob_rows[h] = data
+            tree_changes[parts] = (BLOB, h, mode)
+
+        with self._lock:
+            base_root = self.root_of(base) if base else None
+            new_trees: dict[str, dict] = {}
+            root = self._apply(base_root, tree_changes, new_trees) if tree_changes else base_root
+            root = root or EMPTY_TREE
+
+            with self._conn:
+                cur = self._conn.executemany(
+                    "INSERT OR IGNORE INTO blobs (hash, size, content) VALUES (?, ?, ?)",
+                    [(h, len(d), zlib.compress(d) if self.store_content else None) for h, d in blob_rows.items()],
+                )
+                new_blobs = cur.rowcount if blob_rows else 0
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO trees (hash, entries) VALUES (?, ?)",
+                    [(h, json.dumps(e, separators=(",", ":"))) for h, e in new_trees.items()],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (snapshot_id, root_hash, parent_id, created_at) VALUES (?, ?, ?, ?)",
+                    (snapshot_id, root, base, time.time()),
+                )
+            for h, e in new_trees.items():
+                self._trees[h] = e
+            while len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+
+        return {"snapshot_id": snapshot_id, "root_hash": root, "new_trees": len(new_trees), "new_blobs": new_blobs}
+
+    # 🔹 비교
+    def diff(self, old_id: str | None, new_id: str, prefix: str = "") -> list[dict]:
+        """
+        두 스냅샷 비교 → [{"path", "status": added/deleted/modified, "old", "new"}]
+        - 같은 hash의 하위 트리는 건너뜀 → 비용은 변경된 경로 수에 비례
+        - old_id=None이면 빈 트리와 비교
+        """
+        old_root = self.root_of(old_id) if old_id else EMPTY_TREE
+        new_root = self.root_of(new_id)
+        result: list[dict] = []
+        self._diff_tree(old_root, new_root, prefix.strip("/"), result)
+        return result
+
+    def _diff_tree(self, old_h: str | None, new_h: str | None, base: str, out: list[dict]):
+        if old_h == new_h:
+            return
+        old = self.get_tree(old_h) if old_h else {}
+        new = self.get_tree(new_h) if new_h else {}
+        for name in sorted(old.keys() | new.keys()):
+            o, n = old.get(name), new.get(name)
+            if o == n:
+                continue
+            path = f"{base}/{name}" if base else name
+            o_tree = o[1] if o and o[0] == TREE else None
+            n_tree = n[1] if n and n[0] == TREE else None
+            if o_tree or n_tree:
+                self._diff_tree(o_tree, n_tree, path, out)
+            o_blob = o[1] if o and o[0] == BLOB else None
+            n_blob = n[1] if n and n[0] == BLOB else None
+            if o_blob is None and n_blob is None:
+                continue
+            if o_blob is None:
+                out.append({"path": path, "status": "added", "old": None, "new": n_blob})
+            elif n_blob is None:
+                out.append({"path": path, "status": "deleted", "old": o_blob, "new": None})
+            else:
+                out.append({"path": path, "status": "modified", "old": o_blob, "new": n_blob})
+
+def changes_from_paths(paths: list[str], root: Path = Path(".")) -> dict[str, tuple[bytes, str] | None]:
+    """작업 트리의 경로 목록 → create_snapshot()의 changes (없는 파일은 삭제)"""
+    changes = {}
+    for p in paths:
+        full = root / p
+        if full.is_file():
+            mode = "100755" if full.stat().st_mode & 0o111 else "100644"
+            changes[Path(p).as_posix()] = (full.read_bytes(), mode)
+        else:
+            changes[Path(p).as_posix()] = None
+    return changes
+
+_store: MerkleStore | None = None
+_store_lock = threading.Lock()
+
+def get_store() -> MerkleStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MerkleStore()
+        return _store
@@ -1,6 +1,5 @@
 import os, json, subprocess, shutil, getpass
 from pathlib import Path
-import yaml
 from dotenv import load_dotenv
 import os
 import subprocess
@@ -131,13 +130,17 @@ def check_git_remote():
         print_status("원격 저장소 접근", "실패", "fail"); exit(1)
     print_status("원격 저장소", "접근 성공")
 
-# 🔹 사용자 설정 YAML 로딩
+# 🔹 사용자 설정 YAML 로딩 (utils.config)
 def load_user_config():
-    config_path = Path("config/user_config.yml")
-    if not config_path.exists():
+    try:
+        from utils.config import get_user_config, user_config_exists
+    except ImportError:  # test/ 단독 실행 → 저장소 루트를 경로에 추가
+        sys.path.append(str(Path(__file__).resolve().parent.parent))
+        from utils.config import get_user_config, user_config_exists
+    if not user_config_exists():
         print_status("user_config.yml", "없음", "fail")
         exit(1)
-    return yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    return get_user_config()
 
 # 🔹 알림 플랫폼 점검
 def check_notify_platforms(pf_list):
@@ -172,7 +175,7 @@ def main():
     check_git_remote()
 
     user_config = load_user_config()
-    pf_list = user_config.get("notify", {}).get("platform", [])
+    pf_list = list(user_config.notify_platforms)
     check_notify_platforms(pf_list)
 
     print("\n🎉 모든 점검 및 설정 완료. 자동화 준비 OK.\n")
@@ -0,0 +1,38 @@
+# test/test_git_objects.py
+# 임시 git 저장소에서 GitObjectReader 응답 파싱 확인 (python -m pytest -q test/test_git_objects.py)
+
+import sys
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prep.git_objects import GitObjectReader
+
+def _git(cwd: Path, *args: str):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+def _repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "t@example.com")
+    _git(tmp_path, "config", "user.name", "t")
+    (tmp_path / "m.py").write_text("print('m')\n", encoding="utf-8")
+    (tmp_path / "old file.py").write_text("x = 1\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+def test_missing_path_with_space(tmp_path):
+    repo = _repo(tmp_path)
+    with GitObjectReader(repo) as reader:
+        result = reader.show_many(["my file.py", "m.py", "old file.py"])
+        assert result == {"my file.py": None, "m.py": "print('m')\n", "old file.py": "x = 1\n"}
+        # 같은 프로세스로 다음 요청이 정상 응답해야 함 (응답 경계 유지)
+        assert reader.show("m.py") == "print('m')\n"
+
+def test_partial_consumption_keeps_stream_in_sync(tmp_path):
+    repo = _repo(tmp_path)
+    with GitObjectReader(repo) as reader:
+        for _ in reader.read_many(["HEAD:m.py", "HEAD:no such.py", "HEAD:old file.py"]):
+            break
+        assert reader.show("old file.py") == "x = 1\n"
@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import random
+import threading
+import requests
+from datetime import datetime
+from dotenv import load_dotenv
+from pathlib import Path
+
+from utils.log import log
+
+load_dotenv()
+
+NOTION_TOKEN = os.getenv("NOTION_API_KEY")
+NOTION_PAGE_uuid = os.getenv("NOTION_PAGE_uuid")
+NOTION_URL_BASE = os.getenv("NOTION_API_BASE", "https://api.notion.com/v1")
+NOTION_VERSION = "2022-06-28"
+
+MAX_CHILDREN_PER_REQUEST = 100   # Notion append children 한도
+MAX_RICH_TEXT_LEN = 2000         # rich_text 1개당 content 한도
+DEFAULT_RATE = 3.0               # Notion 평균 허용치: 초당 3 요청
+CACHE_PATH = Path("DB/cache/notion_toggle.json")
+
+COLORS = [
+    "gray_background", "brown_background", "orange_background",
+    "yellow_background", "green_background", "blue_background",
+    "purple_background", "pink_background"
+]
+
+class TokenBucket:
+    """초당 rate개 토큰, 최대 capacity개까지 적립 → acquire()는 토큰이 생길 때까지 대기"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def _split_text(text: str) -> list[dict]:
+    return [
+        {"type": "text", "text": {"content": text[i:i + MAX_RICH_TEXT_LEN]}}
+        for i in range(0, max(len(text), 1), MAX_RICH_TEXT_LEN)
+    ]
+
+def create_paragraph_block(title: str, text: str) -> dict:
+    full_text = f"{title}\n\n{text}" if title else text
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": _split_text(full_text),
+            "color": random.choice(COLORS)
+        }
+    }
+
+def create_toggle_block(title_text: str) -> dict:
+    return {
+        "object": "block",
+        "type": "toggle",
+        "toggle": {
+            "rich_text": [{"type": "text", "text": {"content": title_text}}],
+            "children": []
+        }
+    }
+
+def _toggle_title(block: dict) -> str | None:
+    if block.get("type") != "toggle":
+        return None
+    rich_texts = block.get("toggle", {}).get("rich_text", [])
+    return "".join(rt.get("plain_text") or rt.get("text", {}).get("content", "") for rt in rich_texts)
+
+class NotionArchiver:
+    """
+    repo → 월 → 시각 토글 트리에 파일별 요약을 기록
+    - 부모 블록의 children은 실행당 1회만 조회(페이지네이션 포함)하고 토글 id를 캐시
+    - repo/월 토글 id는 DB/cache/notion_toggle.json에 저장해 다음 실행에서도 재사용
+    - 블록 추가는 요청당 100개씩 묶어서 전송
+    - 모든 요청은 token bucket으로 초당 요청 수 제한, 429면 Retry-After 만큼 대기 후 재시도
+    """
+
+    def __init__(
+        self,
+        page_uuid: str | None = None,
+        token: str | None = None,
+        rate: float = DEFAULT_RATE,
+        cache_path: Path = CACHE_PATH,
+        base_url: str = NOTION_URL_BASE,
+    ):
+        self.page_uuid = page_uuid or NOTION_PAGE_uuid
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {token or NOTION_TOKEN}",
+            "Content-Type": "application/json",
+            "Notion-Version": NOTION_VERSION,
+        })
+        self.bucket = TokenBucket(rate)
+        self.cache_path = cache_path
+        # {parent_uuid: {title: block_uuid}} → 이번 실행에서 children을 조회한 부모
+        self._children: dict[str, dict[str, str]] = {}
+        # 실행 간 유지되는 repo/월 토글 {"parent_uuid|title": block_uuid}
+        self._persisted: dict[str, str] = self._load_cache()
+        self.request_count = 0
+        # outbox가 notion 작업을 동시에 처리 → 같은 부모의 조회·생성은 부모별 lock으로 직렬화 (중복 토글 방지)
+        self._parent_locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._cache_lock = threading.Lock()
+
+    # 🔹 캐시 파일
+    def _load_cache(self) -> dict[str, str]:
+        try:
+            return json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _save_cache(self):
+        """_cache_lock을 잡은 상태에서 호출"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(self._persisted, ensure_ascii=False, indent=2), encoding="utf-8")
+        except Exception as e:
+            log(f"[NOTION] 토글 캐시 저장 실패: {e}", level="WARN", source="notion_archiver")
+
+    # 🔹 HTTP
+    def _request(self, method: str, path: str, max_retries: int = 5, **kwargs) -> dict:
+        for attempt in range(max_retries + 1):
+            self.bucket.acquire()
+            self.request_count += 1
+            resp = self.session.request(method, f"{self.base_url}{path}", timeout=30, **kwargs)
+            if resp.status_code == 429 and attempt < max_retries:
+                time.sleep(float(resp.headers.get("Retry-After", 1)))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+        raise RuntimeError(f"[NOTION] rate limit 재시도 초과: {method} {path}")
+
+    def list_children(self, block_uuid: str):
+        """children 전체 순회 (has_more/next_cursor 페이지네이션)"""
+        params = {"page_size": MAX_CHILDREN_PER_REQUEST}
+        while True:
+            data = self._request("GET", f"/blocks/{block_uuid}/children", params=params)
+            yield from data.get("results", [])
+            if not data.get("has_more"):
+                return
+            params["start_cursor"] = data["next_cursor"]
+
+    def append_children(self, block_uuid: str, blocks: list[dict]) -> list[dict]:
+        created = []
+        for i in range(0, len(blocks), MAX_CHILDREN_PER_REQUEST):
+            chunk = blocks[i:i + MAX_CHILDREN_PER_REQUEST]
+            data = self._request("PATCH", f"/blocks/{block_uuid}/children", json={"children": chunk})
+            created.extend(data.get("results", []))
+        return created
+
+    # 🔹 토글 트리
+    def _parent_lock(self, parent_uuid: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._parent_locks.setdefault(parent_uuid, threading.Lock())
+
+    def _toggles_of(self, parent_uuid: str) -> dict[str, str]:
+        if parent_uuid not in self._children:
+            titles = {}
+            for block in self.list_children(parent_uuid):
+                title = _toggle_title(block)
+                if title is not None:
+                    titles.setdefault(title, block["id"])
+            self._children[parent_uuid] = titles
+        return self._children[parent_uuid]
+
+    def resolve_toggle(self, parent_uuid: str, title: str, persist: bool = False) -> str:
+        """부모 아래 제목이 title인 토글 id 반환, 없으면 생성"""
+        key = f"{parent_uuid}|{title}"
+        if persist:
+            with self._cache_lock:
+                cached = self._persisted.get(key)
+            if cached:
+                return cached
+
+        with self._parent_lock(parent_uuid):
+            toggles = self._toggles_of(parent_uuid)
+            block_uuid = toggles.get(title)
+            if block_uuid is None:
+                created = self.append_children(parent_uuid, [create_toggle_block(title)])
+                block_uuid = created[-1]["id"]
+                toggles[title] = block_uuid
+                # 새로 만든 토글의 children은 비어 있으므로 조회 생략
+                self._children[block_uuid] = {}
+
+        if persist:
+            with self._cache_lock:
+                self._persisted[key] = block_uuid
+                self._save_cache()
+        return block_uuid
+
+    def resolve_path(self, titles: list[str], persist_depth: int = 2) -> str:
+        """[repo, 월, 시각] 순으로 토글을 따라 내려가 마지막 토글 id 반환"""
+        parent = self.page_uuid
+        for depth, title in enumerate(titles):
+            parent = self.resolve_toggle(parent, title, persist=depth < persist_depth)
+        return parent
+
+    # 🔹 기록
+    def archive(self, repo_name: str, file_text_pairs: list[tuple[str, str]], now: datetime | None = None) -> int:
+        """
+        파일별 요약 블록을 시각 토글 아래 일괄 추가, 추가한 블록 수 반환
+        - 캐시된 토글이 Notion에서 삭제된 경우(404) 캐시를 비우고 1회 재시도
+        """
+        now = now or datetime.now()
+        titles = [
+            f"📁 {repo_name}",
+            f"📅 {now.strftime('%y년 %m월')}",
+            f"🕒 {now.strftime('%d일 %p %I시 %M분').replace('AM', '오전').replace('PM', '오후')}",
+        ]
+        blocks = [create_paragraph_block(f"📘 FILE: {fn}", txt) for fn, txt in file_text_pairs]
+        if not blocks:
+            return 0
+
+        for attempt in range(2):
+            try:
+                self.append_children(self.resolve_path(titles), blocks)
+                return len(blocks)
+            except requests.HTTPError as e:
+                if attempt or e.response is None or e.response.status_code != 404:
+                    raise
+                log("[NOTION] 캐시된 토글 없음(404) → 캐시 초기화 후 재시도", level="WARN", source="notion_archiver")
+                with self._cache_lock:
+                    self._persisted.clear()
+                    self._children.clear()
+                    self._save_cache()
+
+_archiver: NotionArchiver | None = None
+_archiver_lock = threading.Lock()
+
+def get_archiver() -> NotionArchiver:
+    """프로세스 공용 archiver (토글 캐시/rate limit 공유)"""
+    global _archiver
+    with _archiver_lock:
+        if _archiver is None:
+            _archiver = NotionArchiver()
+        return _archiver
@@ -0,0 +1,30 @@
+import os
+import requests
+from dotenv import load_dotenv
+from pathlib import Path
+from datetime import datetime
+
+# 🔹 .env 로드
+env_path = Path(__file__).parent.parent / ".env"
+if env_path.exists():
+    load_dotenv(dotenv_path=env_path)
+
+# 기록용 채널 Webhook (알림용 SLACK_WEBHOOK_URL과 분리)
+ARCHIVE_WEBHOOK_URL = os.getenv("SLACK_ARCHIVE_WEBHOOK_URL")
+
+SESSION = requests.Session()
+
+# 🔹 archive(): 파일별 기능 요약을 기록 채널에 한 메시지로 전송
+def archive(file_text_pairs: list[tuple[str, str]]) -> None:
+    """
+    - 실패 시 예외 발생 (outbox 재시도 대상)
+    """
+    if not ARCHIVE_WEBHOOK_URL:
+        raise RuntimeError("SLACK_ARCHIVE_WEBHOOK_URL 없음")
+
+    time_str = datetime.now().strftime("%Y-%m-%d %H:%M")
+    sections = [f"*📘 {fn}*\n```{txt}```" for fn, txt in file_text_pairs]
+    text = f"*🗂️ 커밋 기록* ({time_str})\n\n" + "\n\n".join(sections)
+
+    resp = SESSION.post(ARCHIVE_WEBHOOK_URL, json={"text": text}, timeout=10)
+    resp.raise_for_status()
@@ -3,9 +3,9 @@ import json
 from config.setting import cfg
 from scripts.dataframe import load_df
 from scripts.classify import classify_main
-from scripts.upload_utils import get_file_path, do_git_commit, send_notification
+from scripts.upload_utils import get_file_path, do_git_commit_batch
 from scripts.ext_info import to_safe_filename
-import record.notion as notion
+from upload.outbox import get_outbox, enqueue_notification
 
 def perform_git_commit(commit_uuid: int, msg: str):
     import subprocess
@@ -38,6 +38,8 @@ def upload_main():
     commit_result = {}
     commit_groups = {"success": [], "fallback": [], "fail": []}
 
+    # 파일별 메시지 결정 → 로컬 커밋 일괄 생성 후 push 1회
+    entries, kinds = [], {}
     for file in strategy_df["File"]:
         row = strategy_map.get(file)
         if not row:
@@ -47,17 +49,26 @@ def upload_main():
             continue
 
         filepath = Path(row["path"]) / to_safe_filename(file)
-
         if file in commit_msgs:
-            msg = commit_msgs[file]
-            success = do_git_commit(filepath, msg, lambda m: cfg.log(m, log_file))
-            commit_result[file] = "✅" if success else "❌"
-            commit_groups["success" if success else "fail"].append(file)
+            entries.append((file, filepath, commit_msgs[file]))
+            kinds[file] = "success"
         else:
             dummy_msg = f"chore(auto): {file} 변경사항 (no LLM commit message)"
-            success = do_git_commit(filepath, dummy_msg, lambda m: cfg.log(m, log_file))
-            commit_result[file] = "⚠️ fallback" if success else "❌"
-            commit_groups["fallback" if success else "fail"].append(file)
+            entries.append((file, filepath, dummy_msg))
+            kinds[file] = "fallback"
+
+    batch = do_git_commit_batch([(fp, msg) for _, fp, msg in entries], lambda m: cfg.log(m, log_file))
+    for file, filepath, _ in entries:
+        success = batch["results"].get(str(filepath), False)
+        if not success:
+            commit_result[file] = "❌"
+            commit_groups["fail"].append(file)
+        elif kinds[file] == "success":
+            commit_result[file] = "✅"
+            commit_groups["success"].append(file)
+        else:
+            commit_result[file] = "⚠️ fallback"
+            commit_groups["fallback"].append(file)
 
     cfg.log(f"✅ Git 커밋 결과 요약:\n{json.dumps(commit_result, ensure_ascii=False, indent=2)}", log_file)
 
@@ -67,23 +78,23 @@ def upload_main():
     )
     if commit_groups["fail"]:
         notify_text += f"\n🚫 커밋 실패 파일: {', '.join(commit_groups['fail'])}"
+    if any(batch["results"].values()) and not batch["pushed"]:
+        notify_text += "\n📤 push 실패: 로컬 커밋은 유지됨 (다음 실행 시 재시도)"
     if commit_groups["fallback"]:
         notify_text += f"\n⚠️ 메시지 없이 커밋된 파일: {', '.join(commit_groups['fallback'])}"
     if notify.get("review_files"):
         notify_text += f"\n🧐 수동 검토 대상: {', '.join(notify['review_files'])}"
 
-    send_notification(["kakao", "slack", "discord", "gmail"], notify_text, lambda m: cfg.log(m, log_file))
-
-    notion_failures = []
-    for file, text in fx_summary.items():
-        try:
-            notion.upload_fx_record(file, text)
-        except Exception as e:
-            notion_failures.append(file)
-            cfg.log(f"[NOTION] {file} 업로드 실패: {e}", log_file)
+    # 알림/기록은 outbox에 적재 → 외부 API 실패는 백오프 후 재시도
+    outbox = get_outbox()
+    unknown = enqueue_notification(outbox, ["kakao", "slack", "discord", "gmail"], notify_text, run_id=timestamp)
+    if unknown:
+        cfg.log(f"[알림 실패] 알 수 없는 플랫폼: {unknown}", log_file)
 
-    if notion_failures:
-        cfg.log(f"[NOTION] 업로드 실패 파일 목록: {notion_failures}", log_file)
-        notify_text += f"\n📭 Notion 업로드 실패: {', '.join(notion_failures)}"
+    pairs = [[file, text] for file, text in fx_summary.items()]
+    if pairs:
+        outbox.enqueue("notion", {"pairs": pairs, "run_id": timestamp})
+        outbox.enqueue("slack_archive", {"pairs": pairs, "run_id": timestamp})
 
-    cfg.log("✅ 전체 업로드 완료", log_file)
+    # 전송은 drainer / 종료 시 flush / python -m upload.outbox drain 담당 → 여기서는 기다리지 않음
+    cfg.log(f"✅ 전체 업로드 완료 (outbox 대기: {outbox.stats()})", log_file)
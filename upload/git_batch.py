@@ -0,0 +1,156 @@
+# upload/git_batch.py
+
+import os
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+ZERO_SHA = "0" * 40
+
+class GitError(RuntimeError):
+    pass
+
+class GitCommitExecutor:
+    """
+    파일(그룹)별 메시지로 여러 커밋을 만든 뒤 push는 마지막에 1회
+    - 전용 임시 index(GIT_INDEX_FILE) 하나를 계속 사용 → index.lock 반복 획득 없음
+    - blob 해시는 hash-object --stdin-paths 한 번으로 전체 계산
+    - 그룹마다 update-index --index-info / write-tree / commit-tree (네트워크 없음)
+    - 모든 커밋 후 update-ref로 HEAD를 한 번에 이동, 그 다음 push
+    - push 실패해도 로컬 커밋은 HEAD에 남아 있음 (다음 실행에서 push 재시도 가능)
+    - plumbing 사용이므로 pre-commit / commit-msg hook은 실행되지 않음
+    """
+
+    def __init__(self, repo_path: Path = Path("."), log_func: Callable[[str], None] = print):
+        self.repo = Path(repo_path)
+        self.log = log_func
+        top = self._git("rev-parse", "--show-toplevel").strip()
+        self.repo = Path(top)
+
+    # 🔹 subprocess
+    def _git(self, *args: str, input: str | None = None, env: dict | None = None) -> str:
+        result = subprocess.run(
+            ["git", *args], cwd=self.repo, input=input, capture_output=True,
+            text=True, encoding="utf-8", env=env,
+        )
+        if result.returncode != 0:
+            raise GitError(f"git {args[0]} 실패: {result.stderr.strip()}")
+        return result.stdout
+
+    def rel_path(self, path: Path | str) -> str:
+        """
+        저장소 기준 상대 경로 (저장소 밖이면 ValueError)
+        - 마지막 요소는 따라가지 않음 → 심볼릭 링크 파일은 링크 자체로 커밋 (_mode 120000)
+        - 상위 디렉터리만 실제 경로로 맞춤 (저장소가 심볼릭 링크 경로로 열린 경우)
+        """
+        p = Path(os.path.abspath(path))
+        return (Path(os.path.realpath(p.parent)) / p.name).relative_to(self.repo.resolve()).as_posix()
+
+    def _head(self) -> str | None:
+        try:
+            return self._git("rev-parse", "--verify", "-q", "HEAD").strip()
+        except GitError:
+            return None  # 첫 커밋 전
+
+    def _hash_blobs(self, paths: list[str]) -> dict[str, str]:
+        """
+        경로 → blob sha (없는 파일은 제외 = 삭제)
+        - 일반 파일은 hash-object --stdin-paths 1회
+        - 심볼릭 링크는 대상 내용이 아니라 링크 문자열을 blob으로 저장 (git과 같은 방식, 깨진 링크 포함)
+        """
+        links = [p for p in paths if (self.repo / p).is_symlink()]
+        files = [p for p in paths if p not in links and (self.repo / p).exists()]
+        blobs = {}
+        if files:
+            out = self._git("hash-object", "-w", "--stdin-paths", input="\n".join(files) + "\n")
+            blobs.update(zip(files, out.split()))
+        for p in links:
+            blobs[p] = self._git("hash-object", "-w", "--stdin", input=os.readlink(self.repo / p)).strip()
+        return blobs
+
+    def _mode(self, path: str) -> str:
+        full = self.repo / path
+        if full.is_symlink():
+            return "120000"
+        return "100755" if os.access(full, os.X_OK) else "100644"
+
+    # 🔹 실행
+    def run(self, groups: list[tuple[list[Path | str], str]], push: bool = True) -> dict:
+        """
+        groups: [(파일 경로 리스트, 커밋 메시지), ...] 순서대로 커밋
+        반환: {
+            "results": {파일: 커밋 sha | None},   # None = 변경 없음 또는 실패
+            "commits": [sha, ...],
+            "pushed": bool,
+            "errors": {파일: 메시지},
+        }
+        """
+        rel_groups = [([self.rel_path(p) for p in paths], msg) for paths, msg in groups]
+        all_paths = sorted({p for paths, _ in rel_groups for p in paths})
+        blobs = self._hash_blobs(all_paths)
+
+        results: dict[str, str | None] = {p: None for p in all_paths}
+        errors: dict[str, str] = {}
+        commits: list[str] = []
+
+        old_head = self._head()
+        parent = old_head
+
+        fd, index_path = tempfile.mkstemp(prefix="comfort_commit_index_")
+        os.close(fd)
+        os.unlink(index_path)  # git이 새 index로 생성하도록 빈 경로만 확보
+        env = {**os.environ, "GIT_INDEX_FILE": index_path}
+        try:
+            if parent:
+                self._git("read-tree", parent, env=env)
+            tree = self._git("write-tree", env=env).strip()
+
+            for paths, msg in rel_groups:
+                try:
+                    index_info = "".join(
+                        f"{self._mode(p)} {blobs[p]}\t{p}\n" if p in blobs else f"0 {ZERO_SHA}\t{p}\n"
+                        for p in paths
+                    )
+                    self._git("update-index", "--index-info", input=index_info, env=env)
+                    new_tree = self._git("write-tree", env=env).strip()
+                    if new_tree == tree:
+                        self.log(f"⚠️ 변경 없음 → 커밋 생략: {', '.join(paths)}")
+                        continue
+
+                    args = ["commit-tree", new_tree, "-F", "-"]
+                    if parent:
+                        args[2:2] = ["-p", parent]
+                    sha = self._git(*args, input=msg, env=env).strip()
+                except GitError as e:
+                    # 실패한 그룹은 index를 이전 tree로 되돌리고 다음 그룹 진행
+                    self._git("read-tree", tree, env=env)
+                    for p in paths:
+                        errors[p] = str(e)
+                    self.log(f"❌ Git 커밋 실패: {', '.join(paths)} → {e}")
+                    continue
+
+                parent, tree = sha, new_tree
+                commits.append(sha)
+                for p in paths:
+                    results[p] = sha
+        finally:
+            if os.path.exists(index_path):
+                os.unlink(index_path)
+
+        if commits:
+            self._git("update-ref", "-m", "comfort-commit: batch commit", "HEAD", parent, old_head or ZERO_SHA)
+            # 실제 index의 커밋된 경로를 새 HEAD 기준으로 맞춤 (다른 staged 변경은 유지)
+            committed = [p for p, sha in results.items() if sha]
+            self._git("reset", "-q", "HEAD", "--", *committed)
+            self.log(f"✅ 로컬 커밋 {len(commits)}건 생성 (HEAD → {parent[:8]})")
+
+        pushed = False
+        if push and commits:
+            try:
+                self._git("push")
+                pushed = True
+            except GitError as e:
+                self.log(f"❌ Git push 실패 (로컬 커밋 {len(commits)}건 유지): {e}")
+
+        return {"results": results, "commits": commits, "pushed": pushed, "errors": errors}
@@ -17,6 +17,9 @@ HEADERS = {
     "User-Agent": "DiscordBot (https://github.com/git-auto-bot, 1.0)"
 }
 
+# 🔹 keep-alive 커넥션 재사용 (메시지마다 TLS 핸드셰이크 방지)
+SESSION = requests.Session()
+
 # 🔹 ping(): Webhook이 살아있는지 확인용 메시지
 def ping() -> bool:
     if not WEBHOOK_URL:
@@ -25,7 +28,7 @@ def ping() -> bool:
         payload = {
             "content": "✅ [Ping 테스트] Discord Webhook 연결 성공"
         }
-        resp = requests.post(WEBHOOK_URL, headers=HEADERS, json=payload, timeout=5)
+        resp = SESSION.post(WEBHOOK_URL, headers=HEADERS, json=payload, timeout=5)
         return resp.status_code in [200, 204]
     except Exception as e:
         return False
@@ -44,7 +47,7 @@ def send(commit_msg: str, status: str = "success") -> bool:
 {commit_msg}
 """
     try:
-        resp = requests.post(WEBHOOK_URL, headers=HEADERS, json={"content": body}, timeout=10)
+        resp = SESSION.post(WEBHOOK_URL, headers=HEADERS, json={"content": body}, timeout=10)
         return resp.status_code in [200, 204]
     except Exception as e:
         return False
\ No newline at end of file
@@ -0,0 +1,149 @@
+# upload/noti/dispatcher.py
+
+import atexit
+import asyncio
+import threading
+from typing import Callable
+from concurrent.futures import Future
+
+from utils.config import get_app_config
+from utils.log import log
+
+DEFAULT_TIMEOUT = 10.0
+
+def _load_timeouts() -> dict[str, float]:
+    try:
+        return {k: float(v) for k, v in get_app_config().section("notify timeout").items()}
+    except (TypeError, ValueError):
+        return {}
+
+def get_senders() -> dict[str, Callable[[str, str], object]]:
+    from upload.noti import discord, gmail, kakao, slack
+    return {"kakao": kakao.send, "slack": slack.send, "discord": discord.send, "gmail": gmail.send}
+
+def _in_thread(fn: Callable, *args) -> asyncio.Future:
+    """
+    blocking 호출을 전용 daemon 스레드에서 실행
+    - asyncio.to_thread(기본 executor)는 인터프리터 종료 중(atexit flush)에는 새 작업을 받지 않음
+    - timeout으로 버려진 호출이 기본 executor 슬롯을 붙잡지도 않음
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        if not future.done():  # wait_for timeout으로 이미 취소된 경우
+            future.set_exception(error) if error else future.set_result(result)
+
+    def target():
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # 루프가 이미 닫힘
+
+    threading.Thread(target=target, name="noti-send", daemon=True).start()
+    return future
+
+def is_success(result) -> bool:
+    # kakao.send는 상태 문자열을, 나머지는 bool을 반환
+    if isinstance(result, str):
+        return "✅" in result
+    return bool(result)
+
+class NotificationDispatcher:
+    """
+    알림 fan-out 전송기
+    - 전용 이벤트 루프 스레드 1개에서 모든 플랫폼을 동시에 전송
+    - 플랫폼별 timeout (conf.json "notify timeout")
+    - submit()은 큐잉 즉시 Future 반환 → 커밋 파이프라인은 대기하지 않음
+    - 각 플랫폼 모듈은 세션/SMTP 연결/토큰을 모듈 단위로 재사용
+    """
+
+    def __init__(self, timeouts: dict[str, float] | None = None, senders: dict[str, Callable] | None = None):
+        self.timeouts = {**_load_timeouts(), **(timeouts or {})}
+        self._senders = senders
+        self._loop = asyncio.new_event_loop()
+        self._pending: set[Future] = set()
+        self._pending_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="noti-dispatcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def senders(self) -> dict[str, Callable]:
+        if self._senders is None:
+            self._senders = get_senders()
+        return self._senders
+
+    def submit(self, platforms: list[str], msg: str, status: str = "success", log_func: Callable | None = None) -> Future:
+        """
+        알림 전송을 큐잉하고 바로 반환
+        - Future.result() → 실패한 플랫폼 리스트
+        """
+        future = asyncio.run_coroutine_threadsafe(self._fan_out(platforms, msg, status, log_func), self._loop)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future):
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    async def _fan_out(self, platforms: list[str], msg: str, status: str, log_func: Callable | None) -> list[str]:
+        results = await asyncio.gather(*(self._send_one(pf, msg, status, log_func) for pf in platforms))
+        return [pf for pf, ok in zip(platforms, results) if not ok]
+
+    async def _send_one(self, pf: str, msg: str, status: str, log_func: Callable | None) -> bool:
+        report = log_func or (lambda m: log(m, level="WARN", source="noti_dispatcher"))
+        sender = self.senders.get(pf)
+        if not sender:
+            report(f"[알림 실패] 알 수 없는 플랫폼: {pf}")
+            return False
+
+        timeout = self.timeouts.get(pf, DEFAULT_TIMEOUT)
+        try:
+            # 플랫폼 SDK가 blocking I/O라 스레드에서 실행, 대기만 비동기
+            result = await asyncio.wait_for(_in_thread(sender, msg, status), timeout)
+        except asyncio.TimeoutError:
+            report(f"[알림 실패] {pf}: {timeout}s timeout")
+            return False
+        except Exception as e:
+            report(f"[알림 실패] {pf}: {e}")
+            return False
+
+        if not is_success(result):
+            report(f"[알림 실패] {pf}: {result}")
+            return False
+        return True
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """큐잉된 전송이 끝날 때까지 대기, 모두 끝났으면 True"""
+        with self._pending_lock:
+            pending = list(self._pending)
+        for future in pending:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                return False
+        return True
+
+    def close(self, timeout: float | None = None):
+        self.drain(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+_dispatcher: NotificationDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher() -> NotificationDispatcher:
+    """프로세스 공용 dispatcher, 종료 시 남은 알림을 최대 max(timeout)까지 전송"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            grace = max(_dispatcher.timeouts.values(), default=DEFAULT_TIMEOUT)
+            atexit.register(_dispatcher.close, grace)
+        return _dispatcher
@@ -1,5 +1,6 @@
 import os
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 from pathlib import Path
@@ -13,6 +14,40 @@ if env_path.exists():
 GMAIL_USER = os.getenv("GMAIL_USER")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
 TO_EMAIL = os.getenv("GMAIL_TO_EMAIL", GMAIL_USER)
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+
+# 🔹 로그인된 SMTP 연결 재사용 (메시지마다 SSL 연결 + login 방지)
+_server: smtplib.SMTP_SSL | None = None
+_server_lock = threading.Lock()
+
+def _connect(timeout: float = 10) -> smtplib.SMTP_SSL:
+    server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=timeout)
+    server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+    return server
+
+def _get_server() -> smtplib.SMTP_SSL:
+    """살아있는 연결이면 재사용, 끊겼으면 재접속"""
+    global _server
+    if _server is not None:
+        try:
+            if _server.noop()[0] == 250:
+                return _server
+        except smtplib.SMTPException:
+            pass
+        close()
+    _server = _connect()
+    return _server
+
+def close():
+    global _server
+    if _server is None:
+        return
+    try:
+        _server.quit()
+    except Exception:
+        pass
+    _server = None
 
 # 🔹 ping(): 연결 테스트
 def ping() -> bool:
@@ -31,9 +66,13 @@ def send(commit_msg: str, status: str = "success") -> bool:
         msg["From"] = GMAIL_USER
         msg["To"] = TO_EMAIL
 
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-            server.send_message(msg)
+        with _server_lock:
+            try:
+                _get_server().send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # 유휴 중 서버가 끊은 경우 1회 재접속
+                close()
+                _get_server().send_message(msg)
         return True
     except:
-        return False
\ No newline at end of file
+        return False
@@ -1,6 +1,7 @@
 import os
 import json
 import time
+import threading
 import requests
 from pathlib import Path
 from datetime import datetime
@@ -13,22 +14,51 @@ REFRESH_TOKEN = os.getenv("KAKAO_REFRESH_TOKEN")
 TOKEN_PATH = Path("config/kakao.json").resolve()
 API_URL = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
 TOKEN_URL = "https://kauth.kakao.com/oauth/token"
+DEFAULT_EXPIRES_IN = 6 * 60 * 60   # 카카오 access_token 기본 유효시간 (6시간)
+EXPIRY_MARGIN = 60                 # 만료 직전 토큰은 미리 갱신
+
+SESSION = requests.Session()
+
+# 🔹 메모리 토큰 캐시 {"access_token": str, "expires_at": epoch}
+_token_cache: dict = {}
+_token_lock = threading.Lock()
 
 # 🔧 access_token 저장
-def save_access_token(token: str):
+def save_access_token(token: str, expires_in: int = DEFAULT_EXPIRES_IN):
+    expires_at = time.time() + expires_in
+    with _token_lock:
+        _token_cache.update(access_token=token, expires_at=expires_at)
+
     TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
     data = {
         "access_token": token,
+        "expires_at": expires_at,
         "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     TOKEN_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"[KAKAO] ✅ access_token 저장됨: {TOKEN_PATH}")
 
-# 🔧 access_token 로드
+def _is_fresh(expires_at: float | None) -> bool:
+    # expires_at 없는 구버전 kakao.json은 유효하다고 보고 401 시 갱신
+    return expires_at is None or expires_at - EXPIRY_MARGIN > time.time()
+
+def invalidate_access_token():
+    with _token_lock:
+        _token_cache.clear()
+
+# 🔧 access_token 로드 (메모리 캐시 → kakao.json 순)
 def load_access_token() -> str | None:
+    with _token_lock:
+        if _token_cache and _is_fresh(_token_cache.get("expires_at")):
+            return _token_cache["access_token"]
+
     if TOKEN_PATH.exists():
         data = json.loads(TOKEN_PATH.read_text(encoding="utf-8"))
-        return data.get("access_token")
+        token, expires_at = data.get("access_token"), data.get("expires_at")
+        if token and _is_fresh(expires_at):
+            with _token_lock:
+                _token_cache.update(access_token=token, expires_at=expires_at)
+            return token
     return None
 
 # 🔧 access_token 갱신
@@ -44,19 +74,13 @@ def refresh_access_token() -> str | None:
     }
 
     try:
-        print("[KAKAO] ▶ refresh 요청 payload:", data)
-        print("[KAKAO] ▶ refresh 요청 URL:", TOKEN_URL)
-        resp = requests.post(TOKEN_URL, data=data, timeout=5)
-        print("[KAKAO] ▶ 응답 상태코드:", resp.status_code)
-        print("[KAKAO] ▶ 응답 본문:", resp.text)
+        resp = SESSION.post(TOKEN_URL, data=data, timeout=5)
+        print("[KAKAO] ▶ refresh 응답 상태코드:", resp.status_code)
         resp.raise_for_status()
-        new_token = resp.json().get("access_token")
+        body = resp.json()
+        new_token = body.get("access_token")
         if new_token:
-            if TOKEN_PATH.exists():
-                TOKEN_PATH.unlink()
-                print("[KAKAO] 🧹 이전 kakao.json 삭제 완료")
-            save_access_token(new_token)
-            time.sleep(5)
+            save_access_token(new_token, int(body.get("expires_in", DEFAULT_EXPIRES_IN)))
             return new_token
     except Exception as e:
         print(f"[KAKAO] ❌ 토큰 갱신 실패: {e}")
@@ -77,7 +101,7 @@ def send_kakao_message(token: str, message: str) -> bool:
         }
     }
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             API_URL,
             headers=headers,
             data={"template_object": json.dumps(payload, ensure_ascii=False)},
@@ -85,6 +109,7 @@ def send_kakao_message(token: str, message: str) -> bool:
         )
         if resp.status_code == 401:
             print("[KAKAO] ❗ access_token 만료로 인해 401 반환됨")
+            invalidate_access_token()
             return False
         return resp.status_code == 200 and resp.json().get("result_code") == 0
     except Exception as e:
@@ -11,6 +11,9 @@ if env_path.exists():
 
 WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 
+# 🔹 keep-alive 커넥션 재사용 (메시지마다 TLS 핸드셰이크 방지)
+SESSION = requests.Session()
+
 # 🔹 ping(): 슬랙 Webhook 테스트
 def ping() -> bool:
     return send("✅ [Ping 테스트] Slack Webhook 연결 성공", "success")
@@ -26,7 +29,7 @@ def send(commit_msg: str, status: str = "success") -> bool:
     text = f"*{prefix}*\n🕒 {time_str}\n\n```{commit_msg}```"
 
     try:
-        resp = requests.post(WEBHOOK_URL, json={"text": text}, timeout=5)
+        resp = SESSION.post(WEBHOOK_URL, json={"text": text}, timeout=5)
         return resp.status_code == 200
     except:
         return False
\ No newline at end of file
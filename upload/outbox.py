@@ -0,0 +1,360 @@
+# upload/outbox.py
+
+import json
+import time
+import atexit
+import random
+import argparse
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Callable
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.config import get_app_config, thaw
+from utils.log import log
+
+DEFAULT_DB_PATH = Path("DB/cache/outbox.db")
+
+PENDING, INFLIGHT, DONE, DEAD = "pending", "inflight", "done", "dead"
+
+def _load_outbox_conf() -> dict:
+    return thaw(get_app_config().section("outbox"))
+
+def make_idem_key(kind: str, payload: dict) -> str:
+    """kind + payload 내용 기반 멱등 키 (같은 알림/기록을 두 번 넣어도 1건)"""
+    raw = kind + "\0" + json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class Outbox:
+    """
+    외부 부수효과(알림, Notion, Slack 기록)용 SQLite 영속 outbox
+    - enqueue(): 로컬 INSERT 1회로 끝 → 커밋 경로가 외부 API 지연과 분리
+    - idem_key UNIQUE → 중복 enqueue 무시
+    - 실패 시 지수 백오프(+jitter) 재시도, max attempts 초과 시 dead-letter
+    - inflight 상태로 죽은 작업은 lease 만료 후 다시 pending (crash 복구)
+    - 1회성 프로세스는 flush()로 종료 전 제한 시간 안에서 처리 (get_outbox는 atexit에 등록)
+    """
+
+    _handlers: dict[str, Callable[[dict], None]] = {}
+
+    @classmethod
+    def register(cls, kind: str):
+        """kind별 처리 함수 등록, 처리 함수는 실패 시 예외를 던져야 재시도됨"""
+        def decorator(func: Callable[[dict], None]):
+            cls._handlers[kind] = func
+            return func
+        return decorator
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        concurrency: int | None = None,
+        max_attempts: int | None = None,
+        base_delay: float | None = None,
+        max_delay: float | None = None,
+        lease: float | None = None,
+        poll_interval: float | None = None,
+        exit_drain_timeout: float | None = None,
+    ):
+        conf = _load_outbox_conf()
+        self.db_path = Path(db_path or conf.get("db", DEFAULT_DB_PATH))
+        self.concurrency = int(concurrency or conf.get("concurrency", 4))
+        self.max_attempts = int(max_attempts or conf.get("max attempts", 6))
+        self.base_delay = float(base_delay or conf.get("base delay", 2))
+        self.max_delay = float(max_delay or conf.get("max delay", 600))
+        self.lease = float(lease or conf.get("lease", 120))
+        self.poll_interval = float(poll_interval or conf.get("poll interval", 1))
+        self.exit_drain_timeout = float(exit_drain_timeout or conf.get("exit drain timeout", 20))
+
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._drainer: threading.Thread | None = None
+        self._init_db()
+
+    # 🔹 DB
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")  # WAL + NORMAL은 커밋마다 fsync하지 않음
+        return conn
+
+    def _init_db(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    uuid INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idem_key TEXT UNIQUE NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS uuidx_outbox_ready ON outbox(status, next_attempt_at)")
+
+    # 🔹 enqueue
+    def enqueue(self, kind: str, payload: dict, idem_key: str | None = None) -> bool:
+        """
+        작업 적재 (fsync 이후 반환 → 프로세스가 죽어도 유실 없음)
+        - 반환: 새로 적재되면 True, 같은 idem_key가 이미 있으면 False
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 outbox kind: {kind}")
+        now = time.time()
+        key = idem_key or make_idem_key(kind, payload)
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO outbox (idem_key, kind, payload, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(payload, ensure_ascii=False), now, now, now),
+            )
+            inserted = cur.rowcount == 1
+        if inserted:
+            self._wakeup.set()
+        return inserted
+
+    # 🔹 claim / 결과 반영
+    def _claim(self, limit: int) -> list[tuple[int, str, dict, int]]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # lease 만료된 inflight = 처리 중 죽은 작업 → 재시도 대상으로 복구
+                conn.execute(
+                    "UPDATE outbox SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                    (PENDING, now, INFLIGHT, now - self.lease),
+                )
+                rows = conn.execute(
+                    "SELECT uuid, kind, payload, attempts FROM outbox "
+                    "WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                    (PENDING, now, limit),
+                ).fetchall()
+                if rows:
+                    conn.executemany(
+                        "UPDATE outbox SET status = ?, updated_at = ? WHERE uuid = ?",
+                        [(INFLIGHT, now, r[0]) for r in rows],
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [(uuid, kind, json.loads(payload), attempts) for uuid, kind, payload, attempts in rows]
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _mark_done(self, job_uuid: int):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, updated_at = ? WHERE uuid = ?",
+                (DONE, time.time(), job_uuid),
+            )
+
+    def _mark_failed(self, job_uuid: int, attempts: int, error: str):
+        now = time.time()
+        attempts += 1
+        status = DEAD if attempts >= self.max_attempts else PENDING
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+                "WHERE uuid = ?",
+                (status, attempts, error[:2000], now + self._backoff(attempts), now, job_uuid),
+            )
+        level = "ERROR" if status == DEAD else "WARN"
+        log(f"[OUTBOX] #{job_uuid} 실패 {attempts}/{self.max_attempts} ({status}): {error}", level=level, source="outbox")
+
+    def _process(self, job: tuple[int, str, dict, int]):
+        job_uuid, kind, payload, attempts = job
+        try:
+            self._handlers[kind](payload)
+        except Exception as e:
+            self._mark_failed(job_uuid, attempts, f"{type(e).__name__}: {e}")
+        else:
+            self._mark_done(job_uuid)
+
+    # 🔹 drain
+    def drain_once(self, executor: ThreadPoolExecutor | None = None) -> int:
+        """현재 실행 가능한 작업을 한 번 처리, 처리 건수 반환"""
+        jobs = self._claim(self.concurrency * 4)
+        if not jobs:
+            return 0
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                list(pool.map(self._process, jobs))
+        else:
+            list(executor.map(self._process, jobs))
+        return len(jobs)
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="outbox") as pool:
+            while not self._stop.is_set():
+                try:
+                    if self.drain_once(pool):
+                        continue
+                except Exception as e:
+                    log(f"[OUTBOX] drain 오류: {e}", level="ERROR", source="outbox")
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def flush(self, timeout: float | None = None) -> dict[str, int]:
+        """
+        실행 가능한 작업이 없어질 때까지(또는 timeout까지) 현재 스레드에서 처리, 남은 상태별 건수 반환
+        - 백오프 대기 중인 작업은 다음 drainer / python -m upload.outbox drain 에서 처리
+        - atexit 시점에는 ThreadPoolExecutor를 쓸 수 없어 작업마다 daemon 스레드 사용
+          (timeout을 넘긴 작업은 inflight로 남고 lease 만료 후 재시도)
+        """
+        deadline = time.monotonic() + (self.exit_drain_timeout if timeout is None else timeout)
+        while time.monotonic() < deadline:
+            jobs = self._claim(self.concurrency)
+            if not jobs:
+                break
+            threads = [threading.Thread(target=self._process, args=(job,), daemon=True) for job in jobs]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(max(0.0, deadline - time.monotonic()))
+        return self.stats()
+
+    def close(self, timeout: float | None = None):
+        """drainer 정지 후 남은 작업 flush (프로세스 종료 전)"""
+        self.stop(0)
+        remaining = self.flush(timeout)
+        if remaining.get(PENDING) or remaining.get(INFLIGHT):
+            log(f"[OUTBOX] 종료 시 미처리 작업 남음 (다음 drain에서 처리): {remaining}", level="WARN", source="outbox")
+
+    def start(self) -> "Outbox":
+        """백그라운드 drainer 시작 (이미 실행 중이면 무시)"""
+        if self._drainer is None or not self._drainer.is_alive():
+            self._stop.clear()
+            self._drainer = threading.Thread(target=self._run, name="outbox-drainer", daemon=True)
+            self._drainer.start()
+        return self
+
+    def stop(self, timeout: float | None = None):
+        self._stop.set()
+        self._wakeup.set()
+        if self._drainer is not None:
+            self._drainer.join(timeout)
+
+    # 🔹 조회 / 운영
+    def stats(self) -> dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: cnt for status, cnt in rows}
+
+    def dead_letters(self) -> list[dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT uuid, kind, payload, attempts, last_error FROM outbox WHERE status = ? ORDER BY uuid",
+                (DEAD,),
+            ).fetchall()
+        return [
+            {"uuid": u, "kind": k, "payload": json.loads(p), "attempts": a, "last_error": e}
+            for u, k, p, a, e in rows
+        ]
+
+    def requeue_dead(self) -> int:
+        """dead-letter 작업을 attempts 초기화 후 다시 pending으로"""
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ? WHERE status = ?",
+                (PENDING, time.time(), time.time(), DEAD),
+            )
+        self._wakeup.set()
+        return cur.rowcount
+
+    def purge_done(self, older_than: float = 7 * 24 * 3600) -> int:
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND updated_at < ?", (DONE, time.time() - older_than)
+            )
+        return cur.rowcount
+
+# 🔹 기본 핸들러
+@Outbox.register("notify")
+def handle_notify(payload: dict):
+    # dispatcher 경유 → 플랫폼별 timeout 적용 (멈춘 플랫폼이 worker를 붙잡지 않음)
+    from upload.noti.dispatcher import DEFAULT_TIMEOUT, get_dispatcher
+    dispatcher = get_dispatcher()
+    timeout = dispatcher.timeouts.get(payload["platform"], DEFAULT_TIMEOUT) + 5  # 전송 timeout + 루프 지연 여유
+    future = dispatcher.submit([payload["platform"]], payload["msg"], payload.get("status", "success"))
+    failed = future.result(timeout=timeout)
+    if failed:
+        raise RuntimeError(f"{payload['platform']} 전송 실패 (로그 참고)")
+
+@Outbox.register("notion")
+def handle_notion(payload: dict):
+    from upload.upload import upload_fx_batch
+    upload_fx_batch([tuple(p) for p in payload["pairs"]], raise_on_error=True, now=_run_time(payload.get("run_id")))
+
+def _run_time(run_id: str | None) -> datetime | None:
+    """run_id(타임스탬프 형식, 예: 20250526_141503) → 실행 시각, 재시도해도 실행 시각 토글 아래 기록 (형식이 다르면 None = 현재 시각)"""
+    try:
+        return datetime.strptime(str(run_id), "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+@Outbox.register("slack_archive")
+def handle_slack_archive(payload: dict):
+    from upload.archive import slack as slack_archive
+    slack_archive.archive([tuple(p) for p in payload["pairs"]])
+
+def enqueue_notification(outbox: Outbox, platforms: list[str], msg: str, status: str = "success", run_id: str = "") -> list[str]:
+    """
+    플랫폼별 1건씩 적재 → 플랫폼 단위로 재시도/dead-letter
+    - 반환: 알 수 없는 플랫폼 리스트
+    """
+    from upload.noti.dispatcher import get_senders
+    senders = get_senders()
+    unknown = []
+    for pf in platforms:
+        if pf not in senders:
+            unknown.append(pf)
+            continue
+        payload = {"platform": pf, "msg": msg, "status": status}
+        key = make_idem_key("notify", {**payload, "run_id": run_id}) if run_id else None
+        outbox.enqueue("notify", payload, idem_key=key)
+    return unknown
+
+_outbox: Outbox | None = None
+_outbox_lock = threading.Lock()
+
+def get_outbox() -> Outbox:
+    """프로세스 공용 outbox (drainer 자동 시작), 종료 시 남은 작업을 최대 exit drain timeout까지 처리"""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            # atexit은 LIFO → dispatcher를 먼저 만들어 등록해야 outbox flush(notify 전송)가 끝난 뒤 dispatcher가 닫힘
+            from upload.noti.dispatcher import get_dispatcher
+            get_dispatcher()
+            _outbox = Outbox().start()
+            atexit.register(_outbox.close)
+        return _outbox
+
+if __name__ == "__main__":
+    # 예: python -m upload.outbox drain --timeout 60   (cron / 수동 재전송)
+    #     python -m upload.outbox stats
+    parser = argparse.ArgumentParser(description="outbox 작업 처리 / 조회")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_drain = sub.add_parser("drain", help="실행 가능한 작업 처리")
+    p_drain.add_argument("--timeout", type=float, default=None)
+    sub.add_parser("stats")
+    sub.add_parser("requeue-dead", help="dead-letter 작업 다시 pending으로")
+    args = parser.parse_args()
+
+    box = Outbox()
+    if args.cmd == "drain":
+        print(box.flush(args.timeout))
+    elif args.cmd == "requeue-dead":
+        print(box.requeue_dead())
+    else:
+        print(box.stats())
@@ -33,30 +33,53 @@ def do_git_commit(filepath: Path, msg: str, log_func: Callable) -> bool:
         log_func(f"❌ Git 예외 발생: {filepath} → {e}")
         return False
 
-def send_notification(platforms: list[str], msg: str, log_func: Callable) -> list[str]:
+def do_git_commit_batch(entries: list[tuple[Path, str]], log_func: Callable, push: bool = True) -> dict:
     """
-    지정된 플랫폼 리스트에 알림 메시지 전송
-    - 실패 시 로그 기록
-    - 유효하지 않은 플랫폼 필터링 처리
-    - 실패한 플랫폼 리스트 반환
+    (파일, 메시지) 목록을 파일별 커밋으로 만들고 push는 마지막에 1회
+    - 반환: {"results": {파일: bool}, "pushed": bool}
+    - push 실패 시에도 로컬 커밋 기준 성공 여부 반환
+    - 저장소 밖 경로(심볼릭 링크가 밖을 가리키는 경우 포함)는 커밋하지 않고 False
     """
-    from notify import discord, gmail, kakao, slack
+    from upload.git_batch import GitCommitExecutor, GitError
 
+    results = {str(fp): False for fp, _ in entries}
+    try:
+        executor = GitCommitExecutor(log_func=log_func)
+        rel, valid = {}, []
+        for fp, msg in entries:
+            try:
+                rel[str(fp)] = executor.rel_path(fp)
+            except ValueError:
+                log_func(f"❌ 저장소 밖 경로 → 커밋 제외: {fp}")
+                continue
+            valid.append(([fp], msg))
+        outcome = executor.run(valid, push=push) if valid else {"results": {}, "pushed": False}
+    except GitError as e:
+        log_func(f"❌ Git 일괄 커밋 실패: {e}")
+        return {"results": results, "pushed": False}
 
-    failed = []
-
-    for pf in platforms:
-        sender = platform_map.get(pf)
-        if not sender:
-            log_func(f"[알림 실패] 알 수 없는 플랫폼: {pf}")
-            failed.append(pf)
-            continue
+    by_rel = outcome["results"]
+    results.update({fp: bool(by_rel.get(r)) for fp, r in rel.items()})
+    return {"results": results, "pushed": outcome["pushed"]}
 
-        try:
-            sender(msg)
-        except Exception as e:
-            log_func(f"[알림 실패] {pf}: {e}")
-            failed.append(pf)
+def send_notification(platforms: list[str], msg: str, log_func: Callable, wait: bool = False) -> list[str]:
+    """
+    지정된 플랫폼 리스트에 알림 메시지 전송
+    - 모든 플랫폼 동시 전송 (upload/noti/dispatcher.py)
+    - 실패 시 로그 기록
+    - 유효하지 않은 플랫폼 필터링 처리
+    - 기본(wait=False): 큐잉 즉시 반환, 실패는 log_func로만 보고 → 알 수 없는 플랫폼만 반환
+    - wait=True: 전송 완료까지 대기 후 실패한 플랫폼 리스트 반환
+    """
+    from upload.noti.dispatcher import get_dispatcher
 
-    return failed
+    dispatcher = get_dispatcher()
+    unknown = [pf for pf in platforms if pf not in dispatcher.senders]
+    for pf in unknown:
+        log_func(f"[알림 실패] 알 수 없는 플랫폼: {pf}")
 
+    valid = [pf for pf in platforms if pf not in unknown]
+    future = dispatcher.submit(valid, msg, log_func=log_func)
+    if not wait:
+        return unknown
+    return unknown + future.result()
@@ -0,0 +1,235 @@
+# utils/artifacts.py
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from utils.path import get_timestamp
+
+ARTIFACT_ROOT = Path("temp/runs")
+LATEST_POINTER = "LATEST"
+JSON_COLUMNS_KEY = b"comfort:json_columns"   # Arrow로 바로 못 바꾸는 object 컬럼 → JSON 문자열로 저장
+
+def json_default(value):
+    # set 순서는 프로세스마다 달라짐 (hash seed) → 정렬해서 키를 안정화
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def input_key(*parts) -> str:
+    """단계 입력(상위 산출물 키, 설정, diff 해시 등) → 재사용 판단 키"""
+    h = hashlib.sha256()
+    for p in parts:
+        h.update(json.dumps(p, sort_keys=True, ensure_ascii=False, default=json_default).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    """
+    DataFrame → Arrow Table
+    - 혼합 타입 dict/list 컬럼은 JSON 문자열로 바꾸고 schema metadata에 기록 (읽을 때 복원)
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass
+    df = df.copy()
+    json_cols = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            df[col] = [json.dumps(v, ensure_ascii=False, default=str) for v in df[col]]
+            json_cols.append(col)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = {**(table.schema.metadata or {}), JSON_COLUMNS_KEY: json.dumps(json_cols).encode()}
+    return table.replace_schema_metadata(meta)
+
+def _pylist(value):
+    """Arrow → pandas 변환 시 list 셀이 ndarray로 오는 것을 원래 list/dict로 되돌림"""
+    if isinstance(value, np.ndarray):
+        return [_pylist(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _pylist(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_pylist(v) for v in value]
+    return value
+
+class ArtifactStore:
+    """
+    실행(run) 단위 단계 산출물 저장소
+    - temp/runs/{run_id}/{stage}.arrow : 비압축 Arrow IPC(Feather v2) → memory map으로 zero-copy 읽기
+    - temp/runs/{run_id}/{stage}.meta.json : 입력 키, 행 수, 컬럼, 쓰기 시간
+    - 입력 키가 같은 이전 실행 산출물은 하드링크로 가져와 단계 재실행 생략
+    """
+
+    def __init__(self, run_id: str | None = None, root: Path = ARTIFACT_ROOT):
+        self.root = Path(root)
+        self.run_id = run_id or get_timestamp()
+        self.dir = self.root / self.run_id
+        self._tables: dict[str, pa.Table] = {}
+        self._lock = threading.Lock()
+
+    def path(self, stage: str) -> Path:
+        return self.dir / f"{stage}.arrow"
+
+    def _meta_path(self, stage: str) -> Path:
+        return self.dir / f"{stage}.meta.json"
+
+    def _index_path(self, stage: str, key: str) -> Path:
+        return self.root / "_by_input" / f"{stage}-{key[:32]}.json"
+
+    def meta(self, stage: str) -> dict | None:
+        p = self._meta_path(stage)
+        return json.loads(p.read_text(encoding="utf-8")) if p.exists() else None
+
+    def stages(self) -> list[str]:
+        return sorted(p.stem for p in self.dir.glob("*.arrow")) if self.dir.exists() else []
+
+    # 🔹 쓰기
+    def put(self, stage: str, data: pd.DataFrame | pa.Table, key: str | None = None, extra: dict | None = None) -> Path:
+        """
+        단계 산출물 저장 (임시 파일에 쓴 뒤 os.replace → 읽는 쪽은 완성된 파일만 봄)
+        - key: input_key() 결과, 다음 실행에서 reuse()로 재사용 판단
+        - extra: meta.json에 같이 남길 값 (예: 출력 지문)
+        """
+        table = data if isinstance(data, pa.Table) else _to_table(data)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        target = self.path(stage)
+        tmp = target.with_suffix(f".arrow.tmp{os.getpid()}")
+        start = time.perf_counter()
+        feather.write_feather(table, tmp, compression="uncompressed")  # 압축하면 mmap zero-copy 불가
+        os.replace(tmp, target)
+        meta = {
+            "stage": stage,
+            "run_id": self.run_id,
+            "input_key": key,
+            "rows": table.num_rows,
+            "columns": table.column_names,
+            "bytes": target.stat().st_size,
+            "write_ms": round((time.perf_counter() - start) * 1000, 2),
+            **(extra or {}),
+        }
+        self._meta_path(stage).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        if key:
+            index = self._index_path(stage, key)
+            index.parent.mkdir(parents=True, exist_ok=True)
+            index.write_text(json.dumps({"run_id": self.run_id, "input_key": key}), encoding="utf-8")
+        (self.root / LATEST_POINTER).write_text(self.run_id, encoding="utf-8")
+        with self._lock:
+            self._tables.pop(stage, None)
+        return target
+
+    # 🔹 읽기
+    def get(self, stage: str) -> pa.Table:
+        """memory map된 Arrow Table (버퍼 복사 없음, 같은 프로세스 안에서는 재사용)"""
+        with self._lock:
+            if stage in self._tables:
+                return self._tables[stage]
+        path = self.path(stage)
+        if not path.exists():
+            raise FileNotFoundError(f"산출물 없음: run={self.run_id} stage={stage}")
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        with self._lock:
+            self._tables[stage] = table
+        return table
+
+    def get_df(self, stage: str) -> pd.DataFrame:
+        """pandas가 필요한 단계용 (이때 한 번 변환 비용 발생), JSON 저장 컬럼·list 컬럼은 원래 형태로 복원"""
+        table = self.get(stage)
+        df = table.to_pandas()
+        json_cols = json.loads((table.schema.metadata or {}).get(JSON_COLUMNS_KEY, b"[]"))
+        for col in df.columns:
+            if col in json_cols:
+                df[col] = [json.loads(v) if v is not None else None for v in df[col]]
+            elif df[col].dtype == object:
+                df[col] = [_pylist(v) for v in df[col]]
+        return df
+
+    def reuse(self, stage: str, key: str) -> bool:
+        """
+        입력 키가 같은 산출물이 있으면 현재 run으로 가져옴 (하드링크, 실패 시 복사)
+        - True면 호출 측은 단계 실행을 생략하고 get(stage) 사용
+        """
+        meta = self.meta(stage)
+        if meta and meta.get("input_key") == key and self.path(stage).exists():
+            return True
+        index = self._index_path(stage, key)
+        if not index.exists():
+            return False
+        src_run = json.loads(index.read_text(encoding="utf-8"))["run_id"]
+        src = ArtifactStore(src_run, self.root)
+        src_meta = src.meta(stage)
+        if not src_meta or src_meta.get("input_key") != key or not src.path(stage).exists():
+            return False
+        self.dir.mkdir(parents=True, exist_ok=True)
+        target = self.path(stage)
+        target.unlink(missing_ok=True)
+        try:
+            os.link(src.path(stage), target)
+        except OSError:
+            shutil.copyfile(src.path(stage), target)
+        self._meta_path(stage).write_text(
+            json.dumps({**src_meta, "run_id": self.run_id, "reused_from": src_run}, ensure_ascii=False), encoding="utf-8")
+        with self._lock:
+            self._tables.pop(stage, None)
+        return True
+
+    def previous(self, stage: str) -> "ArtifactStore | None":
+        """현재 run을 제외하고 stage 산출물이 있는 가장 최근 run (행 단위 재사용용)"""
+        if not self.root.exists():
+            return None
+        for p in sorted((p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("_")), reverse=True):
+            if p.name != self.run_id and (p / f"{stage}.arrow").exists():
+                return ArtifactStore(p.name, self.root)
+        return None
+
+    def cleanup(self, keep: int = 10) -> list[str]:
+        """최근 keep개 run만 남김 (하드링크라 재사용 중인 파일은 다른 run에서 계속 유효)"""
+        runs = sorted(p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith("_")) \
+            if self.root.exists() else []
+        removed = []
+        for p in runs[:-keep] if keep else runs:
+            if p.name != self.run_id:
+                shutil.rmtree(p, ignore_errors=True)
+                removed.append(p.name)
+        return removed
+
+def latest_run_id(root: Path = ARTIFACT_ROOT) -> str | None:
+    p = Path(root) / LATEST_POINTER
+    return p.read_text(encoding="utf-8").strip() if p.exists() else None
+
+_stores: dict[str, ArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+def get_store(run_id: str | None = None) -> ArtifactStore:
+    """
+    run_id별 저장소 1개
+    - run_id 미지정: COMFORT_RUN_ID 환경 변수 → 마지막 실행(LATEST) → 새 timestamp
+    - 캐시에는 이번 run과 LATEST run만 유지 → 상주 프로세스(comfortd)에서 실행마다 mmap 테이블이 쌓이지 않음
+      (이미 받아 간 저장소 객체는 그대로 동작, 캐시에서만 빠짐)
+    """
+    latest = latest_run_id()
+    run_id = run_id or os.environ.get("COMFORT_RUN_ID") or latest or get_timestamp()
+    with _stores_lock:
+        if run_id not in _stores:
+            _stores[run_id] = ArtifactStore(run_id)
+        for old in [r for r in _stores if r not in (run_id, latest)]:
+            del _stores[old]
+        return _stores[run_id]
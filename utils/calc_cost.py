@@ -0,0 +1,74 @@
+# utils/calc_cost.py
+
+from pathlib import Path
+from functools import lru_cache
+
+from utils.config import config_version, get_app_config
+
+EX_RATE_PATH = Path("utils/ex_rate.txt")
+DEFAULT_EX_RATE = 1400.0
+
+def load_price_table() -> dict[str, dict[str, float]]:
+    """
+    conf.json의 "LLM cost" → 모델별 토큰당 단가(USD) 테이블
+    - 반환 형식: {model: {"in": float, "out": float}}
+    - 키 대소문자("In"/"out") 혼용을 흡수
+    - conf.json이 다시 읽히면(config_version 변경) 재계산
+    """
+    return _price_table(config_version()[1])
+
+@lru_cache(maxsize=2)
+def _price_table(version: int) -> dict[str, dict[str, float]]:
+    table = {}
+    for model, price in (get_app_config().section("LLM cost").get("model") or {}).items():
+        lowered = {k.lower(): float(v) for k, v in price.items()}
+        table[model] = {"in": lowered.get("in", 0.0), "out": lowered.get("out", 0.0)}
+    return table
+
+def normalize_model(model: str) -> str:
+    """accounts/fireworks/models/xxx 같은 경로형 모델명 → 단가표 키(xxx)"""
+    return model.rsplit("/", 1)[-1] if model else ""
+
+def get_unit_price(model: str) -> tuple[float, float]:
+    """(입력 토큰당 단가, 출력 토큰당 단가) USD, 단가표에 없으면 (0, 0)"""
+    price = load_price_table().get(normalize_model(model), {})
+    return price.get("in", 0.0), price.get("out", 0.0)
+
+def calc_cost(model: str, tokens_in: int, tokens_out: int) -> float:
+    """토큰 수 × 단가 → 호출 1건 비용 (USD)"""
+    price_in, price_out = get_unit_price(model)
+    return round(tokens_in * price_in + tokens_out * price_out, 10)
+
+def cost_per_million(model: str) -> list[float]:
+    """llm_request_log.cost_per_million_tokens 형식 [input, output] (USD / 1M tokens)"""
+    price_in, price_out = get_unit_price(model)
+    return [round(price_in * 1_000_000, 6), round(price_out * 1_000_000, 6)]
+
+@lru_cache(maxsize=1)
+def load_ex_rate() -> float:
+    """utils/ex_rate.txt 환율 캐시 (KRW/USD), 읽기 실패 시 기본값"""
+    try:
+        return float(EX_RATE_PATH.read_text(encoding="utf-8").strip())
+    except Exception:
+        return DEFAULT_EX_RATE
+
+def to_krw(cost_usd: float) -> float:
+    return round(cost_usd * load_ex_rate(), 4)
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    import tiktoken
+    return tiktoken.encoding_for_model("gpt-4o")
+
+def count_tokens(text: str) -> int:
+    """
+    tiktoken(gpt-4o) 기준 토큰 수
+    - tiktoken 미설치/실패 시 공백 분할 개수로 근사
+    - 인코더는 프로세스당 1회만 생성
+    """
+    if not text:
+        return 0
+    try:
+        return len(_get_encoder().encode(text))
+    except Exception:
+        return len(text.split())
@@ -0,0 +1,243 @@
+# utils/config.py
+
+import json
+import time
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+from dataclasses import dataclass, field
+
+import yaml
+
+USER_CONFIG_PATH = Path("config/user_config.yml")
+CONF_PATH = Path("config/conf.json")
+CHECK_INTERVAL = 1.0   # 초, 이 간격 안에서는 stat도 생략 (log 한 줄마다 호출돼도 비용 없음)
+DEFAULT_EXTENSIONS = (".py", ".sh", ".html", ".css", ".js", ".ts")
+
+# 🔹 불변 변환
+def freeze(value: Any) -> Any:
+    """dict → 읽기 전용 MappingProxyType, list → tuple (하위까지)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+def thaw(value: Any) -> Any:
+    """freeze 역변환 (JSON 직렬화 / 기존 dict 기반 API에 넘길 때)"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+def _as_tuple(value) -> tuple:
+    if value is None:
+        return ()
+    return tuple(value) if isinstance(value, (list, tuple)) else (value,)
+
+def _on(value, default: bool = False) -> bool:
+    if value is None:
+        return default
+    return value if isinstance(value, bool) else str(value).strip().lower() in ("on", "true", "1", "yes")
+
+# 🔹 타입이 있는 설정 객체
+@dataclass(frozen=True)
+class LLMStageConfig:
+    """conf.json "describe" / "mk_msg" (provuuider·model은 문자열이어도 fallback 목록으로 정규화)"""
+    provuuider: tuple[str, ...]
+    model: tuple[str, ...]
+    temperature: float = 0.7
+    top_p: float = 0.9
+    top_k: int = 80
+    max_tokens: int = 1024
+    presence_penalty: float = 0.0
+    frequency_penalty: float = 0.0
+    stop: tuple[str, ...] = ()
+
+    @classmethod
+    def parse(cls, raw: Mapping) -> "LLMStageConfig":
+        return cls(
+            provuuider=_as_tuple(raw.get("provuuider")),
+            model=_as_tuple(raw.get("model")),
+            temperature=float(raw.get("temperature", 0.7)),
+            top_p=float(raw.get("top_p", 0.9)),
+            top_k=int(raw.get("top_k", 80)),
+            max_tokens=int(raw.get("max_tokens", 1024)),
+            presence_penalty=float(raw.get("presence_penalty", 0)),
+            frequency_penalty=float(raw.get("frequency_penalty", 0)),
+            stop=_as_tuple(raw.get("stop")),
+        )
+
+    def as_dict(self) -> dict:
+        """llm_router.call_llm 형식 (provuuider/model 목록)"""
+        return {
+            "provuuider": list(self.provuuider), "model": list(self.model), "temperature": self.temperature,
+            "top_p": self.top_p, "top_k": self.top_k, "max_tokens": self.max_tokens,
+            "presence_penalty": self.presence_penalty, "frequency_penalty": self.frequency_penalty,
+            "stop": list(self.stop),
+        }
+
+@dataclass(frozen=True)
+class UserConfig:
+    """config/user_config.yml"""
+    allowed_extensions: tuple[str, ...] = DEFAULT_EXTENSIONS
+    ignore_patterns: tuple = ()
+    commit_language: str = "ko"
+    commit_style: str = "internal_detail"
+    notify_platforms: tuple[str, ...] = ()
+    notify_language: str = "ko"
+    record_platforms: tuple[str, ...] = ()
+    record_languages: tuple[str, ...] = ()
+    commit_timezone: str = "Asia/Seoul"
+    record_timezone: str = "Asia/Seoul"
+    debug: bool = False
+    raw: Mapping = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def parse(cls, raw: Mapping) -> "UserConfig":
+        raw = freeze(raw or {})
+        detect = raw.get("change detection") or {}
+        style = raw.get("style") or {}
+        notify = raw.get("notify") or {}
+        record = raw.get("record") or {}
+        tz = raw.get("timezone") or {}
+        return cls(
+            allowed_extensions=_as_tuple(detect.get("provuuider", DEFAULT_EXTENSIONS)),
+            ignore_patterns=_as_tuple(detect.get("ignore patterns")),
+            commit_language=(style.get("language") or {}).get("commit", "ko"),
+            commit_style=(style.get("style") or {}).get("commit_final", "internal_detail"),
+            notify_platforms=_as_tuple(notify.get("platform")),
+            notify_language=notify.get("language", "ko"),
+            record_platforms=_as_tuple(record.get("platform")),
+            record_languages=_as_tuple(record.get("language")),
+            commit_timezone=tz.get("commit", "Asia/Seoul"),
+            record_timezone=tz.get("record", "Asia/Seoul"),
+            debug=_on(raw.get("debug mode"), False),
+            raw=raw,
+        )
+
+@dataclass(frozen=True)
+class AppConfig:
+    """config/conf.json (자주 쓰는 값은 필드, 나머지 섹션은 section()으로 읽기 전용 조회)"""
+    describe: LLMStageConfig
+    mk_msg: LLMStageConfig
+    parallel_calls: int = 3
+    debug: bool = False
+    raw: Mapping = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def parse(cls, raw: Mapping) -> "AppConfig":
+        raw = freeze(raw or {})
+        return cls(
+            describe=LLMStageConfig.parse(raw.get("describe") or {}),
+            mk_msg=LLMStageConfig.parse(raw.get("mk_msg") or {}),
+            parallel_calls=int(raw.get("parallel calls", 3)),
+            debug=_on(raw.get("debug_mode"), False),
+            raw=raw,
+        )
+
+    def stage(self, name: str) -> LLMStageConfig:
+        if name not in ("describe", "mk_msg"):
+            return LLMStageConfig.parse(self.raw.get(name) or {})
+        return getattr(self, name)
+
+    def section(self, name: str, default: Mapping | None = None) -> Mapping:
+        value = self.raw.get(name)
+        return value if value is not None else MappingProxyType(dict(default or {}))
+
+# 🔹 mtime 감시 + 1회 파싱
+class WatchedConfig:
+    """
+    설정 파일 1개: 처음 1회 파싱 후 (mtime, size)가 바뀔 때만 다시 파싱
+    - CHECK_INTERVAL 안의 반복 호출은 stat 없이 캐시 반환
+    - 파싱 실패(편집 중 깨진 YAML 등) 시 직전 값 유지, 처음부터 실패면 기본값
+    - 다시 읽을 때마다 version 증가 + on_reload 콜백 호출
+    """
+
+    def __init__(self, path: Path, loader: Callable[[str], Any], parser: Callable[[Mapping], Any],
+                 check_interval: float = CHECK_INTERVAL):
+        self.path = Path(path)
+        self.loader = loader
+        self.parser = parser
+        self.check_interval = check_interval
+        self.version = 0
+        self.last_error: str | None = None
+        self._value = None
+        self._signature = None
+        self._checked = 0.0
+        self._callbacks: list[Callable[[Any], None]] = []
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            st = self.path.stat()
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def get(self):
+        now = time.monotonic()
+        value = self._value
+        if value is not None and now - self._checked < self.check_interval:
+            return value
+        with self._lock:
+            signature = self._stat()
+            if self._value is None or signature != self._signature:
+                self._reload(signature)
+            self._checked = time.monotonic()
+            return self._value
+
+    def _reload(self, signature):
+        try:
+            raw = self.loader(self.path.read_text(encoding="utf-8")) if signature else {}
+            value = self.parser(raw or {})
+            self.last_error = None
+        except Exception as e:
+            self.last_error = f"{self.path}: {e}"
+            if self._value is not None:
+                self._signature = signature  # 같은 깨진 파일을 매번 다시 파싱하지 않음
+                return
+            value = self.parser({})
+        self._value, self._signature = value, signature
+        self.version += 1
+        for callback in list(self._callbacks):
+            try:
+                callback(value)
+            except Exception:
+                pass
+
+    def exists(self) -> bool:
+        self.get()
+        return self._signature is not None
+
+    def on_reload(self, callback: Callable[[Any], None]):
+        self._callbacks.append(callback)
+
+    def invalidate(self):
+        with self._lock:
+            self._checked = 0.0
+            self._signature = ("invalidated",)
+
+_user = WatchedConfig(USER_CONFIG_PATH, yaml.safe_load, UserConfig.parse)
+_app = WatchedConfig(CONF_PATH, json.loads, AppConfig.parse)
+
+def get_user_config() -> UserConfig:
+    return _user.get()
+
+def get_app_config() -> AppConfig:
+    return _app.get()
+
+def user_config_exists() -> bool:
+    return _user.exists()
+
+def config_version() -> tuple[int, int]:
+    """(user_config.yml, conf.json) 재파싱 횟수 → 설정 기반 캐시 키"""
+    get_user_config(), get_app_config()
+    return _user.version, _app.version
+
+def on_reload(callback: Callable[[str], None]):
+    """설정 파일이 다시 읽힐 때 호출 (인자: "user" / "app")"""
+    _user.on_reload(lambda _: callback("user"))
+    _app.on_reload(lambda _: callback("app"))
@@ -1,20 +1,15 @@
 # utils/log.py
 
-import yaml
 import json
 from pathlib import Path
 import datetime
 
-CONFIG_PATH = Path("config/user_config.yml")
+from utils.config import get_user_config
+
 DEFAULT_LOG_PATH = Path("log/llm_call.jsonl")
 
 def is_debug_mode() -> bool:
-    try:
-        with CONFIG_PATH.open(encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        return cfg.get("debug mode", "off").lower() == "on"
-    except Exception:
-        return False
+    return get_user_config().debug
 
 def log(message: str, level: str = "INFO", source: str = "llm_router", log_path: Path = DEFAULT_LOG_PATH):
     """
@@ -0,0 +1,27 @@
+# utils/path.py
+
+import datetime
+import subprocess
+from pathlib import Path
+from functools import lru_cache
+
+def get_timestamp() -> str:
+    """실행 단위 식별용 타임스탬프 (예: 20250526_141503)"""
+    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+@lru_cache(maxsize=1)
+def get_repo_key() -> str:
+    """
+    저장소 식별 이름 (scoping/weight.json 프로필 키, ScopingLog params.repo)
+    - origin URL 마지막 경로 (예: git@host:org/comfort-commit.git → comfort-commit)
+    - origin이 없으면 작업 트리 최상위 폴더 이름
+    """
+    try:
+        url = subprocess.run(["git", "config", "--get", "remote.origin.url"],
+                             capture_output=True, text=True).stdout.strip()
+        if url:
+            return url.rstrip("/").removesuffix(".git").replace(":", "/").split("/")[-1]
+        top = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True).stdout.strip()
+        return Path(top).name if top else Path.cwd().name
+    except OSError:
+        return Path.cwd().name